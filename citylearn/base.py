@@ -1,8 +1,10 @@
 import random
+from typing import Iterator, List, Tuple, Union
 import uuid
+import numpy as np
 
 class Environment:
-    def __init__(self, seconds_per_time_step: float = None, random_seed: int = None):
+    def __init__(self, seconds_per_time_step: float = None, random_seed: int = None, dtype: Union[str, type] = None):
         """Initialize `Environment`.
 
         Attributes
@@ -11,11 +13,14 @@ class Environment:
            Number of seconds in 1 `time_step` and must be set to >= 1.
         random_seed : int
             Pseudorandom number generator seed for repeatable results.
+        dtype : Union[str, type], default: float
+            Floating point data type of time series, histories and observations e.g. 'float32'.
         """
 
         self.seconds_per_time_step = seconds_per_time_step
         self.__uid = uuid.uuid4().hex
         self.random_seed = random_seed
+        self.dtype = dtype
         self.__time_step = None
         self.reset()
 
@@ -31,6 +36,12 @@ class Environment:
 
         return self.__random_seed
 
+    @property
+    def dtype(self) -> np.dtype:
+        r"""Floating point data type of time series, histories and observations."""
+
+        return self.__dtype
+
     @property
     def time_step(self) -> int:
         r"""Current environment time step."""
@@ -48,6 +59,12 @@ class Environment:
         random_seed = random.randint(0, 100_000_000) if random_seed is None else random_seed
         self.__random_seed = random_seed
 
+    @dtype.setter
+    def dtype(self, dtype: Union[str, type]):
+        dtype = float if dtype is None else dtype
+        self.__dtype = np.dtype(dtype)
+        assert np.issubdtype(self.__dtype, np.floating), 'dtype must be a floating point data type.'
+
     @seconds_per_time_step.setter
     def seconds_per_time_step(self, seconds_per_time_step: float):
         if seconds_per_time_step is None:
@@ -66,6 +83,44 @@ class Environment:
 
         self.__time_step += 1
 
+    def get_state(self) -> List[float]:
+        r"""Return dynamic state at current `time_step` as a flat list of numbers that can be restored with `set_state`.
+
+        Notes
+        -----
+        Override in subclass to extend the list with subclass state.
+        """
+
+        return [self.__time_step]
+
+    def get_preallocated_histories(self) -> List[Tuple[np.ndarray, Union[slice, Tuple[slice, ...]]]]:
+        r"""Return history arrays that are preallocated for more time steps than simulated and the index of their values up to `time_step`.
+
+        A copy of the environment e.g. :py:meth:`citylearn.citylearn.CityLearnEnv.clone`, copies only the indexed values as the histories
+        are grown when more time steps are simulated.
+
+        Notes
+        -----
+        Override in subclass to extend the list with subclass histories.
+        """
+
+        return []
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore dynamic state from the values of a `get_state` list.
+
+        Parameters
+        ----------
+        state : Iterator[float]
+            Iterator over `get_state` list values that is advanced by the number of values consumed.
+
+        Notes
+        -----
+        Override in subclass to consume subclass state in the same order it is added in `get_state`.
+        """
+
+        self.__time_step = int(next(state))
+
     def reset(self):
         r"""Reset environment to initial state.
 
@@ -1,6 +1,7 @@
+import copy
 import inspect
 import math
-from typing import List, Mapping, Tuple, Union
+from typing import Any, Callable, Iterator, List, Mapping, Tuple, Union
 from gym import spaces
 import numpy as np
 from citylearn.base import Environment
@@ -12,7 +13,8 @@ class Building(Environment):
     def __init__(
         self, energy_simulation: EnergySimulation, weather: Weather, observation_metadata: Mapping[str, bool], action_metadata: Mapping[str, bool], carbon_intensity: CarbonIntensity = None, 
         pricing: Pricing = None, dhw_storage: StorageTank = None, cooling_storage: StorageTank = None, heating_storage: StorageTank = None, electrical_storage: Battery = None, 
-        dhw_device: Union[HeatPump, ElectricHeater] = None, cooling_device: HeatPump = None, heating_device: Union[HeatPump, ElectricHeater] = None, pv: PV = None, name: str = None, **kwargs
+        dhw_device: Union[HeatPump, ElectricHeater] = None, cooling_device: HeatPump = None, heating_device: Union[HeatPump, ElectricHeater] = None, pv: PV = None, name: str = None, 
+        time_series_loader: Callable[['Building'], None] = None, **kwargs
     ):
         r"""Initialize `Building`.
 
@@ -48,6 +50,11 @@ class Building(Environment):
             PV object for offsetting electricity demand from grid.
         name : str, optional
             Unique building name.
+        time_series_loader : Callable[[Building], None], optional
+            Function that sets `energy_simulation`, `weather`, `carbon_intensity` and `pricing` and, any other data dependent
+            attributes e.g. autosized devices, on the building it is called with. If provided, the time series parameters are ignored
+            and the function is called on first access to the time series, observation space or action space, and
+            variables that depend on the time series are reset after it is called.
 
         Other Parameters
         ----------------
@@ -55,11 +62,18 @@ class Building(Environment):
             Other keyword arguments used to initialize super class.
         """
 
+        self.__time_series_loader = time_series_loader
+        self.__episode = (0, None)
         self.name = name
-        self.energy_simulation = energy_simulation
-        self.weather = weather
-        self.carbon_intensity = carbon_intensity
-        self.pricing = pricing
+
+        if self.__time_series_loader is None:
+            self.energy_simulation = energy_simulation
+            self.weather = weather
+            self.carbon_intensity = carbon_intensity
+            self.pricing = pricing
+        else:
+            pass
+
         self.dhw_storage = dhw_storage
         self.cooling_storage = cooling_storage
         self.heating_storage = heating_storage
@@ -73,8 +87,12 @@ class Building(Environment):
         self.__observation_epsilon = 0.0 # to avoid out of bound observations
         self.unnormalized_observation_space_limits = None
         self.normalized_observation_space_limits = None
-        self.observation_space = self.estimate_observation_space()
-        self.action_space = self.estimate_action_space()
+
+        if self.__time_series_loader is None:
+            self.observation_space = self.estimate_observation_space()
+            self.action_space = self.estimate_action_space()
+        else:
+            pass
 
         arg_spec = inspect.getfullargspec(super().__init__)
         kwargs = {
@@ -87,17 +105,30 @@ class Building(Environment):
     def energy_simulation(self) -> EnergySimulation:
         """Temporal features, cooling, heating, dhw and plug loads, solar generation and indoor environment time series."""
 
-        return self.__energy_simulation
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
+        return self.__episode_energy_simulation
 
     @property
     def weather(self) -> Weather:
         """Outdoor weather conditions and forecasts time series."""
 
-        return self.__weather
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
+        return self.__episode_weather
 
     @property
     def observation_metadata(self) -> Mapping[str, bool]:
-        """Mapping of active and inactive observations."""
+        """Mapping of active and inactive observations.
+
+        The mapping must be set and not updated in place for changes to apply to `observations`.
+        """
 
         return self.__observation_metadata
 
@@ -111,13 +142,23 @@ class Building(Environment):
     def carbon_intensity(self) -> CarbonIntensity:
         """Carbon dioxide emission rate time series."""
 
-        return self.__carbon_intensity
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
+        return self.__episode_carbon_intensity
 
     @property
     def pricing(self) -> Pricing:
         """Energy pricing and forecasts time series."""
 
-        return self.__pricing
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
+        return self.__episode_pricing
 
     @property
     def dhw_storage(self) -> StorageTank:
@@ -177,12 +218,22 @@ class Building(Environment):
     def observation_space(self) -> spaces.Box:
         """Agent observation space."""
 
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
         return self.__observation_space
 
     @property
     def action_space(self) -> spaces.Box:
         """Agent action spaces."""
 
+        if self.__time_series_loader is not None:
+            self.load_time_series()
+        else:
+            pass
+
         return self.__action_space
 
     @property
@@ -201,15 +252,13 @@ class Building(Environment):
     def net_electricity_consumption_without_storage_and_pv_emission(self) -> np.ndarray:
         """Carbon dioxide emmission from `net_electricity_consumption_without_storage_and_pv` time series, in [kg_co2]."""
 
-        return (
-            self.carbon_intensity.carbon_intensity[0:self.time_step + 1]*self.net_electricity_consumption_without_storage_and_pv
-        ).clip(min=0)
+        return self.__net_electricity_consumption_without_storage_and_pv_emission[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_without_storage_and_pv_cost(self) -> np.ndarray:
         """net_electricity_consumption_without_storage_and_pv` cost time series, in [$]."""
 
-        return self.pricing.electricity_pricing[0:self.time_step + 1]*self.net_electricity_consumption_without_storage_and_pv
+        return self.__net_electricity_consumption_without_storage_and_pv_cost[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_without_storage_and_pv(self) -> np.ndarray:
@@ -218,21 +267,25 @@ class Building(Environment):
         Notes
         -----
         net_electricity_consumption_without_storage_and_pv = `net_electricity_consumption_without_storage` - `solar_generation`
+
+        The time series does not depend on the actions so it is computed for the episode on :py:meth:`reset` and sliced to `time_step`.
+        It is fixed until the next :py:meth:`reset` so changes to the devices or `pv` e.g. their `nominal_power` or `efficiency`, during
+        an episode are not reflected.
         """
 
-        return self.net_electricity_consumption_without_storage - self.solar_generation
+        return self.__net_electricity_consumption_without_storage_and_pv[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_without_storage_emission(self) -> np.ndarray:
         """Carbon dioxide emmission from `net_electricity_consumption_without_storage` time series, in [kg_co2]."""
 
-        return (self.carbon_intensity.carbon_intensity[0:self.time_step + 1]*self.net_electricity_consumption_without_storage).clip(min=0)
+        return self.__net_electricity_consumption_without_storage_emission[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_without_storage_cost(self) -> np.ndarray:
         """`net_electricity_consumption_without_storage` cost time series, in [$]."""
 
-        return self.pricing.electricity_pricing[0:self.time_step + 1]*self.net_electricity_consumption_without_storage
+        return self.__net_electricity_consumption_without_storage_cost[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_without_storage(self) -> np.ndarray:
@@ -241,14 +294,14 @@ class Building(Environment):
         Notes
         -----
         net_electricity_consumption_without_storage = `net_electricity_consumption` - (`cooling_storage_electricity_consumption` + `heating_storage_electricity_consumption` + `dhw_storage_electricity_consumption` + `electrical_storage_electricity_consumption`)
+
+        The time series is the electricity consumption of the devices to meet `cooling_demand`, `heating_demand` and `dhw_demand` as in 
+        :py:meth:`update_variables` with no storage energy balance plus `non_shiftable_load_demand` and `solar_generation`. It does not depend 
+        on the actions so it is computed for the episode on :py:meth:`reset` and sliced to `time_step`. It is fixed until the next
+        :py:meth:`reset` so changes to the devices or `pv` e.g. their `nominal_power` or `efficiency`, during an episode are not reflected.
         """
 
-        return self.net_electricity_consumption - np.sum([
-            self.cooling_storage_electricity_consumption,
-            self.heating_storage_electricity_consumption,
-            self.dhw_storage_electricity_consumption,
-            self.electrical_storage_electricity_consumption
-        ], axis = 0)
+        return self.__net_electricity_consumption_without_storage[:self.time_step + 1]
 
     @property
     def net_electricity_consumption_emission(self) -> List[float]:
@@ -347,31 +400,31 @@ class Building(Environment):
     def electrical_storage_electricity_consumption(self) -> np.ndarray:
         """Energy supply from grid and/or `PV` to `electrical_storage` time series, in [kWh]."""
 
-        return np.array(self.electrical_storage.electricity_consumption, dtype=float)
+        return np.array(self.electrical_storage.electricity_consumption, dtype=self.dtype)
 
     @property
     def energy_from_cooling_device_to_cooling_storage(self) -> np.ndarray:
         """Energy supply from `cooling_device` to `cooling_storage` time series, in [kWh]."""
 
-        return np.array(self.cooling_storage.energy_balance, dtype=float).clip(min=0)
+        return self.cooling_storage.energy_balance.clip(min=0)
 
     @property
     def energy_from_heating_device_to_heating_storage(self) -> np.ndarray:
         """Energy supply from `heating_device` to `heating_storage` time series, in [kWh]."""
 
-        return np.array(self.heating_storage.energy_balance, dtype=float).clip(min=0)
+        return self.heating_storage.energy_balance.clip(min=0)
 
     @property
     def energy_from_dhw_device_to_dhw_storage(self) -> np.ndarray:
         """Energy supply from `dhw_device` to `dhw_storage` time series, in [kWh]."""
 
-        return np.array(self.dhw_storage.energy_balance, dtype=float).clip(min=0)
+        return self.dhw_storage.energy_balance.clip(min=0)
 
     @property
     def energy_to_electrical_storage(self) -> np.ndarray:
         """Energy supply from `electrical_device` to building time series, in [kWh]."""
 
-        return np.array(self.electrical_storage.energy_balance, dtype=float).clip(min=0)
+        return self.electrical_storage.energy_balance.clip(min=0)
 
     @property
     def energy_from_cooling_device(self) -> np.ndarray:
@@ -395,25 +448,25 @@ class Building(Environment):
     def energy_from_cooling_storage(self) -> np.ndarray:
         """Energy supply from `cooling_storage` to building time series, in [kWh]."""
 
-        return np.array(self.cooling_storage.energy_balance, dtype=float).clip(max=0)*-1
+        return self.cooling_storage.energy_balance.clip(max=0)*-1
 
     @property
     def energy_from_heating_storage(self) -> np.ndarray:
         """Energy supply from `heating_storage` to building time series, in [kWh]."""
 
-        return np.array(self.heating_storage.energy_balance, dtype=float).clip(max=0)*-1
+        return self.heating_storage.energy_balance.clip(max=0)*-1
 
     @property
     def energy_from_dhw_storage(self) -> np.ndarray:
         """Energy supply from `dhw_storage` to building time series, in [kWh]."""
 
-        return np.array(self.dhw_storage.energy_balance, dtype=float).clip(max=0)*-1
+        return self.dhw_storage.energy_balance.clip(max=0)*-1
 
     @property
     def energy_from_electrical_storage(self) -> np.ndarray:
         """Energy supply from `electrical_storage` to building time series, in [kWh]."""
 
-        return np.array(self.electrical_storage.energy_balance, dtype=float).clip(max=0)*-1
+        return self.electrical_storage.energy_balance.clip(max=0)*-1
 
     @property
     def cooling_demand(self) -> np.ndarray:
@@ -448,14 +501,19 @@ class Building(Environment):
     @energy_simulation.setter
     def energy_simulation(self, energy_simulation: EnergySimulation):
         self.__energy_simulation = energy_simulation
+        self.__episode_energy_simulation = self.__get_episode_time_series(energy_simulation)
+        self.__observation_plans = {}
 
     @weather.setter
     def weather(self, weather: Weather):
         self.__weather = weather
+        self.__episode_weather = self.__get_episode_time_series(weather)
+        self.__observation_plans = {}
 
     @observation_metadata.setter
     def observation_metadata(self, observation_metadata: Mapping[str, bool]):
         self.__observation_metadata = observation_metadata
+        self.__observation_plans = {}
 
     @action_metadata.setter
     def action_metadata(self, action_metadata: Mapping[str, bool]):
@@ -464,22 +522,28 @@ class Building(Environment):
     @carbon_intensity.setter
     def carbon_intensity(self, carbon_intensity: CarbonIntensity):
         if carbon_intensity is None:
-            self.__carbon_intensity = CarbonIntensity(np.zeros(len(self.energy_simulation.hour), dtype = float))
+            self.__carbon_intensity = CarbonIntensity(np.zeros(len(self.__energy_simulation.hour), dtype = float))
         else:
             self.__carbon_intensity = carbon_intensity
 
+        self.__episode_carbon_intensity = self.__get_episode_time_series(self.__carbon_intensity)
+        self.__observation_plans = {}
+
     @pricing.setter
     def pricing(self, pricing: Pricing):
         if pricing is None:
             self.__pricing = Pricing(
-                np.zeros(len(self.energy_simulation.hour), dtype = float),
-                np.zeros(len(self.energy_simulation.hour), dtype = float),
-                np.zeros(len(self.energy_simulation.hour), dtype = float),
-                np.zeros(len(self.energy_simulation.hour), dtype = float),
+                np.zeros(len(self.__energy_simulation.hour), dtype = float),
+                np.zeros(len(self.__energy_simulation.hour), dtype = float),
+                np.zeros(len(self.__energy_simulation.hour), dtype = float),
+                np.zeros(len(self.__energy_simulation.hour), dtype = float),
             )
         else:
             self.__pricing = pricing
 
+        self.__episode_pricing = self.__get_episode_time_series(self.__pricing)
+        self.__observation_plans = {}
+
     @dhw_storage.setter
     def dhw_storage(self, dhw_storage: StorageTank):
         self.__dhw_storage = StorageTank(0.0) if dhw_storage is None else dhw_storage
@@ -515,6 +579,7 @@ class Building(Environment):
     @observation_space.setter
     def observation_space(self, observation_space: spaces.Box):
         self.__observation_space = observation_space
+        self.__observation_plans = {}
         self.unnormalized_observation_space_limits = self.estimate_observation_space_limits(normalize=False)
         self.normalized_observation_space_limits = self.estimate_observation_space_limits(normalize=True)
 
@@ -546,59 +611,239 @@ class Building(Environment):
         scaling this observation-variable using these bounds may result in normalized values above 1 or below 0.
         """
         
+        return dict(zip(self.get_observation_names(normalize=normalize), self.get_observations(normalize=normalize)))
+
+    def get_observation_names(self, normalize: bool = None) -> List[str]:
+        r"""Names of `get_observations` values.
+
+        Parameters
+        ----------
+        normalize : bool, default: False
+            Whether to return the names of normalized observations where periodic observations are split into their cosine and sine
+            e.g. `hour_cos` and `hour_sin`.
+
+        Returns
+        -------
+        observation_names : List[str]
+            Observation names.
+        """
+
         normalize = False if normalize is None else normalize
+        return list(self.__get_observation_plan(normalize)[0])
+
+    def get_observations(self, normalize: bool = None) -> np.ndarray:
+        r"""Active observation values at current time step in the same order as `get_observation_names`.
+
+        The values are gathered into a preallocated array of `dtype` using an observation plan that is compiled on first call after
+        the time series, `observation_metadata` or `observation_space` are set. The plan for normalized observations holds the 
+        normalized time series, including the periodic normalization of hour, day_type and month, so that only the observations 
+        that are not time series values are normalized each time step.
+
+        Parameters
+        ----------
+        normalize : bool, default: False
+            Whether to apply min-max normalization bounded between [0, 1]
+            and periodic normalization to cyclic observations including hour, day_type and month.
+
+        Returns
+        -------
+        observations : np.ndarray
+            Observation values. The array is overwritten by the next call so should be copied if kept.
+        """
+
+        normalize = False if normalize is None else normalize
+        _, time_series, time_series_index, other_observations, observations = self.__get_observation_plan(normalize)
+        observations[time_series_index] = time_series[self.__episode[0] + self.time_step]
 
-        observations = {}
-        data = {
-            **{k: v[self.time_step] for k, v in vars(self.energy_simulation).items()},
-            **{k: v[self.time_step] for k, v in vars(self.weather).items()},
-            **{k: v[self.time_step] for k, v in vars(self.pricing).items()},
-            'solar_generation':self.pv.get_generation(self.energy_simulation.solar_generation[self.time_step]),
-            **{
-                'cooling_storage_soc':self.cooling_storage.soc[self.time_step]/self.cooling_storage.capacity,
-                'heating_storage_soc':self.heating_storage.soc[self.time_step]/self.heating_storage.capacity,
-                'dhw_storage_soc':self.dhw_storage.soc[self.time_step]/self.dhw_storage.capacity,
-                'electrical_storage_soc':self.electrical_storage.soc[self.time_step]/self.electrical_storage.capacity_history[0],
-            },
-            'net_electricity_consumption': self.__net_electricity_consumption[self.time_step],
-            **{k: v[self.time_step] for k, v in vars(self.carbon_intensity).items()},
-        }
-        observations = {k: data[k] for k in self.active_observations if k in data.keys()}
-        unknown_observations = list(set([k for k in self.active_observations]).difference(observations.keys()))
-        assert len(unknown_observations) == 0, f'Unknown observations: {unknown_observations}'
-        
-        
         if normalize:
-            observations_copy = {k: v for k, v in observations.items()}
-            observations = {}
-            low_limit, high_limit = self.normalized_observation_space_limits
-            periodic_observations = self.get_periodic_observation_metadata()
-            pn = PeriodicNormalization(x_max=0)
-            nm = Normalize(0.0, 1.0)
-            i = 0
-
-            for k, v in observations_copy.items():
-                if k in periodic_observations:
-                    pn.x_max = max(periodic_observations[k])
-                    sin_x, cos_x = v*pn
-                    nm.x_min = low_limit[f'{k}_cos']
-                    nm.x_max = high_limit[f'{k}_cos']
-                    observations[f'{k}_cos'] = cos_x*nm
-                    nm.x_min = low_limit[f'{k}_sin']
-                    nm.x_max = high_limit[f'{k}_sin']
-                    observations[f'{k}_sin'] = sin_x*nm
-                    i += 2
-                
-                else:
-                    nm.x_min = low_limit[k]
-                    nm.x_max = high_limit[k]
-                    observations[k] = v*nm
-                    i += 1
+            index, unnormalized_index, low_limit, difference, constant = other_observations
+            values = (self.get_observations()[unnormalized_index] - low_limit)/difference
+            values[constant] = 0.0
+            observations[index] = values
+        
         else:
-            pass
+            for i, key in other_observations:
+                observations[i] = self.__get_observation(key)
 
         return observations
+
+    def get_observation_time_series(self, normalize: bool = None) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Return the episode time series of the `get_observations` values that are time series values and their indices.
+
+        Parameters
+        ----------
+        normalize : bool, default: False
+            Whether to return the normalized time series of the normalized observations.
+
+        Returns
+        -------
+        time_series : np.ndarray
+            Read-only (time step, observation) array where the row at `time_step` holds the time series values of `get_observations`.
+            The array is a view of the observation plan so it is not copied.
+        time_series_index : np.ndarray
+            Indices of the time series values in `get_observations`.
+        """
+
+        normalize = False if normalize is None else normalize
+        _, time_series, time_series_index, _, _ = self.__get_observation_plan(normalize)
+        start_time_step, time_steps = self.__episode
+        end_time_step = None if time_steps is None else start_time_step + time_steps
+        return time_series[start_time_step:end_time_step], time_series_index.copy()
+
+    def __get_observation(self, key: str) -> float:
+        # observations that are not time series values
+        if key == 'solar_generation':
+            return self.pv.get_generation(self.energy_simulation.solar_generation[self.time_step])
+        elif key == 'electrical_storage_soc':
+            return self.electrical_storage.soc[self.time_step]/self.electrical_storage.capacity_history[0]
+        elif key == 'net_electricity_consumption':
+            return self.__net_electricity_consumption[self.time_step]
+        else:
+            storage = {'cooling_storage_soc': self.cooling_storage, 'heating_storage_soc': self.heating_storage, 'dhw_storage_soc': self.dhw_storage}[key]
+            return storage.soc[self.time_step]/storage.capacity
+
+    def __get_observation_plan(self, normalize: bool = False) -> Tuple[List[str], np.ndarray, np.ndarray, Any, np.ndarray]:
+        # maps each active observation to a column of a (time step, observation) array of the loaded time series or to an
+        # observation that is evaluated each time step. Names in later sources take precedence.
+        self.load_time_series()
+
+        if normalize not in self.__observation_plans and normalize:
+            self.__observation_plans[normalize] = self.__get_normalized_observation_plan()
+
+        elif normalize not in self.__observation_plans:
+            sources = self.__get_observation_sources()
+            names = self.active_observations
+            unknown_observations = list(set(names).difference(sources.keys()))
+            assert len(unknown_observations) == 0, f'Unknown observations: {unknown_observations}'
+            time_series_index = [i for i, k in enumerate(names) if sources[k] is not None]
+            other_observations = [(i, k) for i, k in enumerate(names) if sources[k] is None]
+            time_series = np.zeros((len(self.__energy_simulation.hour), len(time_series_index)), dtype=self.dtype)
+
+            for j, i in enumerate(time_series_index):
+                time_series[:, j] = sources[names[i]]
+
+            # read-only so that it is shared and not copied when cloned
+            time_series.flags.writeable = False
+            self.__observation_plans[normalize] = (
+                names, time_series, np.array(time_series_index, dtype=int), other_observations, np.zeros(len(names), dtype=self.dtype)
+            )
+
+        else:
+            pass
+
+        return self.__observation_plans[normalize]
+
+    def __get_normalized_observation_plan(self) -> Tuple[List[str], np.ndarray, np.ndarray, Tuple[np.ndarray, ...], np.ndarray]:
+        # normalized time series are precomputed and, the other observations are normalized from the unnormalized observations 
+        # with precomputed limits. Periodic normalization is evaluated once per unique value.
+        sources = self.__get_observation_sources()
+        unnormalized_names = self.__get_observation_plan()[0]
+        low_limit, high_limit = self.normalized_observation_space_limits
+        periodic_observations = self.get_periodic_observation_metadata()
+        names, time_series, time_series_index, other_index, unnormalized_index = [], [], [], [], []
+
+        for j, k in enumerate(unnormalized_names):
+            if sources[k] is None:
+                other_index.append(len(names))
+                unnormalized_index.append(j)
+                names.append(k)
+
+            elif k in periodic_observations:
+                pn = PeriodicNormalization(max(periodic_observations[k]))
+                values, inverse = np.unique(sources[k], return_inverse=True)
+                sin_x, cos_x = np.array([v*pn for v in values]).T
+
+                for n, x in [(f'{k}_cos', cos_x), (f'{k}_sin', sin_x)]:
+                    time_series_index.append(len(names))
+                    names.append(n)
+                    time_series.append(np.broadcast_to(Normalize(low_limit[n], high_limit[n])*x[inverse], inverse.shape))
+            
+            else:
+                time_series_index.append(len(names))
+                names.append(k)
+                time_series.append(np.broadcast_to(Normalize(low_limit[k], high_limit[k])*sources[k], sources[k].shape))
+
+        time_series = np.array(time_series, dtype=self.dtype).T.reshape(len(self.__energy_simulation.hour), len(time_series_index))
+        time_series = np.ascontiguousarray(time_series)
+        time_series.flags.writeable = False
+        low_limit = np.array([low_limit[names[i]] for i in other_index], dtype=self.dtype)
+        high_limit = np.array([high_limit[names[i]] for i in other_index], dtype=self.dtype)
+        other_observations = (
+            np.array(other_index, dtype=int), np.array(unnormalized_index, dtype=int), low_limit, high_limit - low_limit, low_limit == high_limit
+        )
+
+        return names, time_series, np.array(time_series_index, dtype=int), other_observations, np.zeros(len(names), dtype=self.dtype)
+
+    def __get_observation_sources(self) -> Mapping[str, np.ndarray]:
+        # loaded time series of each observation name and None for observations that are not time series values
+        return {
+            **vars(self.__energy_simulation),
+            **vars(self.__weather),
+            **vars(self.__pricing),
+            **{k: None for k in [
+                'solar_generation', 'cooling_storage_soc', 'heating_storage_soc', 'dhw_storage_soc', 'electrical_storage_soc', 
+                'net_electricity_consumption'
+            ]},
+            **vars(self.__carbon_intensity),
+        }
     
+    def load_time_series(self):
+        r"""Call `time_series_loader` if the time series are yet to be loaded then reset the building.
+
+        Notes
+        -----
+        Called automatically on first access to the time series, observation space or action space.
+        """
+
+        if self.__time_series_loader is not None:
+            # devices are autosized and spaces estimated with the full time series
+            episode = self.__episode
+            self.__episode = (0, None)
+            loader = self.__time_series_loader
+            self.__time_series_loader = None
+            loader(self)
+            self.set_episode(*episode)
+            self.reset()
+        else:
+            pass
+
+    def set_episode(self, start_time_step: int = None, time_steps: int = None):
+        r"""Set the episode window of the time series returned by `energy_simulation`, `weather`, `carbon_intensity` and `pricing`.
+
+        The episode time series are views of the loaded time series so setting the window does not copy data.
+
+        Parameters
+        ----------
+        start_time_step : int, default: 0
+            Index of loaded time series that the episode starts at i.e. `time_step` 0.
+        time_steps : int, optional
+            Number of time steps in the episode. Defaults to the remaining time steps after `start_time_step`.
+        """
+
+        self.__episode = (0 if start_time_step is None else start_time_step, time_steps)
+
+        if self.__time_series_loader is None:
+            self.__episode_energy_simulation = self.__get_episode_time_series(self.__energy_simulation)
+            self.__episode_weather = self.__get_episode_time_series(self.__weather)
+            self.__episode_carbon_intensity = self.__get_episode_time_series(self.__carbon_intensity)
+            self.__episode_pricing = self.__get_episode_time_series(self.__pricing)
+        else:
+            pass
+
+    def __get_episode_time_series(self, data: Union[EnergySimulation, Weather, CarbonIntensity, Pricing]) -> Union[EnergySimulation, Weather, CarbonIntensity, Pricing]:
+        start_time_step, time_steps = self.__episode
+
+        if start_time_step == 0 and time_steps is None:
+            return data
+        else:
+            end_time_step = None if time_steps is None else start_time_step + time_steps
+            episode_data = copy.copy(data)
+
+            for k, v in vars(data).items():
+                episode_data.__setattr__(k, v[start_time_step:end_time_step])
+
+            return episode_data
+
     def get_periodic_observation_metadata(self) -> Mapping[str, int]:
         r"""Get periodic observation names and their minimum and maximum values for periodic/cyclic normalization.
 
@@ -653,10 +898,10 @@ class Building(Environment):
         energy = action*self.cooling_storage.capacity
         space_demand = self.energy_simulation.cooling_demand[self.time_step]
         space_demand = 0.0 if space_demand is None or math.isnan(space_demand) else space_demand # case where space demand is unknown
-        max_output = self.cooling_device.get_max_output_power(self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=False)
+        max_output = self.cooling_device.get_max_output_power(heating=False)
         energy = max(-space_demand, min(max_output - space_demand, energy))
         self.cooling_storage.charge(energy)
-        input_power = self.cooling_device.get_input_power(space_demand + energy, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=False)
+        input_power = self.cooling_device.get_input_power(space_demand + energy, heating=False)
         self.cooling_device.update_electricity_consumption(input_power)
 
     def update_heating(self, action: float):
@@ -671,12 +916,12 @@ class Building(Environment):
         energy = action*self.heating_storage.capacity
         space_demand = self.energy_simulation.heating_demand[self.time_step]
         space_demand = 0.0 if space_demand is None or math.isnan(space_demand) else space_demand # case where space demand is unknown
-        max_output = self.heating_device.get_max_output_power(self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)\
+        max_output = self.heating_device.get_max_output_power(heating=True)\
             if isinstance(self.heating_device, HeatPump) else self.heating_device.get_max_output_power()
         energy = max(-space_demand, min(max_output - space_demand, energy))
         self.heating_storage.charge(energy)
         demand = space_demand + energy
-        input_power = self.heating_device.get_input_power(demand, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)\
+        input_power = self.heating_device.get_input_power(demand, heating=True)\
             if isinstance(self.heating_device, HeatPump) else self.heating_device.get_input_power(demand)
         self.heating_device.update_electricity_consumption(input_power)
 
@@ -692,12 +937,12 @@ class Building(Environment):
         energy = action*self.dhw_storage.capacity
         space_demand = self.energy_simulation.dhw_demand[self.time_step]
         space_demand = 0.0 if space_demand is None or math.isnan(space_demand) else space_demand # case where space demand is unknown
-        max_output = self.dhw_device.get_max_output_power(self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)\
+        max_output = self.dhw_device.get_max_output_power(heating=True)\
             if isinstance(self.dhw_device, HeatPump) else self.dhw_device.get_max_output_power()
         energy = max(-space_demand, min(max_output - space_demand, energy))
         self.dhw_storage.charge(energy)
         demand = space_demand + energy
-        input_power = self.dhw_device.get_input_power(demand, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)\
+        input_power = self.dhw_device.get_input_power(demand, heating=True)\
             if isinstance(self.dhw_device, HeatPump) else self.dhw_device.get_input_power(demand)
         self.dhw_device.update_electricity_consumption(input_power) 
 
@@ -729,15 +974,12 @@ class Building(Environment):
         """
 
         normalize = False if normalize is None else normalize
-        normalized_observation_space_limits = self.estimate_observation_space_limits(normalize=True)
-        unnormalized_observation_space_limits = self.estimate_observation_space_limits(normalize=False)
+        low_limit, high_limit = self.estimate_observation_space_limits(normalize=normalize)
 
         if normalize:
-            low_limit, high_limit = normalized_observation_space_limits
             low_limit = [0.0]*len(low_limit)
             high_limit = [1.0]*len(high_limit)
         else:
-            low_limit, high_limit = unnormalized_observation_space_limits
             low_limit = list(low_limit.values())
             high_limit = list(high_limit.values())
         
@@ -788,8 +1030,8 @@ class Building(Environment):
                                             + (self.electrical_storage.nominal_power/self.electrical_storage.efficiency_history[0])\
                                                 - data['solar_generation']
     
-                low_limit[key] = -max(abs(net_electric_consumption))
-                high_limit[key] = max(abs(net_electric_consumption))
+                low_limit[key] = -self.__get_max(abs(net_electric_consumption))
+                high_limit[key] = self.__get_max(abs(net_electric_consumption))
 
             elif key in ['cooling_storage_soc', 'heating_storage_soc', 'dhw_storage_soc', 'electrical_storage_soc']:
                 low_limit[key] = 0.0
@@ -802,14 +1044,26 @@ class Building(Environment):
                 low_limit[f'{key}_sin'], high_limit[f'{key}_sin'] = min(x_sin), max(x_sin)
 
             else:
-                low_limit[key] = min(data[key])
-                high_limit[key] = max(data[key])
+                low_limit[key] = self.__get_min(data[key])
+                high_limit[key] = self.__get_max(data[key])
 
         low_limit = {k: v - self.__observation_epsilon for k, v in low_limit.items()}
         high_limit = {k: v + self.__observation_epsilon for k, v in high_limit.items()}
 
         return low_limit, high_limit
     
+    @staticmethod
+    def __get_min(x: np.ndarray) -> float:
+        # NumPy reduction is much faster than the builtin and releases the GIL when loading buildings concurrently.
+        # It is NaN if any value is NaN in which case the builtin is used to keep the limit unchanged.
+        x_min = np.min(x)
+        return min(x) if np.isnan(x_min) else x_min
+
+    @staticmethod
+    def __get_max(x: np.ndarray) -> float:
+        x_max = np.max(x)
+        return max(x) if np.isnan(x_max) else x_max
+    
     def estimate_action_space(self) -> spaces.Box:
         r"""Get estimate of action spaces.
 
@@ -941,6 +1195,84 @@ class Building(Environment):
 
         self.pv.autosize(self.pv.get_generation(self.energy_simulation.solar_generation), **kwargs)
 
+    def __getstate__(self) -> dict:
+        # the loader may be a closure that can not be pickled so the time series are loaded first
+        self.load_time_series()
+        return self.__dict__
+
+    def get_state(self) -> List[float]:
+        r"""Return `time_step`, energy storage and electric devices and, PV states and length of variables set in `update_variables`."""
+
+        state = super().get_state()
+
+        for device in self.__get_devices():
+            state += device.get_state()
+
+        return state + [len(self.__net_electricity_consumption)]
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore `time_step`, energy storage and electric devices and, PV states and truncate variables set in `update_variables`
+        to their `get_state` length."""
+
+        super().set_state(state)
+
+        for device in self.__get_devices():
+            device.set_state(state)
+
+        length = int(next(state))
+        del self.__cooling_electricity_consumption[length:]
+        del self.__heating_electricity_consumption[length:]
+        del self.__dhw_electricity_consumption[length:]
+        del self.__net_electricity_consumption[length:]
+        del self.__net_electricity_consumption_emission[length:]
+        del self.__net_electricity_consumption_cost[length:]
+
+    def set_history(
+        self, time_step: int, cooling_electricity_consumption: np.ndarray, heating_electricity_consumption: np.ndarray, dhw_electricity_consumption: np.ndarray,
+        net_electricity_consumption: np.ndarray, net_electricity_consumption_cost: np.ndarray, net_electricity_consumption_emission: np.ndarray
+    ):
+        r"""Set `time_step` and update the electricity consumption histories to synchronize the building with a simulation that advances it 
+        outside the building e.g. :py:class:`citylearn.district.District`.
+
+        The history values after the current history lengths up to `time_step` are appended. The devices are synchronized separately.
+
+        Parameters
+        ----------
+        time_step : int
+            Current time step.
+        cooling_electricity_consumption : np.ndarray
+            `cooling_electricity_consumption` values.
+        heating_electricity_consumption : np.ndarray
+            `heating_electricity_consumption` values.
+        dhw_electricity_consumption : np.ndarray
+            `dhw_electricity_consumption` values.
+        net_electricity_consumption : np.ndarray
+            `net_electricity_consumption` values.
+        net_electricity_consumption_cost : np.ndarray
+            `net_electricity_consumption_cost` values.
+        net_electricity_consumption_emission : np.ndarray
+            `net_electricity_consumption_emission` values.
+        """
+
+        Environment.set_state(self, iter([time_step]))
+
+        for history, values in [
+            (self.__cooling_electricity_consumption, cooling_electricity_consumption),
+            (self.__heating_electricity_consumption, heating_electricity_consumption),
+            (self.__dhw_electricity_consumption, dhw_electricity_consumption),
+            (self.__net_electricity_consumption, net_electricity_consumption),
+            (self.__net_electricity_consumption_cost, net_electricity_consumption_cost),
+            (self.__net_electricity_consumption_emission, net_electricity_consumption_emission),
+        ]:
+            del history[time_step + 1:]
+            history.extend(values[len(history):time_step + 1])
+
+    def __get_devices(self) -> List[Environment]:
+        return [
+            self.cooling_device, self.heating_device, self.dhw_device, self.cooling_storage, 
+            self.heating_storage, self.dhw_storage, self.electrical_storage, self.pv
+        ]
+
     def next_time_step(self):
         r"""Advance all energy storage and electric devices and, PV to next `time_step`."""
 
@@ -958,8 +1290,28 @@ class Building(Environment):
     def reset(self):
         r"""Reset `Building` to initial state."""
 
+        # time series that are yet to be loaded are loaded on reset after initialization and loading resets the building
+        if self.__time_series_loader is not None and self.time_step is not None:
+            self.load_time_series()
+            return
+        else:
+            pass
+
         # object reset
         super().reset()
+
+        # device histories are preallocated and, heat pump COP precomputed for the episode once the time series are loaded
+        if self.__time_series_loader is None:
+            for device in self.__get_devices():
+                device.time_steps = len(self.energy_simulation.hour)
+
+                if isinstance(device, HeatPump):
+                    device.outdoor_dry_bulb_temperature = self.weather.outdoor_dry_bulb_temperature
+                else:
+                    pass
+        else:
+            pass
+
         self.cooling_storage.reset()
         self.heating_storage.reset()
         self.dhw_storage.reset()
@@ -969,41 +1321,93 @@ class Building(Environment):
         self.dhw_device.reset()
         self.pv.reset()
 
+        # variables depend on the time series so are reset once they are loaded during initialization
+        if self.__time_series_loader is not None:
+            return
+        else:
+            pass
+
         # variable reset
         self.__cooling_electricity_consumption = []
         self.__heating_electricity_consumption = []
         self.__dhw_electricity_consumption = []
         self.__solar_generation = self.pv.get_generation(self.energy_simulation.solar_generation)*-1
+
+        # read-only so that clones share the episode time series
+        self.__solar_generation.flags.writeable = False
+        self.__set_net_electricity_consumption_without_storage()
         self.__net_electricity_consumption = []
         self.__net_electricity_consumption_emission = []
         self.__net_electricity_consumption_cost = []
         self.update_variables()
 
+    def __set_net_electricity_consumption_without_storage(self):
+        # episode time series of the devices' consumption to meet the demands as in update_variables without storage and, their cost and emission
+        heat_pump_heating = isinstance(self.heating_device, HeatPump)
+        without_storage_and_pv = self.__get_input_power(self.cooling_device, self.energy_simulation.cooling_demand, False)\
+            + self.__get_input_power(
+                self.heating_device if heat_pump_heating else self.dhw_device, self.energy_simulation.heating_demand, heat_pump_heating
+            )\
+                + self.__get_input_power(self.dhw_device, self.energy_simulation.dhw_demand, True)\
+                    + self.energy_simulation.non_shiftable_load
+        without_storage = without_storage_and_pv + self.__solar_generation
+        electricity_pricing = self.pricing.electricity_pricing
+        carbon_intensity = self.carbon_intensity.carbon_intensity
+        time_series = {
+            'without_storage_and_pv': without_storage_and_pv,
+            'without_storage_and_pv_cost': electricity_pricing*without_storage_and_pv,
+            'without_storage_and_pv_emission': (carbon_intensity*without_storage_and_pv).clip(min=0),
+            'without_storage': without_storage,
+            'without_storage_cost': electricity_pricing*without_storage,
+            'without_storage_emission': (carbon_intensity*without_storage).clip(min=0),
+        }
+
+        # read-only so that clones share the time series
+        for k, v in time_series.items():
+            time_series[k] = np.array(v, dtype=self.dtype)
+            time_series[k].flags.writeable = False
+
+        self.__net_electricity_consumption_without_storage_and_pv = time_series['without_storage_and_pv']
+        self.__net_electricity_consumption_without_storage_and_pv_cost = time_series['without_storage_and_pv_cost']
+        self.__net_electricity_consumption_without_storage_and_pv_emission = time_series['without_storage_and_pv_emission']
+        self.__net_electricity_consumption_without_storage = time_series['without_storage']
+        self.__net_electricity_consumption_without_storage_cost = time_series['without_storage_cost']
+        self.__net_electricity_consumption_without_storage_emission = time_series['without_storage_emission']
+
+    def __get_input_power(self, device: Union[HeatPump, ElectricHeater], output_power: np.ndarray, heating: bool) -> np.ndarray:
+        # episode input power time series where a heat pump uses the COP of the episode outdoor dry bulb temperature
+        if isinstance(device, HeatPump):
+            input_power = device.get_input_power(output_power, self.weather.outdoor_dry_bulb_temperature, heating)
+        else:
+            input_power = device.get_input_power(output_power)
+
+        return input_power
+
     def update_variables(self):
         # cooling electricity consumption
         cooling_demand = self.energy_simulation.cooling_demand[self.time_step] + self.cooling_storage.energy_balance[self.time_step]
-        cooling_consumption = self.cooling_device.get_input_power(cooling_demand, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=False)
-        self.__cooling_electricity_consumption.append(cooling_consumption)
+        cooling_consumption = self.cooling_device.get_input_power(cooling_demand, heating=False)
+        self.__cooling_electricity_consumption.append(self.dtype.type(cooling_consumption))
 
         # heating electricity consumption
         heating_demand = self.energy_simulation.heating_demand[self.time_step] + self.heating_storage.energy_balance[self.time_step]
 
         if isinstance(self.heating_device, HeatPump):
-            heating_consumption = self.heating_device.get_input_power(heating_demand, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)
+            heating_consumption = self.heating_device.get_input_power(heating_demand, heating=True)
         else:
             heating_consumption = self.dhw_device.get_input_power(heating_demand)
 
-        self.__heating_electricity_consumption.append(heating_consumption)
+        self.__heating_electricity_consumption.append(self.dtype.type(heating_consumption))
 
         # dhw electricity consumption
         dhw_demand = self.energy_simulation.dhw_demand[self.time_step] + self.dhw_storage.energy_balance[self.time_step]
 
         if isinstance(self.dhw_device, HeatPump):
-            dhw_consumption = self.dhw_device.get_input_power(dhw_demand, self.weather.outdoor_dry_bulb_temperature[self.time_step], heating=True)
+            dhw_consumption = self.dhw_device.get_input_power(dhw_demand, heating=True)
         else:
             dhw_consumption = self.dhw_device.get_input_power(dhw_demand)
 
-        self.__dhw_electricity_consumption.append(dhw_consumption)
+        self.__dhw_electricity_consumption.append(self.dtype.type(dhw_consumption))
 
         # net electricity consumption
         net_electricity_consumption = cooling_consumption \
@@ -1012,10 +1416,11 @@ class Building(Environment):
                     + self.electrical_storage.electricity_consumption[self.time_step] \
                         + self.energy_simulation.non_shiftable_load[self.time_step] \
                             + self.__solar_generation[self.time_step]
+        net_electricity_consumption = self.dtype.type(net_electricity_consumption)
         self.__net_electricity_consumption.append(net_electricity_consumption)
 
         # net electriciy consumption cost
-        self.__net_electricity_consumption_cost.append(net_electricity_consumption*self.pricing.electricity_pricing[self.time_step])
+        self.__net_electricity_consumption_cost.append(self.dtype.type(net_electricity_consumption*self.pricing.electricity_pricing[self.time_step]))
 
         # net electriciy consumption emission
-        self.__net_electricity_consumption_emission.append(max(0, net_electricity_consumption*self.carbon_intensity.carbon_intensity[self.time_step]))
\ No newline at end of file
+        self.__net_electricity_consumption_emission.append(self.dtype.type(max(0, net_electricity_consumption*self.carbon_intensity.carbon_intensity[self.time_step])))
\ No newline at end of file
@@ -1,25 +1,73 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import copy
+from functools import lru_cache, partial
+import hashlib
 import importlib
 import logging
 import os
 from pathlib import Path
-from typing import Any, List, Mapping, Tuple, Union
+import tempfile
+import uuid
+from typing import Any, Callable, Iterator, List, Mapping, Tuple, Union
 from gym import Env, spaces
 import numpy as np
 import pandas as pd
+import simplejson as json
+import citylearn
 from citylearn.base import Environment
 from citylearn.building import Building
-from citylearn.cost_function import CostFunction
-from citylearn.data import DataSet, EnergySimulation, CarbonIntensity, Pricing, Weather
-from citylearn.utilities import read_json
+from citylearn.cost_function import CostFunctionAccumulator
+from citylearn.district import District
+from citylearn.energy_model import HeatPump
+from citylearn.data import DataSet, EnergySimulation, CarbonIntensity, Pricing, RewardState, TimeSeriesCache, Weather
+from citylearn.utilities import read_json, write_json
 
 LOGGER = logging.getLogger()
 logging.getLogger('matplotlib.font_manager').disabled = True
 logging.getLogger('matplotlib.pyplot').disabled = True
 
 class CityLearnEnv(Environment, Env):
+    # device attributes that are set by autosizing
+    __AUTOSIZE_ATTRIBUTES = ['capacity', 'nominal_power']
+
+    # building time series that are summed in the district time series in the order of the stacked building variables
+    __DISTRICT_VARIABLES = [
+        'net_electricity_consumption_without_storage_and_pv_emission',
+        'net_electricity_consumption_without_storage_and_pv_cost',
+        'net_electricity_consumption_without_storage_and_pv',
+        'net_electricity_consumption_without_storage_emission',
+        'net_electricity_consumption_without_storage_cost',
+        'net_electricity_consumption_without_storage',
+        'cooling_electricity_consumption',
+        'heating_electricity_consumption',
+        'dhw_electricity_consumption',
+        'cooling_storage_electricity_consumption',
+        'heating_storage_electricity_consumption',
+        'dhw_storage_electricity_consumption',
+        'electrical_storage_electricity_consumption',
+        'energy_from_cooling_device_to_cooling_storage',
+        'energy_from_heating_device_to_heating_storage',
+        'energy_from_dhw_device_to_dhw_storage',
+        'energy_to_electrical_storage',
+        'energy_from_cooling_device',
+        'energy_from_heating_device',
+        'energy_from_dhw_device',
+        'energy_from_cooling_storage',
+        'energy_from_heating_storage',
+        'energy_from_dhw_storage',
+        'energy_from_electrical_storage',
+        'cooling_demand',
+        'heating_demand',
+        'dhw_demand',
+        'non_shiftable_load_demand',
+        'solar_generation',
+    ]
+
     def __init__(self, 
         schema: Union[str, Path, Mapping[str, Any]], root_directory: Union[str, Path] = None, buildings: List[Building] = None, simulation_start_time_step: int = None, simulation_end_time_step: int = None, 
-        reward_function: 'citylearn.reward_function.RewardFunction' = None, central_agent: bool = None, shared_observations: List[str] = None, **kwargs
+        reward_function: 'citylearn.reward_function.RewardFunction' = None, central_agent: bool = None, shared_observations: List[str] = None, 
+        use_data_cache: bool = None, data_cache_directory: Union[str, Path] = None, memory_map: bool = None, load_workers: int = None, lazy_load: bool = None, dtype: Union[str, type] = None, use_schema_cache: bool = None, 
+        episode_time_steps: int = None, random_episode_start: bool = None, vectorized: bool = None, **kwargs
     ):
         r"""Initialize `CityLearnEnv`.
 
@@ -43,6 +91,47 @@ class CityLearnEnv(Environment, Env):
         shared_observations: List[str], optional
             Names of common observations across all buildings i.e. observations that have the same value irrespective of the building.
             If provided, will override :code:`observations:<observation>:shared_in_central_agent` definitions in schema.
+        use_data_cache: bool, default: True
+            Whether to read data files through the binary :py:class:`citylearn.data.TimeSeriesCache` instead of parsing the `.csv` files.
+        data_cache_directory: Union[str, Path], optional
+            Directory for the binary data file cache. See :py:class:`citylearn.data.TimeSeriesCache` for the default.
+        memory_map: bool, default: False
+            Whether to back the float time series in `EnergySimulation`, `Weather`, `Pricing` and `CarbonIntensity` with read-only
+            `np.memmap` views of the data file cache instead of in-memory copies so that environments in different processes share
+            the same pages. Requires `use_data_cache` = True.
+        load_workers: int, default: 1
+            Number of threads used to construct buildings concurrently. Buildings are kept in schema order and
+            their data, devices and autosized capacities are identical to those constructed serially.
+        lazy_load: bool, default: False
+            Whether to defer reading each building's time series, autosizing its devices and estimating its spaces until
+            first access to :py:attr:`citylearn.building.Building.energy_simulation`, :py:attr:`citylearn.building.Building.weather`,
+            :py:attr:`citylearn.building.Building.carbon_intensity`, :py:attr:`citylearn.building.Building.pricing`
+            or its spaces. Building names, device specifications and, observation and action metadata are available
+            immediately and, buildings are not reset during initialization so that only the buildings that are used are loaded.
+            The environment is then reset on the first :py:meth:`step` if :py:meth:`reset` is not called, which loads all buildings.
+        dtype: Union[str, type], default: float
+            Floating point data type of the time series, device and building histories and, observations e.g. 'float32' to halve their memory
+            footprint. In 'float32', :py:meth:`evaluate` KPIs are within a relative tolerance of 1e-4 of those in the default float64 precision
+            for the same actions. The `memory_map` views are copied when `dtype` is not float64 as the data file cache is stored in float64.
+            It is also the data type of the stacked building variables in :py:meth:`get_building_variable` that take 29 values per time step
+            and building i.e. about 2 MB per building for an episode of 8,760 time steps in float64, allocated in each environment.
+        use_schema_cache: bool, default: False
+            Whether to reuse the compiled schema i.e. the buildings' observation and action metadata, autosized device capacities and nominal powers,
+            and observation and action spaces, from a previous initialization instead of autosizing and estimating them. The compiled schema is 
+            stored in the `data_cache_directory` and keyed by a hash of the schema, the content of its data files, `dtype` and the CityLearn version.
+            It is written by initializations that are not `lazy_load`.
+        episode_time_steps: int, optional
+            Number of time steps in an episode when not specified in :py:meth:`reset`. Defaults to the time steps from the episode
+            start to `simulation_end_time_step`.
+        random_episode_start: bool, default: False
+            Whether :py:meth:`reset` draws the episode start time step uniformly at random between `simulation_start_time_step` and
+            the last time step that fits `episode_time_steps` when not specified in :py:meth:`reset`.
+        vectorized: bool, default: False
+            Whether to advance the buildings with a :py:class:`citylearn.district.District` that holds the state of all buildings and their
+            devices in stacked arrays and steps them in one vectorized update instead of stepping each building object. The observations, rewards
+            and :py:meth:`evaluate` results are identical to those of the building objects for float64 actions and `dtype`. The building objects
+            are synchronized with the district on access through `buildings` so reward functions and wrappers that read the buildings
+            each time step reduce the speedup. Requires that each building's devices are distinct objects.
 
         Other Parameters
         ----------------
@@ -52,6 +141,21 @@ class CityLearnEnv(Environment, Env):
 
         self.schema = schema
         self.__rewards = None
+        self.__branch = None
+        self.__trajectory = None
+        self.__lazy_load = False if lazy_load is None else lazy_load
+        self.episode_time_steps = episode_time_steps
+        self.random_episode_start = random_episode_start
+        self.__episode_start_time_step = None
+        self.__episode_random_state = None
+        self.__cache = {}
+        self.__cost_function_accumulators = None
+        self.__building_variables = None
+        self.__district_variables = None
+        self.__variables = None
+        self.__reward_state = None
+        self.__vectorized = False if vectorized is None else vectorized
+        self.__district = None
         self.root_directory, self.buildings, self.simulation_start_time_step, self.simulation_end_time_step, self.seconds_per_time_step,\
             self.reward_function, self.central_agent, self.shared_observations = self.__load(
                 root_directory=root_directory,
@@ -61,8 +165,15 @@ class CityLearnEnv(Environment, Env):
                 reward_function=reward_function,
                 central_agent=central_agent,
                 shared_observations=shared_observations,
+                use_data_cache=use_data_cache,
+                data_cache_directory=data_cache_directory,
+                memory_map=memory_map,
+                load_workers=load_workers,
+                lazy_load=self.__lazy_load,
+                dtype=dtype,
+                use_schema_cache=use_schema_cache,
             )
-        super().__init__(**kwargs)
+        super().__init__(dtype=dtype, **kwargs)
 
     @property
     def schema(self) -> Union[str, Path, Mapping[str, Any]]:
@@ -78,7 +189,15 @@ class CityLearnEnv(Environment, Env):
 
     @property
     def buildings(self) -> List[Building]:
-        """Buildings in CityLearn environment."""
+        """Buildings in CityLearn environment.
+
+        If `vectorized` is True, the buildings are synchronized with the district at the current time step on access.
+        """
+
+        if self.__district is not None:
+            self.__district.synchronize()
+        else:
+            pass
 
         return self.__buildings
 
@@ -96,9 +215,27 @@ class CityLearnEnv(Environment, Env):
 
     @property
     def time_steps(self) -> int:
-        """Number of simulation time steps."""
+        """Number of simulation time steps in current episode."""
 
-        return (self.simulation_end_time_step - self.simulation_start_time_step) + 1
+        return self.__time_steps
+
+    @property
+    def episode_start_time_step(self) -> int:
+        """Time step in data files that current episode starts at."""
+
+        return self.__episode_start_time_step
+
+    @property
+    def episode_time_steps(self) -> int:
+        """Number of time steps in an episode when not specified in `reset`."""
+
+        return self.__episode_time_steps
+
+    @property
+    def random_episode_start(self) -> bool:
+        """Whether `reset` draws the episode start time step at random when not specified."""
+
+        return self.__random_episode_start
 
     @property
     def reward_function(self) -> 'citylearn.reward_function.RewardFunction':
@@ -112,6 +249,76 @@ class CityLearnEnv(Environment, Env):
 
         return self.__rewards
 
+    @episode_time_steps.setter
+    def episode_time_steps(self, episode_time_steps: int):
+        assert episode_time_steps is None or episode_time_steps >= 1, 'episode_time_steps must be >= 1.'
+        self.__episode_time_steps = episode_time_steps
+
+    @random_episode_start.setter
+    def random_episode_start(self, random_episode_start: bool):
+        self.__random_episode_start = False if random_episode_start is None else random_episode_start
+
+    @property
+    def reward_state(self) -> RewardState:
+        """Read-only state at current `time_step` that `reward_function` is calculated from.
+
+        The state is built on first access at each time step from the building variables of :py:meth:`update_variables` so that reward 
+        functions calculated from it are vectorized expressions that do not read, or synchronize when `vectorized` is True, the building objects.
+        """
+
+        if self.__reward_state is None:
+            t = self.time_step
+
+            if self.__variables is not None:
+                variables = self.__variables
+            elif self.__district is not None:
+                variables = self.__district.get_variables()
+            else:
+                variables = self.__get_variables(self.__buildings, t)
+
+            self.__reward_state = RewardState(
+                central_agent=self.central_agent,
+                district_net_electricity_consumption=self.__net_electricity_consumption[t],
+                district_net_electricity_consumption_cost=self.__net_electricity_consumption_cost[t],
+                district_net_electricity_consumption_emission=self.__net_electricity_consumption_emission[t],
+                net_electricity_consumption=variables['net_electricity_consumption'],
+                net_electricity_consumption_cost=variables['net_electricity_consumption_cost'],
+                net_electricity_consumption_emission=variables['net_electricity_consumption_emission'],
+                solar_generation=variables['solar_generation'],
+                cooling_storage_soc=variables['soc'][0],
+                heating_storage_soc=variables['soc'][1],
+                dhw_storage_soc=variables['soc'][2],
+                electrical_storage_soc=variables['electrical_storage_soc'],
+                cooling_storage_capacity=variables['capacity'][0],
+                heating_storage_capacity=variables['capacity'][1],
+                dhw_storage_capacity=variables['capacity'][2],
+                electrical_storage_capacity=variables['electrical_storage_capacity'],
+                electricity_pricing=variables['electricity_pricing'],
+                carbon_intensity=variables['carbon_intensity'],
+            )
+        else:
+            pass
+
+        return self.__reward_state
+
+    @property
+    def lazy_load(self) -> bool:
+        """Whether building time series are loaded on first access."""
+
+        return self.__lazy_load
+
+    @property
+    def vectorized(self) -> bool:
+        """Whether buildings are advanced with a vectorized :py:class:`citylearn.district.District`."""
+
+        return self.__vectorized
+
+    @property
+    def district(self) -> District:
+        """Vectorized district that advances `buildings` when `vectorized` is True after :py:meth:`reset` otherwise, None."""
+
+        return self.__district
+
     @property
     def central_agent(self) -> bool:
         """Expect 1 central agent to control all buildings."""
@@ -144,22 +351,13 @@ class CityLearnEnv(Environment, Env):
         If `central_agent` is True, a list of 1 `spaces.Box` object is returned that contains all buildings' limits with the limits in the same order as `buildings`. 
         The `shared_observations` limits are only included in the first building's limits. If `central_agent` is False, a list of `space.Box` objects as
         many as `buildings` is returned in the same order as `buildings`.
+
+        The spaces are cached and rebuilt when `buildings`, `central_agent`, `shared_observations` or a building's `observation_metadata` or 
+        `observation_space` is set.
         """
 
-        if self.central_agent:
-            low_limit = [
-                v for i, b in enumerate(self.buildings) for v, s in zip(b.observation_space.low, b.active_observations) 
-                if i == 0 or s not in self.shared_observations
-            ]
-            high_limit = [
-                v for i, b in enumerate(self.buildings) for v, s in zip(b.observation_space.high, b.active_observations) 
-                if i == 0 or s not in self.shared_observations
-            ]
-            observation_space = [spaces.Box(low=np.array(low_limit), high=np.array(high_limit), dtype=np.float32)]
-        else:
-            observation_space = [b.observation_space for b in self.buildings]
-        
-        return observation_space
+        key = (self.central_agent, tuple(self.shared_observations), tuple((b, b.observation_metadata, b.observation_space) for b in self.__buildings))
+        return list(self.__get_cached('observation_space', key, self.__get_observation_space))
 
     @property
     def action_space(self) -> List[spaces.Box]:
@@ -174,16 +372,12 @@ class CityLearnEnv(Environment, Env):
         -----
         If `central_agent` is True, a list of 1 `spaces.Box` object is returned that contains all buildings' limits with the limits in the same order as `buildings`. 
         If `central_agent` is False, a list of `space.Box` objects as many as `buildings` is returned in the same order as `buildings`.
+
+        The spaces are cached and rebuilt when `buildings`, `central_agent` or a building's `action_space` is set.
         """
 
-        if self.central_agent:
-            low_limit = [v for b in self.buildings for v in b.action_space.low]
-            high_limit = [v for b in self.buildings for v in b.action_space.high]
-            action_space = [spaces.Box(low=np.array(low_limit), high=np.array(high_limit), dtype=np.float32)]
-        else:
-            action_space = [b.action_space for b in self.buildings]
-        
-        return action_space
+        key = (self.central_agent, tuple((b, b.action_space) for b in self.__buildings))
+        return list(self.__get_cached('action_space', key, self.__get_action_space))
 
     @property
     def observations(self) -> List[List[float]]:
@@ -196,9 +390,19 @@ class CityLearnEnv(Environment, Env):
         is returned where each sublist is a list of 1 building's observation values and the sublist in the same order as `buildings`.
         """
 
-        return [[
-            v for i, b in enumerate(self.buildings) for k, v in b.observations().items() if i == 0 or k not in self.shared_observations
-        ]] if self.central_agent else [list(b.observations().values()) for b in self.buildings]
+        masks = self.__get_cached_observation_names()[1]
+
+        if self.__district is not None:
+            observations = np.split(self.__district.get_observations(), np.cumsum([len(m) for m in masks])[:-1])
+        else:
+            observations = [b.get_observations() for b in self.buildings]
+
+        if self.central_agent:
+            observations = [list(np.concatenate([o[m] for o, m in zip(observations, masks)]))]
+        else:
+            observations = [list(o) for o in observations]
+
+        return observations
 
 
     @property
@@ -210,47 +414,47 @@ class CityLearnEnv(Environment, Env):
         If `central_agent` is True, a list of 1 sublist containing all building observation names is returned in the same order as `buildings`. 
         The `shared_observations` names are only included in the first building's observation names. If `central_agent` is False, a list of sublists 
         is returned where each sublist is a list of 1 building's observation names and the sublist in the same order as `buildings`.
+
+        The names are cached and rebuilt when `buildings`, `central_agent`, `shared_observations` or a building's `observation_metadata` is set.
         """
 
-        return [[
-            k for i, b in enumerate(self.buildings) for k, v in b.observations().items() if i == 0 or k not in self.shared_observations
-        ]] if self.central_agent else [list(b.observations().keys()) for b in self.buildings]
+        return [list(n) for n in self.__get_cached_observation_names()[0]]
 
     @property
     def net_electricity_consumption_without_storage_and_pv_emission(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage_and_pv_emission` time series, in [kg_co2]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage_and_pv_emission for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('net_electricity_consumption_without_storage_and_pv_emission')
 
     @property
     def net_electricity_consumption_without_storage_and_pv_cost(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage_and_pv_cost` time series, in [$]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage_and_pv_cost for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('net_electricity_consumption_without_storage_and_pv_cost')
 
     @property
     def net_electricity_consumption_without_storage_and_pv(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage_and_pv` time series, in [kWh]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage_and_pv for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('net_electricity_consumption_without_storage_and_pv')
 
     @property
     def net_electricity_consumption_without_storage_emission(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage_emission` time series, in [kg_co2]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage_emission for b in self.buildings]).sum(axis = 0, min_count = 1).tolist()
+        return self.__get_district_variable('net_electricity_consumption_without_storage_emission')
 
     @property
     def net_electricity_consumption_without_storage_cost(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage_cost` time series, in [$]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage_cost for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('net_electricity_consumption_without_storage_cost')
 
     @property
     def net_electricity_consumption_without_storage(self) -> np.ndarray:
         """Summed `Building.net_electricity_consumption_without_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.net_electricity_consumption_without_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('net_electricity_consumption_without_storage')
 
     @property
     def net_electricity_consumption_emission(self) -> List[float]:
@@ -274,139 +478,139 @@ class CityLearnEnv(Environment, Env):
     def cooling_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.cooling_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.cooling_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('cooling_electricity_consumption')
 
     @property
     def heating_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.heating_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.heating_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('heating_electricity_consumption')
 
     @property
     def dhw_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.dhw_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.dhw_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('dhw_electricity_consumption')
 
     @property
     def cooling_storage_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.cooling_storage_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.cooling_storage_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('cooling_storage_electricity_consumption')
 
     @property
     def heating_storage_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.heating_storage_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.heating_storage_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('heating_storage_electricity_consumption')
 
     @property
     def dhw_storage_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.dhw_storage_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.dhw_storage_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('dhw_storage_electricity_consumption')
 
     @property
     def electrical_storage_electricity_consumption(self) -> np.ndarray:
         """Summed `Building.electrical_storage_electricity_consumption` time series, in [kWh]."""
 
-        return pd.DataFrame([b.electrical_storage_electricity_consumption for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('electrical_storage_electricity_consumption')
 
     @property
     def energy_from_cooling_device_to_cooling_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_cooling_device_to_cooling_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_cooling_device_to_cooling_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_cooling_device_to_cooling_storage')
 
     @property
     def energy_from_heating_device_to_heating_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_heating_device_to_heating_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_heating_device_to_heating_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_heating_device_to_heating_storage')
 
     @property
     def energy_from_dhw_device_to_dhw_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_dhw_device_to_dhw_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_dhw_device_to_dhw_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_dhw_device_to_dhw_storage')
 
     @property
     def energy_to_electrical_storage(self) -> np.ndarray:
         """Summed `Building.energy_to_electrical_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_to_electrical_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_to_electrical_storage')
 
     @property
     def energy_from_cooling_device(self) -> np.ndarray:
         """Summed `Building.energy_from_cooling_device` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_cooling_device for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_cooling_device')
 
     @property
     def energy_from_heating_device(self) -> np.ndarray:
         """Summed `Building.energy_from_heating_device` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_heating_device for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_heating_device')
 
     @property
     def energy_from_dhw_device(self) -> np.ndarray:
         """Summed `Building.energy_from_dhw_device` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_dhw_device for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_dhw_device')
 
     @property
     def energy_from_cooling_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_cooling_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_cooling_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_cooling_storage')
 
     @property
     def energy_from_heating_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_heating_storage` time series, in [kWh]."""
         
-        return pd.DataFrame([b.energy_from_heating_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_heating_storage')
 
     @property
     def energy_from_dhw_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_dhw_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_dhw_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_dhw_storage')
 
     @property
     def energy_from_electrical_storage(self) -> np.ndarray:
         """Summed `Building.energy_from_electrical_storage` time series, in [kWh]."""
 
-        return pd.DataFrame([b.energy_from_electrical_storage for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('energy_from_electrical_storage')
 
     @property
     def cooling_demand(self) -> np.ndarray:
         """Summed `Building.cooling_demand`, in [kWh]."""
 
-        return pd.DataFrame([b.cooling_demand for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('cooling_demand')
 
     @property
     def heating_demand(self) -> np.ndarray:
         """Summed `Building.heating_demand`, in [kWh]."""
 
-        return pd.DataFrame([b.heating_demand for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('heating_demand')
 
     @property
     def dhw_demand(self) -> np.ndarray:
         """Summed `Building.dhw_demand`, in [kWh]."""
 
-        return pd.DataFrame([b.dhw_demand for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('dhw_demand')
 
     @property
     def non_shiftable_load_demand(self) -> np.ndarray:
         """Summed `Building.non_shiftable_load_demand`, in [kWh]."""
 
-        return pd.DataFrame([b.non_shiftable_load_demand for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('non_shiftable_load_demand')
 
     @property
     def solar_generation(self) -> np.ndarray:
         """Summed `Building.solar_generation, in [kWh]`."""
 
-        return pd.DataFrame([b.solar_generation for b in self.buildings]).sum(axis = 0, min_count = 1).to_numpy()
+        return self.__get_district_variable('solar_generation')
 
     @schema.setter
     def schema(self, schema: Union[str, Path, Mapping[str, Any]]):
@@ -442,6 +646,13 @@ class CityLearnEnv(Environment, Env):
     def shared_observations(self, shared_observations: List[str]):
         self.__shared_observations = self.get_default_shared_observations() if shared_observations is None else shared_observations
 
+    @district.setter
+    def district(self, district: District):
+        assert self.__district is not None, 'district can only be set after reset when vectorized is True.'
+        assert [id(b) for b in district.buildings] == [id(b) for b in self.__buildings], 'district buildings must be buildings.'
+        assert district.time_step == self.time_step, 'district must be at time_step.'
+        self.__district = district
+
     @staticmethod
     def get_default_shared_observations() -> List[str]:
         """Names of default common observations across all buildings i.e. observations that have the same value irrespective of the building.
@@ -492,16 +703,79 @@ class CityLearnEnv(Environment, Env):
             Override :meth"`get_info` to get custom key-value pairs in `info`.
         """
 
-        actions = self.__parse_actions(actions)
+        # the initialization reset of a lazily loaded environment is deferred so the episode is reset on the first step if not by reset
+        if self.__rewards is None:
+            self.reset(start_time_step=self.episode_start_time_step, episode_time_steps=self.time_steps)
+        else:
+            pass
 
-        for building, building_actions in zip(self.buildings, actions):
-            building.apply_actions(**building_actions)
+        if self.__district is not None:
+            self.__district.apply_actions(actions[0] if self.central_agent else np.concatenate(actions))
+        else:
+            actions = self.__parse_actions(actions)
+
+            for building, building_actions in zip(self.buildings, actions):
+                building.apply_actions(**building_actions)
 
         self.next_time_step()
         reward = self.reward_function.calculate()
         self.__rewards.append(reward)
         return self.observations, reward, self.done, self.get_info()
 
+    def __get_cached(self, name: str, key: Tuple[Any, ...], get_value: Callable[[], Any]) -> Any:
+        # the key holds the objects the value is derived from. Objects in the key are compared by identity before equality
+        # so checking the key is much cheaper than deriving the value.
+        cached_key, value = self.__cache.get(name, (None, None))
+
+        if cached_key is None or cached_key != key:
+            value = get_value()
+            self.__cache[name] = (key, value)
+        else:
+            pass
+
+        return value
+
+    def __get_cached_observation_names(self) -> Tuple[List[List[str]], List[np.ndarray]]:
+        key = (self.central_agent, tuple(self.shared_observations), tuple((b, b.observation_metadata) for b in self.__buildings))
+        return self.__get_cached('observation_names', key, self.__get_observation_names)
+
+    def __get_observation_names(self) -> Tuple[List[List[str]], List[np.ndarray]]:
+        # names and, for central agent, masks of each building's observations that are not shared observations of a previous building
+        masks = [np.array([i == 0 or k not in self.shared_observations for k in b.active_observations], dtype=bool) for i, b in enumerate(self.buildings)]
+
+        if self.central_agent:
+            names = [[k for b, m in zip(self.buildings, masks) for k, v in zip(b.active_observations, m) if v]]
+        else:
+            names = [b.active_observations for b in self.buildings]
+
+        return names, masks
+
+    def __get_observation_space(self) -> List[spaces.Box]:
+        if self.central_agent:
+            low_limit = [
+                v for i, b in enumerate(self.buildings) for v, s in zip(b.observation_space.low, b.active_observations) 
+                if i == 0 or s not in self.shared_observations
+            ]
+            high_limit = [
+                v for i, b in enumerate(self.buildings) for v, s in zip(b.observation_space.high, b.active_observations) 
+                if i == 0 or s not in self.shared_observations
+            ]
+            observation_space = [spaces.Box(low=np.array(low_limit), high=np.array(high_limit), dtype=np.float32)]
+        else:
+            observation_space = [b.observation_space for b in self.buildings]
+        
+        return observation_space
+
+    def __get_action_space(self) -> List[spaces.Box]:
+        if self.central_agent:
+            low_limit = [v for b in self.buildings for v in b.action_space.low]
+            high_limit = [v for b in self.buildings for v in b.action_space.high]
+            action_space = [spaces.Box(low=np.array(low_limit), high=np.array(high_limit), dtype=np.float32)]
+        else:
+            action_space = [b.action_space for b in self.buildings]
+        
+        return action_space
+
     def get_info(self) -> Mapping[Any, Any]:
         return {}
 
@@ -589,55 +863,60 @@ class CityLearnEnv(Environment, Env):
         The equation for the returned cost function values is :math:`\frac{C_{\textrm{control}}}{C_{\textrm{no control}}}` 
         where :math:`C_{\textrm{control}}` is the value when the agent(s) control the environment and :math:`C_{\textrm{no control}}`
         is the value when none of the flexible distributed energy resources in the environment are actively in use and controlled.
+
+        The cost functions are accumulated with :py:class:`citylearn.cost_function.CostFunctionAccumulator` objects that are extended with the
+        time steps since the previous evaluation so that evaluating at every time step does not recompute the cost functions over the episode.
+        The values equal those of the :py:class:`citylearn.cost_function.CostFunction` methods up to floating point rounding.
         """
 
+        accumulators = self.__get_cost_function_accumulators()
         building_level = []
 
-        for b in self.buildings:
+        for b, a, carbon_intensity, pricing in zip(
+            self.buildings, accumulators['building'], accumulators['carbon_intensity'], accumulators['pricing']
+        ):
             building_level += [{
                 'name': b.name,
                 'cost_function': 'electricity_consumption',
-                'value': CostFunction.electricity_consumption(b.net_electricity_consumption)[-1]/\
-                    CostFunction.electricity_consumption(b.net_electricity_consumption_without_storage)[-1],
+                'value': a['net_electricity_consumption'].get('electricity_consumption')/\
+                    a['net_electricity_consumption_without_storage'].get('electricity_consumption'),
                 }, {
                 'name': b.name,
                 'cost_function': 'zero_net_energy',
-                'value': CostFunction.zero_net_energy(b.net_electricity_consumption)[-1]/\
-                    CostFunction.zero_net_energy(b.net_electricity_consumption_without_storage)[-1],
+                'value': a['net_electricity_consumption'].get('zero_net_energy')/\
+                    a['net_electricity_consumption_without_storage'].get('zero_net_energy'),
                 }, {
                 'name': b.name,
                 'cost_function': 'carbon_emissions',
-                'value': CostFunction.carbon_emissions(b.net_electricity_consumption_emission)[-1]/\
-                    CostFunction.carbon_emissions(b.net_electricity_consumption_without_storage_emission)[-1]\
-                        if sum(b.carbon_intensity.carbon_intensity) != 0 else None,
+                'value': a['net_electricity_consumption_emission'].get('carbon_emissions')/\
+                    a['net_electricity_consumption_without_storage_emission'].get('carbon_emissions')\
+                        if carbon_intensity else None,
                 }, {
                 'name': b.name,
                 'cost_function': 'cost',
-                'value': CostFunction.cost(b.net_electricity_consumption_cost)[-1]/\
-                    CostFunction.cost(b.net_electricity_consumption_without_storage_cost)[-1]\
-                        if sum(b.pricing.electricity_pricing) != 0 else None,
+                'value': a['net_electricity_consumption_cost'].get('cost')/\
+                    a['net_electricity_consumption_without_storage_cost'].get('cost')\
+                        if pricing else None,
                 }]
 
         building_level = pd.DataFrame(building_level)
         building_level['level'] = 'building'
 
         ## district level
+        a = accumulators['district']
         district_level = pd.DataFrame([{
             'cost_function': 'ramping',
-            'value': CostFunction.ramping(self.net_electricity_consumption)[-1]/\
-                CostFunction.ramping(self.net_electricity_consumption_without_storage)[-1],
+            'value': a['net_electricity_consumption'].get('ramping')/a['net_electricity_consumption_without_storage'].get('ramping'),
             }, {
             'cost_function': '1 - load_factor',
-            'value': CostFunction.load_factor(self.net_electricity_consumption)[-1]/\
-                CostFunction.load_factor(self.net_electricity_consumption_without_storage)[-1],
+            'value': a['net_electricity_consumption'].get('load_factor')/a['net_electricity_consumption_without_storage'].get('load_factor'),
             }, {
             'cost_function': 'average_daily_peak',
-            'value': CostFunction.average_daily_peak(self.net_electricity_consumption)[-1]/\
-                CostFunction.average_daily_peak(self.net_electricity_consumption_without_storage)[-1],
+            'value': a['net_electricity_consumption'].get('average_daily_peak')/\
+                a['net_electricity_consumption_without_storage'].get('average_daily_peak'),
             }, {
             'cost_function': 'peak_demand',
-            'value': CostFunction.peak_demand(self.net_electricity_consumption)[-1]/\
-                CostFunction.peak_demand(self.net_electricity_consumption_without_storage)[-1],
+            'value': a['net_electricity_consumption'].get('peak_demand')/a['net_electricity_consumption_without_storage'].get('peak_demand'),
             }])
 
         district_level = pd.concat([district_level, building_level], ignore_index=True, sort=False)
@@ -648,32 +927,107 @@ class CityLearnEnv(Environment, Env):
 
         return cost_functions
 
+    def __get_cost_function_accumulators(self) -> Mapping[str, Any]:
+        # evaluate cost function accumulators of each building and the district extended with the time series values since the last evaluation.
+        # They are reset with the episode, a set_state or a change of buildings as the time series are then rewritten.
+        buildings = self.buildings
+        accumulators = self.__cost_function_accumulators
+
+        if accumulators is None or [id(b) for b in accumulators['buildings']] != [id(b) for b in buildings]:
+            building_cost_functions = {
+                'net_electricity_consumption': ['electricity_consumption', 'zero_net_energy'],
+                'net_electricity_consumption_emission': ['carbon_emissions'],
+                'net_electricity_consumption_cost': ['cost'],
+            }
+            building_cost_functions.update({k.replace('consumption', 'consumption_without_storage'): v for k, v in building_cost_functions.items()})
+            district_cost_functions = ['ramping', 'load_factor', 'average_daily_peak', 'peak_demand']
+            accumulators = {
+                'buildings': list(buildings),
+                'building': [{k: CostFunctionAccumulator(v) for k, v in building_cost_functions.items()} for _ in buildings],
+                'district': {k: CostFunctionAccumulator(district_cost_functions) for k in [
+                    'net_electricity_consumption', 'net_electricity_consumption_without_storage'
+                ]},
+                'carbon_intensity': [sum(b.carbon_intensity.carbon_intensity) != 0 for b in buildings],
+                'pricing': [sum(b.pricing.electricity_pricing) != 0 for b in buildings],
+            }
+            self.__cost_function_accumulators = accumulators
+        else:
+            pass
+
+        for b, building_accumulators in zip(buildings, accumulators['building']):
+            for k, a in building_accumulators.items():
+                a.update(getattr(b, k)[a.length:])
+
+        # the district time series are read from the stacked building variables so only the values since the last evaluation are read
+        a = accumulators['district']['net_electricity_consumption']
+        a.update(self.net_electricity_consumption[a.length:])
+        a = accumulators['district']['net_electricity_consumption_without_storage']
+        a.update(self.net_electricity_consumption_without_storage[a.length:])
+
+        return accumulators
+
     def next_time_step(self):
         r"""Advance all buildings to next `time_step`."""
 
-        for building in self.buildings:
-            building.next_time_step()
+        if self.__district is not None:
+            self.__district.next_time_step()
+        else:
+            for building in self.buildings:
+                building.next_time_step()
         
         super().next_time_step()
         self.update_variables()
 
-    def reset(self) -> List[List[float]]:
+    def reset(self, start_time_step: int = None, episode_time_steps: int = None) -> List[List[float]]:
         r"""Reset `CityLearnEnv` to initial state.
+
+        Parameters
+        ----------
+        start_time_step: int, optional
+            Time step in data files to start the episode at, between `simulation_start_time_step` and `simulation_end_time_step`. 
+            Defaults to a random time step if `random_episode_start` is True otherwise, `simulation_start_time_step`.
+        episode_time_steps: int, optional
+            Number of time steps in the episode. Defaults to `episode_time_steps`.
         
         Returns
         -------
         observations: List[List[float]]
-            :attr:`observations`. 
+            :attr:`observations`.
+
+        Notes
+        -----
+        The episode time series are views of the loaded time series so that changing the episode window does not read data files.
         """
 
+        # lazily loaded buildings are left untouched during initialization i.e. before time_step is first set
+        initialization = self.time_step is None
+
         # object reset
         super().reset()
+        self.__district = None
+        self.__set_episode(start_time_step, episode_time_steps)
+
+        if self.lazy_load and initialization:
+            return None
+        else:
+            pass
 
         for building in self.buildings:
+            building.set_episode(self.episode_start_time_step - self.simulation_start_time_step, self.time_steps)
             building.reset()
 
+        if self.vectorized:
+            self.__district = District(self.__buildings, dtype=self.dtype)
+        else:
+            pass
+
         # variable reset
         self.__rewards = [[]]
+        self.__branch = self.__get_branch()
+        self.__trajectory = []
+        self.__cost_function_accumulators = None
+        self.__building_variables = np.full((self.time_steps, len(self.__DISTRICT_VARIABLES), len(self.__buildings)), np.nan, dtype=self.dtype)
+        self.__district_variables = np.full((self.time_steps, len(self.__DISTRICT_VARIABLES)), np.nan, dtype=self.dtype)
         self.__net_electricity_consumption = []
         self.__net_electricity_consumption_cost = []
         self.__net_electricity_consumption_emission = []
@@ -681,15 +1035,354 @@ class CityLearnEnv(Environment, Env):
 
         return self.observations
 
+    def __set_episode(self, start_time_step: int, episode_time_steps: int):
+        episode_time_steps = self.episode_time_steps if episode_time_steps is None else episode_time_steps
+
+        if start_time_step is None and self.random_episode_start:
+            if self.__episode_random_state is None:
+                self.__episode_random_state = np.random.default_rng(self.random_seed)
+            else:
+                pass
+
+            time_steps = 1 if episode_time_steps is None else episode_time_steps
+            start_time_step = int(self.__episode_random_state.integers(self.simulation_start_time_step, self.simulation_end_time_step - time_steps + 2))
+        
+        elif start_time_step is None:
+            start_time_step = self.simulation_start_time_step
+
+        else:
+            pass
+
+        episode_time_steps = self.simulation_end_time_step - start_time_step + 1 if episode_time_steps is None else episode_time_steps
+        assert self.simulation_start_time_step <= start_time_step <= self.simulation_end_time_step,\
+            'start_time_step must be between simulation_start_time_step and simulation_end_time_step.'
+        assert 1 <= episode_time_steps <= self.simulation_end_time_step - start_time_step + 1,\
+            'episode must end at or before simulation_end_time_step.'
+        self.__episode_start_time_step = start_time_step
+        self.__time_steps = episode_time_steps
+
     def update_variables(self):
+        if self.__district is not None:
+            # cumulative sums add the building values in the same order as sum so the totals are identical
+            net_electricity_consumption = np.cumsum(self.__district.net_electricity_consumption[:, self.time_step])[-1]
+            net_electricity_consumption_cost = np.cumsum(self.__district.net_electricity_consumption_cost[:, self.time_step])[-1]
+            net_electricity_consumption_emission = np.cumsum(self.__district.net_electricity_consumption_emission[:, self.time_step])[-1]
+            variables = self.__district.get_variables()
+        else:
+            net_electricity_consumption = sum([b.net_electricity_consumption[self.time_step] for b in self.buildings])
+            net_electricity_consumption_cost = sum([b.net_electricity_consumption_cost[self.time_step] for b in self.buildings])
+            net_electricity_consumption_emission = sum([b.net_electricity_consumption_emission[self.time_step] for b in self.buildings])
+            variables = self.__get_variables(self.buildings, self.time_step)
+
         # net electricity consumption
-        self.__net_electricity_consumption.append(sum([b.net_electricity_consumption[self.time_step] for b in self.buildings]))
+        self.__net_electricity_consumption.append(net_electricity_consumption)
 
         # net electriciy consumption cost
-        self.__net_electricity_consumption_cost.append(sum([b.net_electricity_consumption_cost[self.time_step] for b in self.buildings]))
+        self.__net_electricity_consumption_cost.append(net_electricity_consumption_cost)
 
         # net electriciy consumption emission
-        self.__net_electricity_consumption_emission.append(sum([b.net_electricity_consumption_emission[self.time_step] for b in self.buildings]))
+        self.__net_electricity_consumption_emission.append(net_electricity_consumption_emission)
+
+        # building variables and their district sums where NaN values are skipped and the sum of only NaN values is NaN as in the 
+        # DataFrame sum with min_count = 1. The buildings are summed along the contiguous last axis so the sums are identical.
+        if self.time_step >= self.__building_variables.shape[0]:
+            self.__building_variables = self.__resize_variables(self.__building_variables, self.time_step + 1)
+            self.__district_variables = self.__resize_variables(self.__district_variables, self.time_step + 1)
+        else:
+            pass
+
+        values = self.__building_variables[self.time_step]
+        values[:] = self.__get_building_variables(**variables)
+        nan = np.isnan(values)
+        sums = np.where(nan, 0.0, values).sum(axis=1)
+        sums[nan.all(axis=1)] = np.nan
+        self.__district_variables[self.time_step] = sums
+
+        # the reward state is built from the variables on first access
+        self.__variables = variables
+        self.__reward_state = None
+
+        # branch of each time step on the current trajectory that snapshots are checked against
+        self.__trajectory[self.time_step:] = [self.__branch]
+
+    @staticmethod
+    def __get_branch() -> int:
+        # random ID that is exactly represented in a float64 snapshot
+        return uuid.uuid4().int >> 75
+
+    def __resize_variables(self, variables: np.ndarray, length: int) -> np.ndarray:
+        # copy of the (time step, ...) variables that holds at least length time steps where the added time steps are NaN.
+        # A clone only holds the time steps up to its time_step so the variables are doubled up to the episode time steps.
+        resized_variables = np.full((max(length, min(2*variables.shape[0], self.time_steps)),) + variables.shape[1:], np.nan, dtype=variables.dtype)
+        resized_variables[:variables.shape[0]] = variables
+        return resized_variables
+
+    @staticmethod
+    def __get_variables(buildings: List[Building], time_step: int) -> Mapping[str, np.ndarray]:
+        # building variables at time_step as in District.get_variables
+        t = time_step
+        storage_tanks = [[b.cooling_storage, b.heating_storage, b.dhw_storage] for b in buildings]
+        devices = [[b.cooling_device, b.heating_device, b.dhw_device] for b in buildings]
+        energy_balance = [[s.energy_balance[t] for s in storage] for storage in storage_tanks]
+        soc = [[s.soc[t] for s in storage] for storage in storage_tanks]
+        capacity = [[s.capacity for s in storage] for storage in storage_tanks]
+        storage_electricity_consumption = [[
+            d.get_input_power(e, heating=j > 0) if isinstance(d, HeatPump) else d.get_input_power(e) 
+            for j, (d, e) in enumerate(zip(building_devices, building_energy_balance))
+        ] for building_devices, building_energy_balance in zip(devices, energy_balance)]
+
+        return {
+            'demand': np.array([[
+                b.energy_simulation.cooling_demand[t], b.energy_simulation.heating_demand[t], b.energy_simulation.dhw_demand[t]
+            ] for b in buildings], dtype=float).T,
+            'energy_balance': np.array(energy_balance, dtype=float).T,
+            'storage_electricity_consumption': np.array(storage_electricity_consumption, dtype=float).T,
+            'soc': np.array(soc, dtype=float).T,
+            'capacity': np.array(capacity, dtype=float).T,
+            'electricity_consumption': np.array([[
+                b.cooling_electricity_consumption[t], b.heating_electricity_consumption[t], b.dhw_electricity_consumption[t]
+            ] for b in buildings], dtype=float).T,
+            'electrical_storage_energy_balance': np.array([b.electrical_storage.energy_balance[t] for b in buildings], dtype=float),
+            'electrical_storage_soc': np.array([b.electrical_storage.soc[t] for b in buildings], dtype=float),
+            'electrical_storage_capacity': np.array([b.electrical_storage.capacity_history[0] for b in buildings], dtype=float),
+            'non_shiftable_load': np.array([b.energy_simulation.non_shiftable_load[t] for b in buildings], dtype=float),
+            'solar_generation': np.array([b.solar_generation[t] for b in buildings], dtype=float),
+            'net_electricity_consumption': np.array([b.net_electricity_consumption[t] for b in buildings], dtype=float),
+            'net_electricity_consumption_cost': np.array([b.net_electricity_consumption_cost[t] for b in buildings], dtype=float),
+            'net_electricity_consumption_emission': np.array([b.net_electricity_consumption_emission[t] for b in buildings], dtype=float),
+            'net_electricity_consumption_without_storage_and_pv': np.array([
+                b.net_electricity_consumption_without_storage_and_pv[t] for b in buildings
+            ], dtype=float),
+            'electricity_pricing': np.array([b.pricing.electricity_pricing[t] for b in buildings], dtype=float),
+            'carbon_intensity': np.array([b.carbon_intensity.carbon_intensity[t] for b in buildings], dtype=float),
+        }
+
+    @staticmethod
+    def __get_building_variables(
+        demand: np.ndarray, energy_balance: np.ndarray, storage_electricity_consumption: np.ndarray, electricity_consumption: np.ndarray,
+        electrical_storage_energy_balance: np.ndarray, non_shiftable_load: np.ndarray, solar_generation: np.ndarray, 
+        net_electricity_consumption_without_storage_and_pv: np.ndarray, electricity_pricing: np.ndarray, carbon_intensity: np.ndarray, **kwargs
+    ) -> np.ndarray:
+        # (variable, building) values of the building time series at one time step derived as in the Building properties where
+        # kwargs are the other variables that are not summed in district time series
+        energy_from_storage = energy_balance.clip(max=0)*-1
+        without_storage_and_pv = net_electricity_consumption_without_storage_and_pv
+        without_storage = without_storage_and_pv + solar_generation
+        values = {
+            'net_electricity_consumption_without_storage_and_pv_emission': (carbon_intensity*without_storage_and_pv).clip(min=0),
+            'net_electricity_consumption_without_storage_and_pv_cost': electricity_pricing*without_storage_and_pv,
+            'net_electricity_consumption_without_storage_and_pv': without_storage_and_pv,
+            'net_electricity_consumption_without_storage_emission': (carbon_intensity*without_storage).clip(min=0),
+            'net_electricity_consumption_without_storage_cost': electricity_pricing*without_storage,
+            'net_electricity_consumption_without_storage': without_storage,
+            'electrical_storage_electricity_consumption': electrical_storage_energy_balance,
+            'energy_to_electrical_storage': electrical_storage_energy_balance.clip(min=0),
+            'energy_from_electrical_storage': electrical_storage_energy_balance.clip(max=0)*-1,
+            'non_shiftable_load_demand': non_shiftable_load,
+            'solar_generation': solar_generation,
+        }
+
+        for i, k in enumerate(['cooling', 'heating', 'dhw']):
+            values[f'{k}_electricity_consumption'] = electricity_consumption[i]
+            values[f'{k}_storage_electricity_consumption'] = storage_electricity_consumption[i]
+            values[f'energy_from_{k}_device_to_{k}_storage'] = energy_balance[i].clip(min=0)
+            values[f'energy_from_{k}_device'] = demand[i] - energy_from_storage[i]
+            values[f'energy_from_{k}_storage'] = energy_from_storage[i]
+            values[f'{k}_demand'] = demand[i]
+
+        return np.array([values[k] for k in CityLearnEnv.__DISTRICT_VARIABLES], dtype=float)
+
+    def __get_district_variable(self, name: str) -> np.ndarray:
+        # read-only view of the district time series up to time_step
+        values = self.__district_variables[:self.time_step + 1, self.__DISTRICT_VARIABLES.index(name)]
+        values.flags.writeable = False
+        return values
+
+    def get_building_variable(self, name: str) -> np.ndarray:
+        r"""Return (building, time step) time series of a building variable that is summed in a district time series.
+
+        Parameters
+        ----------
+        name : str
+            Name of a district time series e.g. `cooling_demand` or `net_electricity_consumption_without_storage`.
+
+        Returns
+        -------
+        values : np.ndarray
+            Read-only view of the buildings' time series up to `time_step` in the same order as `buildings`.
+
+        Notes
+        -----
+        The building variables are stacked in a (time step, variable, building) array that is filled at each time step in
+        :py:meth:`update_variables` and the district time series are the sums of the buildings at each time step so that reading
+        a building or district time series does not compute the buildings' time series. The array is allocated for the episode at
+        :py:meth:`reset` in `dtype` and takes `time_steps` * 29 * number of buildings * `dtype` itemsize bytes e.g. about 73 MB for
+        36 buildings and 8,760 time steps in float64 that is allocated again by each environment of a :py:class:`citylearn.vector.VectorCityLearnEnv`.
+        A :py:meth:`clone` copies only the time steps up to `time_step` and grows the array as it is advanced.
+        """
+
+        assert name in self.__DISTRICT_VARIABLES, f'{name} is not a building variable that is summed in a district time series.'
+        values = self.__building_variables[:self.time_step + 1, self.__DISTRICT_VARIABLES.index(name)].T
+        values.flags.writeable = False
+        return values
+
+    def get_preallocated_histories(self) -> List[Tuple[np.ndarray, slice]]:
+        r"""Return stacked building variables and their district sums and the index of their time steps up to `time_step`."""
+
+        histories = super().get_preallocated_histories()
+
+        if self.__building_variables is not None:
+            histories += [(v, slice(0, self.time_step + 1)) for v in [self.__building_variables, self.__district_variables]]
+        else:
+            pass
+
+        return histories
+
+    def get_state(self) -> np.ndarray:
+        r"""Return snapshot of dynamic state at current `time_step` that can be restored with `set_state`.
+
+        The snapshot holds the `time_step` and, the length and latest values of the histories of the environment, buildings 
+        and their devices. It does not copy the histories so its size is independent of `time_step`.
+
+        Returns
+        -------
+        state : np.ndarray
+            Flat state array.
+
+        Notes
+        -----
+        A snapshot can only be restored while the environment is on the same trajectory it was taken from i.e., 
+        after stepping forward from it and before the next `reset`. The snapshot holds the ID of the branch its `time_step` was simulated
+        in where a new branch is started by :py:meth:`reset`, :py:meth:`set_state` and :py:meth:`clone` so that `set_state` can
+        check it.
+        """
+
+        state = Environment.get_state(self) + [self.__trajectory[self.time_step], len(self.__rewards), len(self.__net_electricity_consumption)]
+
+        for building in self.buildings:
+            state += building.get_state()
+
+        return np.array(state, dtype=float)
+
+    def set_state(self, state: Union[np.ndarray, Iterator[float]]):
+        r"""Restore dynamic state from a `get_state` snapshot by truncating histories to their snapshot lengths.
+
+        Parameters
+        ----------
+        state : Union[np.ndarray, Iterator[float]]
+            Snapshot returned by `get_state`.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot is not of the current trajectory e.g. it is ahead of `time_step`, of a sibling branch that was simulated
+            after restoring an earlier snapshot or, of a previous episode. The environment is not changed.
+        """
+
+        state = state.tolist() if isinstance(state, np.ndarray) else list(state)
+        time_step, branch, rewards_length, length = [int(v) for v in state[0:4]] if len(state) == self.get_state().size else [-1]*4
+
+        # the histories only grow along a trajectory so a snapshot of a time step on the current trajectory fits all histories
+        if not (
+            0 <= time_step <= self.time_step and self.__trajectory[time_step] == branch
+            and rewards_length <= len(self.__rewards) and length <= len(self.__net_electricity_consumption)
+        ):
+            raise ValueError('state is not a snapshot of the current trajectory of the environment.')
+        else:
+            pass
+
+        state = iter(state)
+        Environment.set_state(self, state)
+        next(state)
+        del self.__rewards[int(next(state)):]
+        self.__cost_function_accumulators = None
+        self.__variables = None
+        self.__reward_state = None
+        length = int(next(state))
+        del self.__net_electricity_consumption[length:]
+        del self.__net_electricity_consumption_cost[length:]
+        del self.__net_electricity_consumption_emission[length:]
+
+        for building in self.buildings:
+            building.set_state(state)
+
+        if self.__district is not None:
+            self.__district.set_state(iter([self.time_step]))
+        else:
+            pass
+
+        # later time steps are of a new branch
+        del self.__trajectory[self.time_step + 1:]
+        self.__branch = self.__get_branch()
+
+    def clone(self) -> 'CityLearnEnv':
+        r"""Return copy of `CityLearnEnv` at its current state that can be stepped independently.
+
+        The time series, observation and action spaces, schema, metadata and device parameters are shared by reference
+        while the buildings, devices, their histories, the reward function and the episode random state are copied. Buildings with time series 
+        that are yet to be loaded are loaded first.
+
+        Returns
+        -------
+        env : CityLearnEnv
+            Copy of environment.
+
+        Notes
+        -----
+        An environment whose `district` is a member of a district of several environments can not be cloned.
+        """
+
+        assert self.__district is None or self.__district.parent is None, 'environments with a member district can not be cloned.'
+
+        for building in self.buildings:
+            building.load_time_series()
+
+        env = self.__clone(self, {})
+        env.reward_function = copy.copy(self.reward_function)
+        env.reward_function.env = env
+        env.__episode_random_state = copy.deepcopy(self.__episode_random_state)
+        env.__cache = {}
+        env.__cost_function_accumulators = None
+        env.__variables = None
+        env.__reward_state = None
+        env.__branch = self.__get_branch()
+
+        return env
+
+    @staticmethod
+    def __clone(obj: Environment, memo: Mapping[int, Environment]) -> Environment:
+        """Return copy of `obj` where nested `Environment` objects, lists and writeable arrays are copied and other attributes are shared.
+        Only the values up to `time_step` of the preallocated histories are copied."""
+
+        if id(obj) in memo:
+            return memo[id(obj)]
+        else:
+            pass
+
+        clone = object.__new__(type(obj))
+        memo[id(obj)] = clone
+        attributes = obj.__dict__.copy()
+        histories = {id(h): i for h, i in obj.get_preallocated_histories()}
+
+        # values of existing keys are replaced so the attributes can be updated while iterated
+        for k, v in attributes.items():
+            if type(v) is list:
+                # histories hold numbers or lists that are not updated once appended
+                attributes[k] = [CityLearnEnv.__clone(e, memo) for e in v] if len(v) > 0 and isinstance(v[0], Environment) else v.copy()
+            elif type(v) is np.ndarray:
+                # preallocated histories are updated in place while read-only arrays are shared. The histories grow as the clone is advanced.
+                if v.flags.writeable:
+                    attributes[k] = v[histories[id(v)]].copy() if id(v) in histories else v.copy()
+                else:
+                    pass
+            elif isinstance(v, Environment):
+                attributes[k] = CityLearnEnv.__clone(v, memo)
+            else:
+                pass
+
+        clone.__dict__ = attributes
+
+        return clone
 
     def load_agent(self) -> 'citylearn.agents.base.Agent':
         """Return :class:`Agent` or sub class object as defined by the `schema`.
@@ -757,96 +1450,65 @@ class CityLearnEnv(Environment, Env):
         simulation_end_time_step = kwargs['simulation_end_time_step'] if kwargs.get('simulation_end_time_step') is not None else\
             self.schema['simulation_end_time_step']
         seconds_per_time_step = self.schema['seconds_per_time_step']
+        use_data_cache = True if kwargs.get('use_data_cache') is None else kwargs['use_data_cache']
+        data_cache = TimeSeriesCache(kwargs.get('data_cache_directory')) if use_data_cache else None
+        memory_map = False if kwargs.get('memory_map') is None else kwargs['memory_map']
+        assert not memory_map or use_data_cache, 'use_data_cache must be True when memory_map is True.'
+        data_cache_mmap_mode = 'r' if memory_map else None
 
         if kwargs.get('buildings') is not None and len(kwargs['buildings']) > 0:
             buildings = kwargs['buildings']
         
         else:
-            buildings = ()
+            load_workers = 1 if kwargs.get('load_workers') is None else kwargs['load_workers']
+            assert load_workers >= 1, 'load_workers must be >= 1.'
+            building_schemas = [(n, b) for n, b in self.schema['buildings'].items() if b['include']]
+            lazy_load = False if kwargs.get('lazy_load') is None else kwargs['lazy_load']
+            use_schema_cache = False if kwargs.get('use_schema_cache') is None else kwargs['use_schema_cache']
+
+            if use_schema_cache:
+                schema_cache_filepath = self.__get_schema_cache_filepath(
+                    building_schemas, TimeSeriesCache(kwargs.get('data_cache_directory')), root_directory, simulation_start_time_step, 
+                    simulation_end_time_step, kwargs.get('dtype')
+                )
+                compiled_schema = read_json(schema_cache_filepath) if os.path.isfile(schema_cache_filepath) else None
+            else:
+                schema_cache_filepath = None
+                compiled_schema = None
+
+            # compiled buildings are applied if they exist otherwise, recorded if the schema cache is used
+            if compiled_schema is not None:
+                building_schemas = [(n, b, c, None) for (n, b), c in zip(building_schemas, compiled_schema['buildings'])]
+            elif use_schema_cache and not lazy_load:
+                building_schemas = [(n, b, None, {}) for n, b in building_schemas]
+            else:
+                building_schemas = [(n, b, None, None) for n, b in building_schemas]
+
+            building_kwargs = {
+                'time_series': {},
+                'data_cache': data_cache,
+                'mmap_mode': data_cache_mmap_mode,
+                'root_directory': root_directory,
+                'simulation_start_time_step': simulation_start_time_step,
+                'simulation_end_time_step': simulation_end_time_step,
+                'seconds_per_time_step': seconds_per_time_step,
+                'observations': observations,
+                'actions': actions,
+                'lazy_load': lazy_load,
+                'dtype': kwargs.get('dtype'),
+            }
             
-            for building_name, building_schema in self.schema['buildings'].items():
-                if building_schema['include']:
-                    # data
-                    energy_simulation = pd.read_csv(os.path.join(root_directory,building_schema['energy_simulation'])).iloc[simulation_start_time_step:simulation_end_time_step + 1].copy()
-                    energy_simulation = EnergySimulation(*energy_simulation.values.T)
-                    weather = pd.read_csv(os.path.join(root_directory,building_schema['weather'])).iloc[simulation_start_time_step:simulation_end_time_step + 1].copy()
-                    weather = Weather(*weather.values.T)
-
-                    if building_schema.get('carbon_intensity', None) is not None:
-                        carbon_intensity = pd.read_csv(os.path.join(root_directory,building_schema['carbon_intensity'])).iloc[simulation_start_time_step:simulation_end_time_step + 1].copy()
-                        carbon_intensity = carbon_intensity['kg_CO2/kWh'].tolist()
-                        carbon_intensity = CarbonIntensity(carbon_intensity)
-                    else:
-                        carbon_intensity = None
-
-                    if building_schema.get('pricing', None) is not None:
-                        pricing = pd.read_csv(os.path.join(root_directory,building_schema['pricing'])).iloc[simulation_start_time_step:simulation_end_time_step + 1].copy()
-                        pricing = Pricing(*pricing.values.T)
-                    else:
-                        pricing = None
-                        
-                    # observation and action metadata
-                    inactive_observations = [] if building_schema.get('inactive_observations', None) is None else building_schema['inactive_observations']
-                    inactive_actions = [] if building_schema.get('inactive_actions', None) is None else building_schema['inactive_actions']
-                    observation_metadata = {s: False if s in inactive_observations else True for s in observations}
-                    action_metadata = {a: False if a in inactive_actions else True for a in actions}
-
-                    # construct building
-                    building_type = 'citylearn.citylearn.Building' if building_schema.get('type', None) is None else building_schema['type']
-                    building_type_module = '.'.join(building_type.split('.')[0:-1])
-                    building_type_name = building_type.split('.')[-1]
-                    building_constructor = getattr(importlib.import_module(building_type_module),building_type_name)
-
-                    building: Building = building_constructor(
-                        energy_simulation=energy_simulation, 
-                        weather=weather, 
-                        observation_metadata=observation_metadata, 
-                        action_metadata=action_metadata, 
-                        carbon_intensity=carbon_intensity, 
-                        pricing=pricing,
-                        name=building_name, 
-                        seconds_per_time_step=seconds_per_time_step,
-                    )
-
-                    # update devices
-                    device_metadata = {
-                        'dhw_storage': {'autosizer': building.autosize_dhw_storage},  
-                        'cooling_storage': {'autosizer': building.autosize_cooling_storage}, 
-                        'heating_storage': {'autosizer': building.autosize_heating_storage}, 
-                        'electrical_storage': {'autosizer': building.autosize_electrical_storage}, 
-                        'cooling_device': {'autosizer': building.autosize_cooling_device}, 
-                        'heating_device': {'autosizer': building.autosize_heating_device}, 
-                        'dhw_device': {'autosizer': building.autosize_dhw_device}, 
-                        'pv': {'autosizer': building.autosize_pv}
-                    }
-
-                    for name in device_metadata:
-                        if building_schema.get(name, None) is None:
-                            device = None
-                        else:
-                            device_type = building_schema[name]['type']
-                            device_module = '.'.join(device_type.split('.')[0:-1])
-                            device_name = device_type.split('.')[-1]
-                            constructor = getattr(importlib.import_module(device_module),device_name)
-                            attributes = building_schema[name].get('attributes',{})
-                            attributes['seconds_per_time_step'] = seconds_per_time_step
-                            device = constructor(**attributes)
-                            autosize = False if building_schema[name].get('autosize', None) is None else building_schema[name]['autosize']
-                            building.__setattr__(name, device)
-
-                            if autosize:
-                                autosizer = device_metadata[name]['autosizer']
-                                autosize_kwargs = {} if building_schema[name].get('autosize_attributes', None) is None else building_schema[name]['autosize_attributes']
-                                autosizer(**autosize_kwargs)
-                            else:
-                                pass
-                    
-                    building.observation_space = building.estimate_observation_space()
-                    building.action_space = building.estimate_action_space()
-                    buildings += (building,)
-                    
-                else:
-                    continue
+            if load_workers > 1:
+                # map preserves schema order irrespective of completion order
+                with ThreadPoolExecutor(max_workers=load_workers) as executor:
+                    buildings = tuple(executor.map(lambda x: self.__load_building(*x, **building_kwargs), building_schemas))
+            else:
+                buildings = tuple(self.__load_building(*b, **building_kwargs) for b in building_schemas)
+
+            if compiled_schema is None and use_schema_cache and not lazy_load:
+                self.__write_compiled_schema(schema_cache_filepath, [b[3] for b in building_schemas])
+            else:
+                pass
         
         buildings = list(buildings)
 
@@ -856,12 +1518,325 @@ class CityLearnEnv(Environment, Env):
             reward_function_type = self.schema['reward_function']['type']
             reward_function_attributes = self.schema['reward_function'].get('attributes',None)
             reward_function_attributes = {} if reward_function_attributes is None else reward_function_attributes
-            reward_function_module = '.'.join(reward_function_type.split('.')[0:-1])
-            reward_function_name = reward_function_type.split('.')[-1]
-            reward_function_constructor = getattr(importlib.import_module(reward_function_module), reward_function_name)
+            reward_function_constructor = self.__get_constructor(reward_function_type)
             reward_function = reward_function_constructor(self,**reward_function_attributes)
 
         return root_directory, buildings, simulation_start_time_step, simulation_end_time_step, seconds_per_time_step, reward_function, central_agent, shared_observations
+
+    def __load_building(
+        self, building_name: str, building_schema: Mapping[str, Any], compiled_building: Mapping[str, Any], compile_building: Mapping[str, Any], time_series: Mapping[Tuple[type, str, int, int, str], Future], data_cache: TimeSeriesCache, 
+        mmap_mode: str, root_directory: Union[str, Path], simulation_start_time_step: int, simulation_end_time_step: int, seconds_per_time_step: float,
+        observations: Mapping[str, Any], actions: Mapping[str, Any], lazy_load: bool, dtype: Union[str, type]
+    ) -> Building:
+        """Return `Building` object with its data, devices and spaces as defined by its `building_schema`.
+
+        Buildings are independent of each other apart from the shared `time_series` registry, where each file is parsed once by the
+        first thread to request it, thus may be constructed concurrently.
+        The data, autosizing and spaces are set by the building's time series loader that is called immediately unless `lazy_load` is True.
+        If `compiled_building` is provided, its metadata, autosized values and spaces are used instead of resolving them otherwise,
+        they are written to `compile_building` if provided.
+        """
+
+        # observation and action metadata
+        if compiled_building is None:
+            inactive_observations = [] if building_schema.get('inactive_observations', None) is None else building_schema['inactive_observations']
+            inactive_actions = [] if building_schema.get('inactive_actions', None) is None else building_schema['inactive_actions']
+            observation_metadata = {s: False if s in inactive_observations else True for s in observations}
+            action_metadata = {a: False if a in inactive_actions else True for a in actions}
+        else:
+            observation_metadata = compiled_building['observation_metadata']
+            action_metadata = compiled_building['action_metadata']
+
+        if compile_building is not None:
+            compile_building['name'] = building_name
+            compile_building['observation_metadata'] = observation_metadata
+            compile_building['action_metadata'] = action_metadata
+            compile_building['autosized'] = {}
+        else:
+            pass
+
+        # construct building
+        building_type = 'citylearn.citylearn.Building' if building_schema.get('type', None) is None else building_schema['type']
+        building_constructor = self.__get_constructor(building_type)
+
+        autosizers = []
+        time_series_loader = partial(
+            self.__load_building_time_series,
+            building_schema=building_schema,
+            autosizers=autosizers,
+            compiled_building=compiled_building,
+            compile_building=compile_building,
+            time_series=time_series,
+            data_cache=data_cache,
+            mmap_mode=mmap_mode,
+            root_directory=root_directory,
+            simulation_start_time_step=simulation_start_time_step,
+            simulation_end_time_step=simulation_end_time_step,
+            dtype=dtype,
+        )
+        building: Building = building_constructor(
+            energy_simulation=None, 
+            weather=None, 
+            observation_metadata=observation_metadata, 
+            action_metadata=action_metadata, 
+            name=building_name, 
+            seconds_per_time_step=seconds_per_time_step,
+            dtype=dtype,
+            time_series_loader=time_series_loader,
+        )
+
+        # update devices
+        device_metadata = {
+            'dhw_storage': {'autosizer': building.autosize_dhw_storage},  
+            'cooling_storage': {'autosizer': building.autosize_cooling_storage}, 
+            'heating_storage': {'autosizer': building.autosize_heating_storage}, 
+            'electrical_storage': {'autosizer': building.autosize_electrical_storage}, 
+            'cooling_device': {'autosizer': building.autosize_cooling_device}, 
+            'heating_device': {'autosizer': building.autosize_heating_device}, 
+            'dhw_device': {'autosizer': building.autosize_dhw_device}, 
+            'pv': {'autosizer': building.autosize_pv}
+        }
+
+        for name in device_metadata:
+            if building_schema.get(name, None) is None:
+                device = None
+            else:
+                device_type = building_schema[name]['type']
+                constructor = self.__get_constructor(device_type)
+                # copied so that the caller's schema, which keys the schema cache, is left unchanged
+                attributes = {
+                    **building_schema[name].get('attributes',{}),
+                    'seconds_per_time_step': seconds_per_time_step,
+                    'dtype': dtype,
+                }
+                device = constructor(**attributes)
+                autosize = False if building_schema[name].get('autosize', None) is None else building_schema[name]['autosize']
+                building.__setattr__(name, device)
+
+                if autosize and compiled_building is None:
+                    autosizer = device_metadata[name]['autosizer']
+                    autosize_kwargs = {} if building_schema[name].get('autosize_attributes', None) is None else building_schema[name]['autosize_attributes']
+                    autosizers.append((name, autosizer, autosize_kwargs))
+                elif autosize:
+                    autosizers.append((name, partial(self.__set_attributes, device), compiled_building['autosized'][name]))
+                else:
+                    pass
+        
+        if not lazy_load:
+            building.load_time_series()
+        else:
+            pass
+
+        return building
+
+    def __load_building_time_series(
+        self, building: Building, building_schema: Mapping[str, Any], autosizers: List[Tuple[str, Any, Mapping[str, Any]]], 
+        compiled_building: Mapping[str, Any], compile_building: Mapping[str, Any], time_series: Mapping[Tuple[type, str, int, int, str], Future], 
+        data_cache: TimeSeriesCache, mmap_mode: str, root_directory: Union[str, Path], simulation_start_time_step: int, simulation_end_time_step: int, 
+        dtype: Union[str, type]
+    ):
+        """Set `building` time series as defined by its `building_schema` then autosize its devices and estimate its spaces.
+
+        The autosized values and spaces in `compiled_building` are used if provided and, are written to `compile_building` if provided.
+        """
+
+        # data
+        energy_simulation = self.__load_time_series(
+            time_series, data_cache, mmap_mode, EnergySimulation, root_directory, building_schema['energy_simulation'], simulation_start_time_step, simulation_end_time_step,
+            dtype=dtype
+        )
+        weather = self.__load_time_series(
+            time_series, data_cache, mmap_mode, Weather, root_directory, building_schema['weather'], simulation_start_time_step, simulation_end_time_step,
+            dtype=dtype
+        )
+
+        if building_schema.get('carbon_intensity', None) is not None:
+            carbon_intensity = self.__load_time_series(
+                time_series, data_cache, mmap_mode, CarbonIntensity, root_directory, building_schema['carbon_intensity'], simulation_start_time_step, simulation_end_time_step,
+                columns=['kg_CO2/kWh'], dtype=dtype
+            )
+        else:
+            carbon_intensity = None
+
+        if building_schema.get('pricing', None) is not None:
+            pricing = self.__load_time_series(
+                time_series, data_cache, mmap_mode, Pricing, root_directory, building_schema['pricing'], simulation_start_time_step, simulation_end_time_step,
+                dtype=dtype
+            )
+        else:
+            pricing = None
+            
+        building.energy_simulation = energy_simulation
+        building.weather = weather
+        building.carbon_intensity = carbon_intensity
+        building.pricing = pricing
+
+        for name, autosizer, autosize_kwargs in autosizers:
+            autosizer(**autosize_kwargs)
+
+            if compile_building is not None:
+                device = building.__getattribute__(name)
+                compile_building['autosized'][name] = {a: float(device.__getattribute__(a)) for a in self.__AUTOSIZE_ATTRIBUTES if hasattr(device, a)}
+            else:
+                pass
+
+        if compiled_building is None:
+            building.observation_space = building.estimate_observation_space()
+            building.action_space = building.estimate_action_space()
+        else:
+            building.observation_space = spaces.Box(
+                low=np.array(compiled_building['observation_space']['low'], dtype='float32'), 
+                high=np.array(compiled_building['observation_space']['high'], dtype='float32')
+            )
+            building.action_space = spaces.Box(
+                low=np.array(compiled_building['action_space']['low'], dtype='float32'), 
+                high=np.array(compiled_building['action_space']['high'], dtype='float32')
+            )
+
+        if compile_building is not None:
+            compile_building['observation_space'] = {'low': building.observation_space.low.tolist(), 'high': building.observation_space.high.tolist()}
+            compile_building['action_space'] = {'low': building.action_space.low.tolist(), 'high': building.action_space.high.tolist()}
+        else:
+            pass
+
+    def __get_schema_cache_filepath(
+        self, building_schemas: List[Tuple[str, Mapping[str, Any]]], data_cache: TimeSeriesCache, root_directory: Union[str, Path], 
+        simulation_start_time_step: int, simulation_end_time_step: int, dtype: Union[str, type]
+    ) -> str:
+        """Return compiled schema filepath in `data_cache` directory that is keyed by a hash of the schema, its data files' content,
+        simulation window, `dtype` and CityLearn version."""
+
+        data_hashes = {}
+
+        for _, building_schema in building_schemas:
+            for k in ['energy_simulation', 'weather', 'carbon_intensity', 'pricing']:
+                if building_schema.get(k, None) is not None:
+                    filepath = os.path.realpath(os.path.join(root_directory, building_schema[k]))
+                    data_hashes[filepath] = data_hashes[filepath] if filepath in data_hashes else data_cache.get_source_hash(filepath)
+                else:
+                    pass
+
+        key = json.dumps({
+            'schema': self.schema,
+            'buildings': [n for n, _ in building_schemas],
+            'data': data_hashes,
+            'simulation_start_time_step': simulation_start_time_step,
+            'simulation_end_time_step': simulation_end_time_step,
+            'dtype': str(np.dtype(float if dtype is None else dtype)),
+            'version': citylearn.__version__,
+        }, sort_keys=True, default=str)
+        key = hashlib.sha256(key.encode()).hexdigest()
+
+        return os.path.join(data_cache.directory, f'schema_{key}.json')
+
+    def __write_compiled_schema(self, filepath: str, compiled_buildings: List[Mapping[str, Any]]):
+        """Write compiled buildings to `filepath`. The compiled schema is an optimization so an unwritable directory is ignored."""
+
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            descriptor, temp_filepath = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(filepath))
+            os.close(descriptor)
+
+            try:
+                write_json(temp_filepath, {'buildings': compiled_buildings}, ignore_nan=False)
+                os.replace(temp_filepath, filepath)
+            finally:
+                if os.path.isfile(temp_filepath):
+                    os.remove(temp_filepath)
+                else:
+                    pass
+
+        except OSError:
+            pass
+
+    @staticmethod
+    def __set_attributes(obj: Any, **kwargs):
+        """Set `obj` attributes from keyword arguments in order."""
+
+        for k, v in kwargs.items():
+            obj.__setattr__(k, v)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __get_constructor(constructor_type: str) -> type:
+        """Return class from its full module path e.g. `citylearn.energy_model.Battery`."""
+
+        module = '.'.join(constructor_type.split('.')[0:-1])
+        name = constructor_type.split('.')[-1]
+
+        return getattr(importlib.import_module(module), name)
+
+    def __load_time_series(
+        self, registry: Mapping[Tuple[type, str, int, int, str], Future], cache: TimeSeriesCache, mmap_mode: str, constructor: type, root_directory: Union[str, Path], filename: str, 
+        simulation_start_time_step: int, simulation_end_time_step: int, columns: List[str] = None, dtype: Union[str, type] = None
+    ) -> Union[EnergySimulation, Weather, Pricing, CarbonIntensity]:
+        """Return time series data object for `filename` that is shared by all buildings that reference the same file and simulation window.
+
+        Parameters
+        ----------
+        registry : Mapping[Tuple[type, str, int, int, str], Future]
+            Load-time registry of data object futures keyed by `constructor`, resolved filepath, simulation window and `dtype`.
+            The first caller for a key parses the file and sets the future result that concurrent callers wait on.
+        cache : TimeSeriesCache
+            Binary data file cache to read from. The `.csv` file is parsed directly if None.
+        mmap_mode : str
+            `cache` memory-map mode. The cached values are read into memory if None.
+        constructor : type
+            Data class to initialize with the file columns i.e. one of `EnergySimulation`, `Weather`, `Pricing` or `CarbonIntensity`.
+        root_directory : Union[str, Path]
+            Directory that contains `filename`.
+        filename : str
+            Data file name or path relative to `root_directory`.
+        simulation_start_time_step : int
+            First row to read.
+        simulation_end_time_step : int
+            Last row to read.
+        columns : List[str], optional
+            Subset of file columns to parse into `constructor`. All columns are used if not provided.
+        dtype : Union[str, type], optional
+            Floating point data type of the time series.
+
+        Returns
+        -------
+        data : Union[EnergySimulation, Weather, Pricing, CarbonIntensity]
+            Read-only data object.
+        """
+
+        filepath = os.path.realpath(os.path.join(root_directory, filename))
+        key = (constructor, filepath, simulation_start_time_step, simulation_end_time_step, dtype)
+
+        # setdefault is atomic so exactly one thread parses each file while the others wait for its result
+        future = Future()
+        registered_future = registry.setdefault(key, future)
+
+        if registered_future is future:
+            try:
+                if cache is None:
+                    data = pd.read_csv(filepath)
+                    file_columns, values = data.columns.tolist(), data.to_numpy(dtype=float).T
+                else:
+                    file_columns, values = cache.read(filepath, mmap_mode=mmap_mode)
+
+                # index rows one at a time so that memory-mapped values stay views
+                values = list(values) if columns is None else [values[file_columns.index(c)] for c in columns]
+                data = constructor(*[v[simulation_start_time_step:simulation_end_time_step + 1] for v in values], dtype=dtype)
+
+                # shared across buildings so must not be mutated in place
+                for v in vars(data).values():
+                    v.flags.writeable = False
+
+                future.set_result(data)
+            
+            # waiting threads are given the error and the key is released so that a later call retries
+            except BaseException as e:
+                future.set_exception(e)
+                registry.pop(key, None)
+                raise
+
+        else:
+            pass
+
+        return registered_future.result()
         
 class Error(Exception):
     """Base class for other exceptions."""
@@ -1,22 +1,29 @@
-from typing import List
+from typing import Iterable, List, Union
 import numpy as np
-import pandas as pd
 
 class CostFunction:
-    r"""Cost and energy flexibility functions that may be used to evaluate environment performance."""
+    r"""Cost and energy flexibility functions that may be used to evaluate environment performance.
+
+    The cost functions take a time series as a list or 1-D array or, many time series e.g. of many buildings or episodes as a 2-D array
+    with the time steps along the last axis. They return the rolling cost as a list for 1-D time series and as a 2-D array for 2-D time series
+    or, only the final cost as a float or 1-D array when `final_only` is True. NaN values are skipped as in the `pandas` rolling and groupby
+    aggregations the cost functions are defined with and, the costs equal those aggregations up to floating point rounding.
+    """
 
     @staticmethod
-    def ramping(net_electricity_consumption: List[float]) -> List[float]:
+    def ramping(net_electricity_consumption: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of absolute difference in net electric consumption between consecutive time steps.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
 
         Returns
         -------
-        ramping : List[float]
+        ramping : Union[List[float], np.ndarray, float]
             Ramping cost.
 
         Notes
@@ -33,99 +40,100 @@ class CostFunction:
         [nan, 100.0, 100.0, 500.0, 700.0]
         """
 
-        data = pd.DataFrame({'net_electricity_consumption':net_electricity_consumption})
-        data['ramping'] = data['net_electricity_consumption'] - data['net_electricity_consumption'].shift(1)
-        data['ramping'] = data['ramping'].abs()
-        data['ramping'] = data['ramping'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['ramping'].tolist()
+        values = CostFunction.__get_values(net_electricity_consumption)
+        ramping = np.full(values.shape, np.nan)
+        ramping[..., 1:] = np.abs(np.diff(values, axis=-1))
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(ramping, final_only), net_electricity_consumption)
 
     @staticmethod
-    def load_factor(net_electricity_consumption: List[float], window: int = None) -> List[float]:
+    def load_factor(net_electricity_consumption: Union[List[float], np.ndarray], window: int = None, final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Difference between 1 and the ratio of rolling mean demand to rolling peak demand over a specified period.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
         window : int, default: 730
             Period window/time steps.
+        final_only : bool, default: False
+            Whether to return only the final cost.
 
         Returns
         -------
-        load_factor : List[float]
-            Load factor cost.
+        load_factor : Union[List[float], np.ndarray, float]
+            Load factor cost with one value per period.
         """
 
         window = 730 if window is None else window
-        data = pd.DataFrame({'net_electricity_consumption':net_electricity_consumption})
-        data['group'] = (data.index/window).astype(int)
-        data = data.groupby(['group'])[['net_electricity_consumption']].agg(['mean','max'])
-        data['load_factor'] = 1 - (data[('net_electricity_consumption','mean')]/data[('net_electricity_consumption','max')])
-        data['load_factor'] = data['load_factor'].rolling(window=data.shape[0],min_periods=1).mean()
-        return data['load_factor'].tolist()
+        values = CostFunction.__get_groups(CostFunction.__get_values(net_electricity_consumption), window)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            load_factor = 1 - CostFunction.__nanmean(values)/np.fmax.reduce(values, axis=-1)
+
+        return CostFunction.__get_cost(CostFunction.__rolling_mean(load_factor, final_only), net_electricity_consumption)
 
     @staticmethod
-    def average_daily_peak(net_electricity_consumption: List[float], daily_time_step: int = None) -> List[float]:
+    def average_daily_peak(net_electricity_consumption: Union[List[float], np.ndarray], daily_time_step: int = None, final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Mean of daily net electricity consumption peaks.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
         daily_time_step : int, default: 24
             Number of time steps in a day.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        average_daily_peak : List[float]
-            Average daily peak cost.
+        average_daily_peak : Union[List[float], np.ndarray, float]
+            Average daily peak cost with one value per day.
         """
 
         daily_time_step = 24 if daily_time_step is None else daily_time_step
-        data = pd.DataFrame({'net_electricity_consumption':net_electricity_consumption})
-        data['group'] = (data.index/daily_time_step).astype(int)
-        data = data.groupby(['group'])[['net_electricity_consumption']].max()
-        data['net_electricity_consumption'] = data['net_electricity_consumption'].rolling(window=data.shape[0],min_periods=1).mean()
-        return data['net_electricity_consumption'].tolist()
+        values = CostFunction.__get_groups(CostFunction.__get_values(net_electricity_consumption), daily_time_step)
+        return CostFunction.__get_cost(CostFunction.__rolling_mean(np.fmax.reduce(values, axis=-1), final_only), net_electricity_consumption)
 
     @staticmethod
-    def peak_demand(net_electricity_consumption: List[float], window: int = None) -> List[float]:
+    def peak_demand(net_electricity_consumption: Union[List[float], np.ndarray], window: int = None, final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Net electricity consumption peak.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
         window : int, default: 8760
             Period window/time steps to find peaks.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        peak_demand : List[float]
-            Peak demand cost.        
+        peak_demand : Union[List[float], np.ndarray, float]
+            Peak demand cost with one value per period.
         """
 
         window = 8760 if window is None else window
-        data = pd.DataFrame({'net_electricity_consumption':net_electricity_consumption})
-        data['group'] = (data.index/window).astype(int)
-        data = data.groupby(['group'])[['net_electricity_consumption']].max()
-        data['net_electricity_consumption'] = data['net_electricity_consumption'].rolling(window=data.shape[0],min_periods=1).mean()
-        return data['net_electricity_consumption'].tolist()
+        values = CostFunction.__get_groups(CostFunction.__get_values(net_electricity_consumption), window)
+        return CostFunction.__get_cost(CostFunction.__rolling_mean(np.fmax.reduce(values, axis=-1), final_only), net_electricity_consumption)
 
     @staticmethod
-    def electricity_consumption(net_electricity_consumption: List[float]) -> List[float]:
+    def electricity_consumption(net_electricity_consumption: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of positive electricity consumption.
 
         It is the sum of electricity that is consumed from the grid.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        electricity_consumption : List[float]
+        electricity_consumption : Union[List[float], np.ndarray, float]
             Electricity consumption cost.        
 
         Examples
@@ -135,12 +143,11 @@ class CostFunction:
         [100.0, 100.0, 300.0, 900.0, 1300.0, 1600.0]
         """
 
-        data = pd.DataFrame({'net_electricity_consumption':np.array(net_electricity_consumption).clip(min=0)})
-        data['electricity_consumption'] = data['net_electricity_consumption'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['electricity_consumption'].tolist()
+        values = CostFunction.__get_values(net_electricity_consumption).clip(min=0)
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(values, final_only), net_electricity_consumption)
 
     @staticmethod
-    def zero_net_energy(net_electricity_consumption: List[float]) -> List[float]:
+    def zero_net_energy(net_electricity_consumption: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of net electricity consumption.
 
         It is the net sum of electricty that is consumed from the grid and self-generated from renenewable sources.
@@ -148,12 +155,14 @@ class CostFunction:
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        zero_net_energy : List[float]
+        zero_net_energy : Union[List[float], np.ndarray, float]
             Zero net energy cost.        
 
         Examples
@@ -163,22 +172,23 @@ class CostFunction:
         [100.0, -100.0, 100.0, 700.0, 1100.0, 1400.0]
         """
 
-        data = pd.DataFrame({'net_electricity_consumption':np.array(net_electricity_consumption)})
-        data['zero_net_energy'] = data['net_electricity_consumption'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['zero_net_energy'].tolist()
+        values = CostFunction.__get_values(net_electricity_consumption)
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(values, final_only), net_electricity_consumption)
 
     @staticmethod
-    def carbon_emissions(carbon_emissions: List[float]) -> List[float]:
+    def carbon_emissions(carbon_emissions: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of carbon emissions.
 
         Parameters
         ----------
-        carbon_emissions : List[float]
+        carbon_emissions : Union[List[float], np.ndarray]
             Carbon emissions time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        carbon_emissions : List[float]
+        carbon_emissions : Union[List[float], np.ndarray, float]
             Carbon emissions cost.        
 
         Examples
@@ -188,22 +198,23 @@ class CostFunction:
         [100.0, 300.0, 500.0, 1100.0, 1500.0, 1800.0]
         """
 
-        data = pd.DataFrame({'carbon_emissions':np.array(carbon_emissions).clip(min=0)})
-        data['carbon_emissions'] = data['carbon_emissions'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['carbon_emissions'].tolist()
+        values = CostFunction.__get_values(carbon_emissions).clip(min=0)
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(values, final_only), carbon_emissions)
 
     @staticmethod
-    def cost(price: List[float]) -> List[float]:
+    def cost(price: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of electricity monetary cost.
 
         Parameters
         ----------
-        price : List[float]
+        price : Union[List[float], np.ndarray]
             Price time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        price : List[float]
+        price : Union[List[float], np.ndarray, float]
             Price cost.        
 
         Examples
@@ -213,22 +224,23 @@ class CostFunction:
         [100.0, 300.0, 500.0, 1100.0, 1500.0, 1800.0]
         """
 
-        data = pd.DataFrame({'cost':np.array(price).clip(min=0)})
-        data['cost'] = data['cost'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['cost'].tolist()
+        values = CostFunction.__get_values(price).clip(min=0)
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(values, final_only), price)
 
     @staticmethod
-    def quadratic(net_electricity_consumption: List[float]) -> List[float]:
+    def quadratic(net_electricity_consumption: Union[List[float], np.ndarray], final_only: bool = None) -> Union[List[float], np.ndarray, float]:
         r"""Rolling sum of net electricity consumption raised to the power of 2.
 
         Parameters
         ----------
-        net_electricity_consumption : List[float]
+        net_electricity_consumption : Union[List[float], np.ndarray]
             Electricity consumption time series.
+        final_only : bool, default: False
+            Whether to return only the final cost.
             
         Returns
         -------
-        quadratic : List[float]
+        quadratic : Union[List[float], np.ndarray, float]
             Quadratic cost.
 
         Notes
@@ -242,7 +254,230 @@ class CostFunction:
         [10000.0, 50000.0, 90000.0, 450000.0, 610000.0, 700000.0]
         """
 
-        data = pd.DataFrame({'net_electricity_consumption':np.array(net_electricity_consumption).clip(min=0)})
-        data['quadratic'] = data['net_electricity_consumption']**2
-        data['quadratic'] = data['quadratic'].rolling(window=data.shape[0],min_periods=1).sum()
-        return data['quadratic'].tolist()
\ No newline at end of file
+        values = CostFunction.__get_values(net_electricity_consumption).clip(min=0)
+        return CostFunction.__get_cost(CostFunction.__rolling_sum(values**2, final_only), net_electricity_consumption)
+
+    @staticmethod
+    def __get_values(time_series: Union[List[float], np.ndarray]) -> np.ndarray:
+        # float64 1-D or 2-D time series with time steps along the last axis
+        values = np.asarray(time_series, dtype=float)
+        assert values.ndim in [1, 2], 'time series must be 1-D or 2-D.'
+        return values
+
+    @staticmethod
+    def __get_cost(cost: np.ndarray, time_series: Union[List[float], np.ndarray]) -> Union[List[float], np.ndarray, float]:
+        # list for rolling costs of 1-D time series and float for the final cost of a 1-D time series
+        return cost.tolist() if np.ndim(time_series) == 1 else cost
+
+    @staticmethod
+    def __get_groups(values: np.ndarray, window: int) -> np.ndarray:
+        # (..., group, window) consecutive periods of window time steps where the last period is padded with nan
+        groups = -(-values.shape[-1]//window)
+        padded = np.full(values.shape[:-1] + (groups*window,), np.nan)
+        padded[..., :values.shape[-1]] = values
+        return padded.reshape(values.shape[:-1] + (groups, window))
+
+    @staticmethod
+    def __nanmean(values: np.ndarray) -> np.ndarray:
+        # mean along the last axis that skips nan values and is nan where all values are nan
+        count = (~np.isnan(values)).sum(axis=-1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(count > 0, np.nansum(values, axis=-1)/count, np.nan)
+
+    @staticmethod
+    def __rolling_sum(values: np.ndarray, final_only: bool) -> np.ndarray:
+        # rolling sum with a window as long as the time series that skips nan and infinite values and is nan before the first valid value
+        values = np.where(np.isinf(values), np.nan, values)
+        valid = ~np.isnan(values)
+
+        if final_only:
+            cost = np.where(valid.any(axis=-1), np.nansum(values, axis=-1), np.nan)
+        else:
+            cost = np.where(np.cumsum(valid, axis=-1) > 0, np.nancumsum(values, axis=-1), np.nan)
+
+        return cost
+
+    @staticmethod
+    def __rolling_mean(values: np.ndarray, final_only: bool) -> np.ndarray:
+        # rolling mean with a window as long as the time series that skips nan and infinite values and is nan before the first valid value
+        values = np.where(np.isinf(values), np.nan, values)
+
+        if final_only:
+            cost = CostFunction.__nanmean(values)
+        else:
+            count = np.cumsum(~np.isnan(values), axis=-1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cost = np.where(count > 0, np.nancumsum(values, axis=-1)/count, np.nan)
+
+        return cost
+
+class CostFunctionAccumulator:
+    # cost functions that are updated in the order of the list
+    __COST_FUNCTIONS = [
+        'ramping', 'load_factor', 'average_daily_peak', 'peak_demand', 'electricity_consumption', 'zero_net_energy', 'carbon_emissions', 'cost', 'quadratic'
+    ]
+
+    def __init__(self, cost_functions: List[str] = None, load_factor_window: int = None, daily_time_step: int = None, peak_demand_window: int = None):
+        r"""Initialize `CostFunctionAccumulator`.
+
+        Streaming counterpart of the :py:class:`CostFunction` final values. The running sums, group maxima and means and, the
+        running mean of the group values are updated as a time series is extended so that the last value of a cost function is
+        returned in constant time irrespective of the time series length. NaN values are skipped and infinite values are skipped
+        in the running sums and means as in :py:class:`CostFunction`. The values equal those of :py:class:`CostFunction` with
+        `final_only` = True up to floating point rounding as the sums are accumulated in a different order.
+
+        Parameters
+        ----------
+        cost_functions : List[str], optional
+            Names of :py:class:`CostFunction` methods to accumulate. Defaults to all cost functions.
+        load_factor_window : int, default: 730
+            `load_factor` period window/time steps.
+        daily_time_step : int, default: 24
+            `average_daily_peak` number of time steps in a day.
+        peak_demand_window : int, default: 8760
+            `peak_demand` period window/time steps to find peaks.
+        """
+
+        cost_functions = self.__COST_FUNCTIONS if cost_functions is None else cost_functions
+        assert all(c in self.__COST_FUNCTIONS for c in cost_functions), f'cost_functions must be in {self.__COST_FUNCTIONS}.'
+        self.__cost_functions = [c for c in self.__COST_FUNCTIONS if c in cost_functions]
+        self.__windows = {
+            'load_factor': 730 if load_factor_window is None else load_factor_window,
+            'average_daily_peak': 24 if daily_time_step is None else daily_time_step,
+            'peak_demand': 8760 if peak_demand_window is None else peak_demand_window,
+        }
+        self.reset()
+
+    @property
+    def cost_functions(self) -> List[str]:
+        """Names of accumulated cost functions."""
+
+        return self.__cost_functions
+
+    @property
+    def length(self) -> int:
+        """Number of time series values accumulated."""
+
+        return self.__length
+
+    def update(self, values: Iterable[float]):
+        r"""Extend the accumulated time series.
+
+        Parameters
+        ----------
+        values : Iterable[float]
+            Time series values that follow the accumulated values.
+        """
+
+        values = np.asarray(values, dtype=float).ravel()
+
+        for c in self.__cost_functions:
+            state = self.__states[c]
+
+            if c == 'ramping':
+                self.__add(state, np.abs(np.diff(values, prepend=self.__previous_value)))
+
+            elif c in self.__windows:
+                # the values are split at group boundaries and, a group value is added to the running mean once the group is complete
+                window = self.__windows[c]
+                start = 0
+
+                while start < values.size:
+                    position = self.__length + start
+                    end = start + window - position%window
+                    group = state['group']
+
+                    if position//window != group['index']:
+                        self.__add(state['mean'], self.__get_group_value(c, group))
+                        state['group'] = group = self.__get_group(position//window)
+                    else:
+                        pass
+
+                    self.__add(group['mean'], values[start:end], group=True)
+                    group['max'] = np.fmax(group['max'], np.fmax.reduce(values[start:end]))
+                    start = end
+
+            elif c == 'zero_net_energy':
+                self.__add(state, values)
+
+            elif c == 'quadratic':
+                self.__add(state, values.clip(min=0)**2)
+
+            else:
+                self.__add(state, values.clip(min=0))
+
+        self.__previous_value = values[-1] if values.size > 0 else self.__previous_value
+        self.__length += values.size
+
+    def get(self, cost_function: str) -> float:
+        r"""Return last value of a cost function.
+
+        Parameters
+        ----------
+        cost_function : str
+            Name of accumulated :py:class:`CostFunction` method.
+
+        Returns
+        -------
+        value : float
+            Last value of the :py:class:`CostFunction` method for the accumulated time series.
+        """
+
+        state = self.__states[cost_function]
+
+        if cost_function in self.__windows:
+            # the group of the latest value is yet to be added to the running mean of the complete groups
+            mean = dict(state['mean'])
+            self.__add(mean, self.__get_group_value(cost_function, state['group']))
+            value = self.__get_mean(mean)
+        else:
+            value = state['sum'] if state['count'] > 0 else np.float64(np.nan)
+
+        return value
+
+    def reset(self):
+        r"""Reset accumulated time series to empty time series."""
+
+        self.__length = 0
+        self.__previous_value = np.nan
+        self.__states = {
+            c: {'mean': self.__get_state(), 'group': self.__get_group(0)} if c in self.__windows else self.__get_state()
+            for c in self.__cost_functions
+        }
+
+    @staticmethod
+    def __get_state() -> dict:
+        # running sum and count of valid values
+        return {'sum': np.float64(0.0), 'count': 0}
+
+    @staticmethod
+    def __get_group(index: int) -> dict:
+        # running sum, count and maximum of a group of consecutive time steps
+        return {'index': index, 'mean': CostFunctionAccumulator.__get_state(), 'max': np.float64(np.nan)}
+
+    @staticmethod
+    def __add(state: dict, values: Union[float, np.ndarray], group: bool = False):
+        # add values to a running sum skipping nan values and, infinite values unless the sum is of a group
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values) if group else np.isfinite(values)
+        state['sum'] += values[valid].sum()
+        state['count'] += int(np.count_nonzero(valid))
+
+    @staticmethod
+    def __get_mean(state: dict) -> float:
+        # mean of the added values that is nan if none are valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return state['sum']/state['count'] if state['count'] > 0 else np.float64(np.nan)
+
+    @staticmethod
+    def __get_group_value(cost_function: str, group: dict) -> float:
+        # load factor or peak of a group
+        if cost_function == 'load_factor':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                value = 1 - CostFunctionAccumulator.__get_mean(group['mean'])/group['max']
+        else:
+            value = group['max']
+
+        return value
\ No newline at end of file
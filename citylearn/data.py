@@ -1,10 +1,13 @@
+import hashlib
 import os
 from pathlib import Path
 import shutil
-from typing import Iterable, List, Union
+import tempfile
+from typing import Any, Callable, Iterable, List, Tuple, Union
 import numpy as np
+import pandas as pd
 
-from citylearn.utilities import read_json
+from citylearn.utilities import read_json, write_json
 
 class DataSet:
     __ROOT_DIRECTORY = os.path.join(os.path.dirname(__file__),'data')
@@ -39,6 +42,219 @@ class DataSet:
         schema['root_directory'] = root_directory
         return schema
 
+    @staticmethod
+    def build_cache(names: List[str] = None, directory: Union[Path, str] = None) -> List[str]:
+        r"""Write the binary time series cache for the data files of CityLearn data sets.
+
+        Parameters
+        ----------
+        names : List[str], optional
+            Names of CityLearn data sets to cache. Defaults to all data sets in :meth:`get_names`.
+        directory : Union[Path, str], optional
+            Cache directory. See :py:class:`citylearn.data.TimeSeriesCache` for the default.
+
+        Returns
+        -------
+        filepaths : List[str]
+            Data files that are cached.
+        """
+
+        names = DataSet.get_names() if names is None else names
+        cache = TimeSeriesCache(directory)
+        filepaths = []
+
+        for name in names:
+            source_directory = os.path.join(DataSet.__ROOT_DIRECTORY,name)
+
+            for f in sorted(os.listdir(source_directory)):
+                if f.endswith('.csv'):
+                    filepath = os.path.join(source_directory,f)
+                    cache.read(filepath)
+                    filepaths.append(filepath)
+                else:
+                    continue
+
+        return filepaths
+
+class TimeSeriesCache:
+    def __init__(self, directory: Union[Path, str] = None):
+        r"""Initialize `TimeSeriesCache`.
+
+        On-disk binary cache of data files that avoids parsing the same `.csv` file each time an environment is initialized.
+        Each data file is stored as a `.npy` array of its columns alongside a `.json` file that contains the column names
+        and the size, modification time and content hash of the source file. A cached file is reused if the source file 
+        size and modification time are unchanged, or if its content hash is unchanged otherwise it is re-written.
+
+        Parameters
+        ----------
+        directory : Union[Path, str], optional
+            Cache directory. Defaults to the `CITYLEARN_CACHE_DIRECTORY` environment variable if set otherwise, `~/.cache/citylearn`.
+        """
+
+        self.directory = directory
+
+    @property
+    def directory(self) -> Union[Path, str]:
+        """Cache directory."""
+
+        return self.__directory
+
+    @directory.setter
+    def directory(self, directory: Union[Path, str]):
+        if directory is None:
+            directory = os.environ.get('CITYLEARN_CACHE_DIRECTORY', os.path.join(os.path.expanduser('~'), '.cache', 'citylearn'))
+        else:
+            pass
+
+        self.__directory = directory
+
+    def read(self, filepath: Union[Path, str], mmap_mode: str = None) -> Tuple[List[str], np.ndarray]:
+        r"""Return the columns of a `.csv` data file, writing them to the cache on first read.
+
+        Parameters
+        ----------
+        filepath : Union[Path, str]
+            Data file path.
+        mmap_mode : str, optional
+            If provided, the cached values are returned as a `np.memmap` opened with this mode e.g. 'r' for read-only access,
+            so that processes reading the same file share its pages instead of each holding a private copy.
+            Values are returned in memory if the cache can not be written.
+
+        Returns
+        -------
+        columns : List[str]
+            Column names.
+        values : np.ndarray
+            2-D array of column values where each row is a column of the data file.
+        """
+
+        filepath = os.path.realpath(filepath)
+        cache_filepath = self.get_filepath(filepath)
+        metadata_filepath = f'{cache_filepath}.json'
+        values_filepath = f'{cache_filepath}.npy'
+        stat = os.stat(filepath)
+        metadata = read_json(metadata_filepath) if os.path.isfile(metadata_filepath) and os.path.isfile(values_filepath) else None
+
+        if metadata is not None and metadata['size'] == stat.st_size:
+            if metadata['mtime'] == stat.st_mtime_ns:
+                return metadata['columns'], np.load(values_filepath, mmap_mode=mmap_mode)
+            
+            elif metadata['hash'] == self.get_hash(filepath):
+                metadata['mtime'] = stat.st_mtime_ns
+                self.__write(metadata_filepath, values_filepath, metadata)
+                return metadata['columns'], np.load(values_filepath, mmap_mode=mmap_mode)
+            
+            else:
+                pass
+
+        else:
+            pass
+
+        data = pd.read_csv(filepath)
+        metadata = {
+            'source': filepath,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': self.get_hash(filepath),
+            'columns': data.columns.tolist(),
+        }
+        values = np.ascontiguousarray(data.to_numpy(dtype=float).T)
+        written = self.__write(metadata_filepath, values_filepath, metadata, values)
+
+        if written and mmap_mode is not None:
+            # the entry may have been replaced by another writer in the meantime so keep the parsed values on failure
+            try:
+                values = np.load(values_filepath, mmap_mode=mmap_mode)
+            except (OSError, ValueError, EOFError):
+                pass
+
+        else:
+            pass
+
+        return metadata['columns'], values
+
+    def get_source_hash(self, filepath: Union[Path, str]) -> str:
+        r"""Return SHA-256 digest of a data file's content.
+
+        The digest in the cache metadata is returned if the data file size and modification time are unchanged
+        otherwise, the data file is hashed.
+        """
+
+        filepath = os.path.realpath(filepath)
+        metadata_filepath = f'{self.get_filepath(filepath)}.json'
+        stat = os.stat(filepath)
+        metadata = read_json(metadata_filepath) if os.path.isfile(metadata_filepath) else None
+
+        if metadata is not None and metadata['size'] == stat.st_size and metadata['mtime'] == stat.st_mtime_ns:
+            return metadata['hash']
+        else:
+            return self.get_hash(filepath)
+
+    def get_filepath(self, filepath: Union[Path, str]) -> str:
+        r"""Return cache filepath without extension for a data file.
+
+        The name is prefixed with a digest of the resolved data file path so that data files with the same name 
+        in different directories do not collide.
+        """
+
+        filepath = os.path.realpath(filepath)
+        digest = hashlib.sha1(filepath.encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        return os.path.join(self.directory, f'{digest}_{name}')
+
+    @staticmethod
+    def get_hash(filepath: Union[Path, str]) -> str:
+        r"""Return SHA-256 digest of file content."""
+
+        digest = hashlib.sha256()
+
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def __write(self, metadata_filepath: str, values_filepath: str, metadata: dict, values: np.ndarray = None) -> bool:
+        # write to temporary files then rename so that concurrent readers never see a partially written cache
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            if values is not None:
+                self.__replace(values_filepath, lambda f: self.__save(f, values))
+            
+            else:
+                pass
+
+            self.__replace(metadata_filepath, lambda f: write_json(f, metadata))
+            return True
+        
+        # cache is an optimization so an unwritable directory falls back to reading the source file
+        except OSError:
+            return False
+
+    def __replace(self, filepath: str, write: Callable[[str], Any]):
+        # temporary file name is unique per call so that threads and processes writing the same entry do not clash
+        descriptor, temporary_filepath = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(descriptor)
+
+        try:
+            write(temporary_filepath)
+            os.replace(temporary_filepath, filepath)
+        
+        except BaseException:
+            if os.path.isfile(temporary_filepath):
+                os.remove(temporary_filepath)
+            else:
+                pass
+
+            raise
+
+    @staticmethod
+    def __save(filepath: str, values: np.ndarray):
+        # file object is passed so that numpy does not append an extension to the temporary file name
+        with open(filepath, 'wb') as f:
+            np.save(f, values)
+
 class EnergySimulation:
     """`Building` `energy_simulation` data class.
 
@@ -74,22 +290,28 @@ class EnergySimulation:
         self, month: Iterable[int], hour: Iterable[int], day_type: Iterable[int],
         daylight_savings_status: Iterable[int], indoor_dry_bulb_temperature: Iterable[float], average_unmet_cooling_setpoint_difference: Iterable[float], indoor_relative_humidity: Iterable[float], 
         non_shiftable_load: Iterable[float], dhw_demand: Iterable[float], cooling_demand: Iterable[float], heating_demand: Iterable[float],
-        solar_generation: Iterable[float]
+        solar_generation: Iterable[float], dtype: Union[str, type] = None
     ):
-        r"""Initialize `EnergySimulation`."""
+        r"""Initialize `EnergySimulation`.
+
+        Float time series are stored as `dtype` arrays, default: `float`. Those that are already `dtype` arrays, including `np.memmap` views
+        of a :py:class:`TimeSeriesCache` file, are kept as views rather than copied. The integer calendar time series are always converted.
+        """
+
+        dtype = float if dtype is None else dtype
 
         self.month = np.array(month, dtype = int)
         self.hour = np.array(hour, dtype = int)
         self.day_type = np.array(day_type, dtype = int)
         self.daylight_savings_status = np.array(daylight_savings_status, dtype = int)
-        self.indoor_dry_bulb_temperature = np.array(indoor_dry_bulb_temperature, dtype = float)
-        self.average_unmet_cooling_setpoint_difference = np.array(average_unmet_cooling_setpoint_difference, dtype = float)
-        self.indoor_relative_humidity = np.array(indoor_relative_humidity, dtype = float)
-        self.non_shiftable_load = np.array(non_shiftable_load, dtype = float)
-        self.dhw_demand = np.array(dhw_demand, dtype = float)
-        self.cooling_demand = np.array(cooling_demand, dtype = float)
-        self.heating_demand = np.array(heating_demand, dtype = float)
-        self.solar_generation = np.array(solar_generation, dtype = float)
+        self.indoor_dry_bulb_temperature = np.asanyarray(indoor_dry_bulb_temperature, dtype = dtype)
+        self.average_unmet_cooling_setpoint_difference = np.asanyarray(average_unmet_cooling_setpoint_difference, dtype = dtype)
+        self.indoor_relative_humidity = np.asanyarray(indoor_relative_humidity, dtype = dtype)
+        self.non_shiftable_load = np.asanyarray(non_shiftable_load, dtype = dtype)
+        self.dhw_demand = np.asanyarray(dhw_demand, dtype = dtype)
+        self.cooling_demand = np.asanyarray(cooling_demand, dtype = dtype)
+        self.heating_demand = np.asanyarray(heating_demand, dtype = dtype)
+        self.solar_generation = np.asanyarray(solar_generation, dtype = dtype)
 
 class Weather:
     """`Building` `weather` data class.
@@ -135,26 +357,32 @@ class Weather:
         outdoor_dry_bulb_temperature_predicted_6h: Iterable[float], outdoor_dry_bulb_temperature_predicted_12h: Iterable[float], outdoor_dry_bulb_temperature_predicted_24h: Iterable[float],
         outdoor_relative_humidity_predicted_6h: Iterable[float], outdoor_relative_humidity_predicted_12h: Iterable[float], outdoor_relative_humidity_predicted_24h: Iterable[float],
         diffuse_solar_irradiance_predicted_6h: Iterable[float], diffuse_solar_irradiance_predicted_12h: Iterable[float], diffuse_solar_irradiance_predicted_24h: Iterable[float],
-        direct_solar_irradiance_predicted_6h: Iterable[float], direct_solar_irradiance_predicted_12h: Iterable[float], direct_solar_irradiance_predicted_24h: Iterable[float],
+        direct_solar_irradiance_predicted_6h: Iterable[float], direct_solar_irradiance_predicted_12h: Iterable[float], direct_solar_irradiance_predicted_24h: Iterable[float], dtype: Union[str, type] = None
     ):
-        r"""Initialize `Weather`."""
-
-        self.outdoor_dry_bulb_temperature = np.array(outdoor_dry_bulb_temperature, dtype = float)
-        self.outdoor_relative_humidity = np.array(outdoor_relative_humidity, dtype = float)
-        self.diffuse_solar_irradiance = np.array(diffuse_solar_irradiance, dtype = float)
-        self.direct_solar_irradiance = np.array(direct_solar_irradiance, dtype = float)
-        self.outdoor_dry_bulb_temperature_predicted_6h = np.array(outdoor_dry_bulb_temperature_predicted_6h, dtype = float)
-        self.outdoor_dry_bulb_temperature_predicted_12h = np.array(outdoor_dry_bulb_temperature_predicted_12h, dtype = float)
-        self.outdoor_dry_bulb_temperature_predicted_24h = np.array(outdoor_dry_bulb_temperature_predicted_24h, dtype = float)
-        self.outdoor_relative_humidity_predicted_6h = np.array(outdoor_relative_humidity_predicted_6h, dtype = float)
-        self.outdoor_relative_humidity_predicted_12h = np.array(outdoor_relative_humidity_predicted_12h, dtype = float)
-        self.outdoor_relative_humidity_predicted_24h = np.array(outdoor_relative_humidity_predicted_24h, dtype = float)
-        self.diffuse_solar_irradiance_predicted_6h = np.array(diffuse_solar_irradiance_predicted_6h, dtype = float)
-        self.diffuse_solar_irradiance_predicted_12h = np.array(diffuse_solar_irradiance_predicted_12h, dtype = float)
-        self.diffuse_solar_irradiance_predicted_24h = np.array(diffuse_solar_irradiance_predicted_24h, dtype = float)
-        self.direct_solar_irradiance_predicted_6h = np.array(direct_solar_irradiance_predicted_6h, dtype = float)
-        self.direct_solar_irradiance_predicted_12h = np.array(direct_solar_irradiance_predicted_12h, dtype = float)
-        self.direct_solar_irradiance_predicted_24h = np.array(direct_solar_irradiance_predicted_24h, dtype = float)
+        r"""Initialize `Weather`.
+
+        Time series are stored as `dtype` arrays, default: `float`. Those that are already `dtype` arrays, including `np.memmap` views
+        of a :py:class:`TimeSeriesCache` file, are kept as views rather than copied.
+        """
+
+        dtype = float if dtype is None else dtype
+
+        self.outdoor_dry_bulb_temperature = np.asanyarray(outdoor_dry_bulb_temperature, dtype = dtype)
+        self.outdoor_relative_humidity = np.asanyarray(outdoor_relative_humidity, dtype = dtype)
+        self.diffuse_solar_irradiance = np.asanyarray(diffuse_solar_irradiance, dtype = dtype)
+        self.direct_solar_irradiance = np.asanyarray(direct_solar_irradiance, dtype = dtype)
+        self.outdoor_dry_bulb_temperature_predicted_6h = np.asanyarray(outdoor_dry_bulb_temperature_predicted_6h, dtype = dtype)
+        self.outdoor_dry_bulb_temperature_predicted_12h = np.asanyarray(outdoor_dry_bulb_temperature_predicted_12h, dtype = dtype)
+        self.outdoor_dry_bulb_temperature_predicted_24h = np.asanyarray(outdoor_dry_bulb_temperature_predicted_24h, dtype = dtype)
+        self.outdoor_relative_humidity_predicted_6h = np.asanyarray(outdoor_relative_humidity_predicted_6h, dtype = dtype)
+        self.outdoor_relative_humidity_predicted_12h = np.asanyarray(outdoor_relative_humidity_predicted_12h, dtype = dtype)
+        self.outdoor_relative_humidity_predicted_24h = np.asanyarray(outdoor_relative_humidity_predicted_24h, dtype = dtype)
+        self.diffuse_solar_irradiance_predicted_6h = np.asanyarray(diffuse_solar_irradiance_predicted_6h, dtype = dtype)
+        self.diffuse_solar_irradiance_predicted_12h = np.asanyarray(diffuse_solar_irradiance_predicted_12h, dtype = dtype)
+        self.diffuse_solar_irradiance_predicted_24h = np.asanyarray(diffuse_solar_irradiance_predicted_24h, dtype = dtype)
+        self.direct_solar_irradiance_predicted_6h = np.asanyarray(direct_solar_irradiance_predicted_6h, dtype = dtype)
+        self.direct_solar_irradiance_predicted_12h = np.asanyarray(direct_solar_irradiance_predicted_12h, dtype = dtype)
+        self.direct_solar_irradiance_predicted_24h = np.asanyarray(direct_solar_irradiance_predicted_24h, dtype = dtype)
 
 class Pricing:
     """`Building` `pricing` data class.
@@ -173,14 +401,19 @@ class Pricing:
 
     def __init__(
         self, electricity_pricing: Iterable[float], electricity_pricing_predicted_6h: Iterable[float], 
-        electricity_pricing_predicted_12h: Iterable[float], electricity_pricing_predicted_24h: Iterable[float]
+        electricity_pricing_predicted_12h: Iterable[float], electricity_pricing_predicted_24h: Iterable[float], dtype: Union[str, type] = None
     ):
-        r"""Initialize `Pricing`."""
+        r"""Initialize `Pricing`.
+
+        Time series are stored as `dtype` arrays, default: `float`.
+        """
+
+        dtype = float if dtype is None else dtype
 
-        self.electricity_pricing = np.array(electricity_pricing, dtype = float)
-        self.electricity_pricing_predicted_6h = np.array(electricity_pricing_predicted_6h, dtype = float)
-        self.electricity_pricing_predicted_12h = np.array(electricity_pricing_predicted_12h, dtype = float)
-        self.electricity_pricing_predicted_24h = np.array(electricity_pricing_predicted_24h, dtype = float)
+        self.electricity_pricing = np.asanyarray(electricity_pricing, dtype = dtype)
+        self.electricity_pricing_predicted_6h = np.asanyarray(electricity_pricing_predicted_6h, dtype = dtype)
+        self.electricity_pricing_predicted_12h = np.asanyarray(electricity_pricing_predicted_12h, dtype = dtype)
+        self.electricity_pricing_predicted_24h = np.asanyarray(electricity_pricing_predicted_24h, dtype = dtype)
 
 class CarbonIntensity:
     """`Building` `carbon_intensity` data class.
@@ -191,7 +424,95 @@ class CarbonIntensity:
         Grid carbon emission rate time series in [kg_co2/kWh].
     """
 
-    def __init__(self, carbon_intensity: Iterable[float]):
-        r"""Initialize `CarbonIntensity`."""
+    def __init__(self, carbon_intensity: Iterable[float], dtype: Union[str, type] = None):
+        r"""Initialize `CarbonIntensity`.
 
-        self.carbon_intensity = np.array(carbon_intensity, dtype = float)
\ No newline at end of file
+        Time series are stored as `dtype` arrays, default: `float`.
+        """
+
+        dtype = float if dtype is None else dtype
+
+        self.carbon_intensity = np.asanyarray(carbon_intensity, dtype = dtype)
+
+class RewardState:
+    """`CityLearnEnv` state at the current time step that reward functions are calculated from.
+
+    Building values are arrays in the same order as `CityLearnEnv.buildings`.
+
+    Attributes
+    ----------
+    central_agent : bool
+        Whether 1 central agent controls all buildings.
+    district_net_electricity_consumption : float
+        District net electricity consumption in [kWh].
+    district_net_electricity_consumption_cost : float
+        District net electricity consumption cost in [$].
+    district_net_electricity_consumption_emission : float
+        District net electricity consumption carbon dioxide emission in [kg_co2].
+    net_electricity_consumption : np.array
+        Buildings' net electricity consumption in [kWh].
+    net_electricity_consumption_cost : np.array
+        Buildings' net electricity consumption cost in [$].
+    net_electricity_consumption_emission : np.array
+        Buildings' net electricity consumption carbon dioxide emission in [kg_co2].
+    solar_generation : np.array
+        Buildings' solar generation (negative value) in [kWh].
+    cooling_storage_soc : np.array
+        Buildings' `cooling_storage` state of charge in [kWh].
+    heating_storage_soc : np.array
+        Buildings' `heating_storage` state of charge in [kWh].
+    dhw_storage_soc : np.array
+        Buildings' `dhw_storage` state of charge in [kWh].
+    electrical_storage_soc : np.array
+        Buildings' `electrical_storage` state of charge in [kWh].
+    cooling_storage_capacity : np.array
+        Buildings' `cooling_storage` capacity in [kWh].
+    heating_storage_capacity : np.array
+        Buildings' `heating_storage` capacity in [kWh].
+    dhw_storage_capacity : np.array
+        Buildings' `dhw_storage` capacity in [kWh].
+    electrical_storage_capacity : np.array
+        Buildings' `electrical_storage` capacity before degradation i.e. first value of `capacity_history` in [kWh].
+    electricity_pricing : np.array
+        Buildings' electricity pricing in [$/kWh].
+    carbon_intensity : np.array
+        Buildings' grid carbon emission rate in [kg_co2/kWh].
+    """
+
+    def __init__(
+        self, central_agent: bool, district_net_electricity_consumption: float, district_net_electricity_consumption_cost: float, 
+        district_net_electricity_consumption_emission: float, net_electricity_consumption: Iterable[float], net_electricity_consumption_cost: Iterable[float], 
+        net_electricity_consumption_emission: Iterable[float], solar_generation: Iterable[float], cooling_storage_soc: Iterable[float], 
+        heating_storage_soc: Iterable[float], dhw_storage_soc: Iterable[float], electrical_storage_soc: Iterable[float], 
+        cooling_storage_capacity: Iterable[float], heating_storage_capacity: Iterable[float], dhw_storage_capacity: Iterable[float], 
+        electrical_storage_capacity: Iterable[float], electricity_pricing: Iterable[float], carbon_intensity: Iterable[float]
+    ):
+        r"""Initialize `RewardState`.
+
+        Building values are stored as read-only `float` arrays so that reward functions can not update the environment they are views of.
+        """
+
+        self.central_agent = central_agent
+        self.district_net_electricity_consumption = float(district_net_electricity_consumption)
+        self.district_net_electricity_consumption_cost = float(district_net_electricity_consumption_cost)
+        self.district_net_electricity_consumption_emission = float(district_net_electricity_consumption_emission)
+        self.net_electricity_consumption = self.__get_array(net_electricity_consumption)
+        self.net_electricity_consumption_cost = self.__get_array(net_electricity_consumption_cost)
+        self.net_electricity_consumption_emission = self.__get_array(net_electricity_consumption_emission)
+        self.solar_generation = self.__get_array(solar_generation)
+        self.cooling_storage_soc = self.__get_array(cooling_storage_soc)
+        self.heating_storage_soc = self.__get_array(heating_storage_soc)
+        self.dhw_storage_soc = self.__get_array(dhw_storage_soc)
+        self.electrical_storage_soc = self.__get_array(electrical_storage_soc)
+        self.cooling_storage_capacity = self.__get_array(cooling_storage_capacity)
+        self.heating_storage_capacity = self.__get_array(heating_storage_capacity)
+        self.dhw_storage_capacity = self.__get_array(dhw_storage_capacity)
+        self.electrical_storage_capacity = self.__get_array(electrical_storage_capacity)
+        self.electricity_pricing = self.__get_array(electricity_pricing)
+        self.carbon_intensity = self.__get_array(carbon_intensity)
+
+    @staticmethod
+    def __get_array(values: Iterable[float]) -> np.ndarray:
+        values = np.asanyarray(values, dtype = float).view()
+        values.flags.writeable = False
+        return values
\ No newline at end of file
@@ -0,0 +1,588 @@
+from typing import Iterator, List, Mapping, Tuple, Union
+import numpy as np
+from citylearn.base import Environment
+from citylearn.building import Building
+from citylearn.energy_model import Battery, ElectricHeater, HeatPump, PV, StorageTank, ZERO_DIVISION_CAPACITY
+
+class District(Environment):
+    # actions in the order of the rows of the stacked actions
+    __ACTIONS = ['cooling_storage', 'heating_storage', 'dhw_storage', 'electrical_storage']
+
+    # observations that are not time series values in the order of the rows of the stacked observations
+    __OBSERVATIONS = [
+        'solar_generation', 'cooling_storage_soc', 'heating_storage_soc', 'dhw_storage_soc', 'electrical_storage_soc', 'net_electricity_consumption'
+    ]
+
+    def __init__(self, buildings: List[Building], parent: 'District' = None, **kwargs):
+        r"""Initialize `District`.
+
+        A struct-of-arrays simulation of `buildings` that holds the parameters, episode time series and histories of all buildings
+        and their devices in stacked arrays and advances all buildings in one vectorized step. The storage tanks, their devices and
+        demands are stacked in cooling, heating and dhw order along the first axis of the (storage tank, building, time step) arrays
+        and the other arrays are (building, time step) arrays.
+
+        The district replicates :py:meth:`citylearn.building.Building.apply_actions`, :py:meth:`citylearn.building.Building.next_time_step`
+        and :py:meth:`citylearn.building.Building.get_observations` so that the histories and observations are identical to those of the
+        building objects when actions and `dtype` are float64. The building objects are not updated as the district is advanced until
+        `synchronize` is called.
+
+        A member district of a `parent` district holds views of the parent's arrays for its `buildings` so that the parent advances the
+        buildings of all its members in one step. The member's actions are applied by the parent and the member only follows the parent's
+        `time_step` in :py:meth:`next_time_step` while its observations, variables and synchronization are limited to its `buildings`.
+
+        Parameters
+        ----------
+        buildings : List[Building]
+            Buildings at `time_step` 0 after reset. Each building's devices must be distinct objects.
+        parent : District, optional
+            District at `time_step` 0 whose `buildings` include `buildings` consecutively and in the same order.
+
+        Other Parameters
+        ----------------
+        **kwargs : dict
+            Other keyword arguments used to initialize super class.
+        """
+
+        self.buildings = buildings
+        self.__parent = parent
+        super().__init__(**kwargs)
+
+    @property
+    def buildings(self) -> List[Building]:
+        r"""Buildings in district."""
+
+        return self.__buildings
+
+    @property
+    def parent(self) -> 'District':
+        r"""District that holds and advances the buildings of this member district."""
+
+        return self.__parent
+
+    @property
+    def net_electricity_consumption(self) -> np.ndarray:
+        r"""(building, time step) `Building.net_electricity_consumption` time series up to `time_step`, in [kWh]."""
+
+        return self.__net_electricity_consumption[:, :self.time_step + 1]
+
+    @property
+    def net_electricity_consumption_cost(self) -> np.ndarray:
+        r"""(building, time step) `Building.net_electricity_consumption_cost` time series up to `time_step`, in [$]."""
+
+        return self.__net_electricity_consumption_cost[:, :self.time_step + 1]
+
+    @property
+    def net_electricity_consumption_emission(self) -> np.ndarray:
+        r"""(building, time step) `Building.net_electricity_consumption_emission` time series up to `time_step`, in [kg_co2]."""
+
+        return self.__net_electricity_consumption_emission[:, :self.time_step + 1]
+
+    @buildings.setter
+    def buildings(self, buildings: List[Building]):
+        self.__buildings = buildings
+
+    def apply_actions(self, actions: np.ndarray):
+        r"""Charge/discharge storage devices of all buildings.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Fractions of the storage devices' capacities to charge/discharge by in the order of the buildings' active actions
+            i.e. the concatenation of each building's actions.
+        """
+
+        assert self.parent is None, 'actions of a member district are applied by its parent district.'
+        self.__resize_histories(self.time_step + 2)
+        actions = np.asarray(actions, dtype=float).ravel()
+        assert actions.size == self.__action_index.size, f'Expected {self.__action_index.size} actions but got {actions.size}.'
+        values = np.zeros(len(self.__ACTIONS)*len(self.buildings), dtype=float)
+        values[self.__action_index] = actions
+        values[np.isnan(values)] = 0.0
+        values = values.reshape(len(self.__ACTIONS), len(self.buildings))
+        self.update_storage_tanks(values[0:3])
+        self.update_electrical_storage(values[3])
+
+    def update_storage_tanks(self, actions: np.ndarray):
+        r"""Charge/discharge the cooling, heating and dhw storage of all buildings and update their devices' electricity consumption.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            (storage tank, building) fractions of the storage tanks' capacities to charge/discharge by.
+        """
+
+        t = self.time_step
+        energy = actions*self.__capacity
+        space_demand = self.__demand[:, :, t]
+        space_demand = np.where(np.isnan(space_demand), 0.0, space_demand) # case where space demand is unknown
+        max_output = (self.__nominal_power - self.__electricity_consumption[:, :, t])*self.__output_factor[:, :, t]
+        energy = np.maximum(-space_demand, np.minimum(max_output - space_demand, energy))
+        charge_energy = np.where(energy >= 0, np.minimum(energy, self.__max_input_power), np.maximum(-self.__max_output_power, energy))
+        self.__charge(self.__soc, self.__energy_balance, charge_energy, self.__efficiency, self.__capacity, self.__loss_coefficient, self.__initial_soc)
+        input_power = (space_demand + energy)/self.__output_factor[:, :, t]
+        assert np.all(input_power >= 0), 'electricity_consumption must be >= 0.'
+        self.__electricity_consumption[:, :, t] += input_power
+
+    def update_electrical_storage(self, actions: np.ndarray):
+        r"""Charge/discharge the electrical storage of all buildings.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            Fractions of the electrical storages' capacities to charge/discharge by.
+        """
+
+        t = self.time_step
+        capacity = self.__capacity_history[:, t]
+        energy = actions*capacity
+
+        # maximum power with the capacity before the latest degradation as in Battery.get_max_input_power
+        soc_init = self.__battery_soc[:, t]*(1 - self.__battery_loss_coefficient)
+        max_power = self.__battery_nominal_power*self.__interpolate(self.__capacity_power_curve, soc_init/self.__capacity_history[:, max(t - 1, 0)])
+        energy = np.where(energy >= 0, np.minimum(energy, max_power), np.maximum(-max_power, energy))
+
+        # efficiency is raised to the scaling with Python floats as np.power is not always identical to the float power
+        efficiency = self.__interpolate(self.__power_efficiency_curve, np.abs(energy)/self.__battery_nominal_power).tolist()
+        efficiency = np.array([e**s for e, s in zip(efficiency, self.__efficiency_scaling)], dtype=self.dtype)
+        self.__efficiency_history[:, t + 1] = efficiency
+        self.__charge(
+            self.__battery_soc, self.__battery_energy_balance, energy, efficiency, capacity, self.__battery_loss_coefficient, self.__battery_initial_soc
+        )
+
+        # degradation
+        degradation = self.__capacity_loss_coefficient*self.__capacity_history[:, 0]*np.abs(self.__battery_energy_balance[:, t + 1])/(2*capacity)
+        capacity = (capacity - degradation).astype(self.dtype)
+        self.__capacity_history[:, t + 1] = np.where(capacity == 0, ZERO_DIVISION_CAPACITY, capacity)
+
+    def __charge(
+        self, soc: np.ndarray, energy_balance: np.ndarray, energy: np.ndarray, efficiency: np.ndarray, capacity: np.ndarray,
+        loss_coefficient: np.ndarray, initial_soc: np.ndarray
+    ):
+        # StorageDevice.charge and StorageDevice.set_energy_balance of the storage devices in the (..., time step) histories
+        t = self.time_step
+        soc_init = soc[..., t]*(1 - loss_coefficient)
+        soc[..., t + 1] = np.where(
+            energy >= 0, np.minimum(soc_init + energy*efficiency, capacity), np.maximum(0.0, soc_init + energy/efficiency)
+        )
+        previous_soc = initial_soc if t == 0 else soc[..., t]
+        balance = soc[..., t + 1] - previous_soc*(1.0 - loss_coefficient)
+        energy_balance[..., t + 1] = np.where(balance >= 0, balance/efficiency, balance*efficiency)
+
+    @staticmethod
+    def __interpolate(curve: Tuple[np.ndarray, ...], value: np.ndarray) -> np.ndarray:
+        # Battery curve interpolation of each building's value on the building's curve
+        x, y, dx, dy, length = curve
+        building = np.arange(x.shape[0])
+        index = (x < value[:, None]).sum(axis=1)
+        index = np.where(index == length, 0, np.maximum(0, index - 1))
+        return y[building, index] + dy[building, index]*(value - x[building, index])/dx[building, index]
+
+    @staticmethod
+    def __get_curve(curves: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+        # (building, point) curve x and y values and segment x and y differences padded to the longest curve
+        length = np.array([c.shape[1] for c in curves], dtype=int)
+        x = np.full((len(curves), length.max()), np.inf)
+        y = np.zeros((len(curves), length.max()))
+        dx = np.ones((len(curves), length.max() - 1))
+        dy = np.zeros((len(curves), length.max() - 1))
+
+        for i, c in enumerate(curves):
+            assert np.all(np.diff(c[0]) > 0), 'curve x values must be in ascending order.'
+            x[i, :length[i]], y[i, :length[i]] = c[0], c[1]
+            dx[i, :length[i] - 1], dy[i, :length[i] - 1] = np.diff(c[0]), np.diff(c[1])
+
+        return x, y, dx, dy, length
+
+    def get_observations(self) -> np.ndarray:
+        r"""Active observation values of all buildings at current time step.
+
+        Returns
+        -------
+        observations : np.ndarray
+            Concatenation of each building's :py:meth:`citylearn.building.Building.get_observations`. The array is overwritten by
+            the next call so should be copied if kept.
+        """
+
+        t = self.time_step
+        observations = self.__observations
+        observations[self.__time_series_observation_index] = np.concatenate([time_series[t] for time_series in self.__observation_time_series])
+        other_observations = np.vstack([
+            -self.__solar_generation[:, t],
+            self.__soc[:, :, t]/self.__capacity,
+            self.__battery_soc[:, t]/self.__capacity_history[:, 0],
+            self.__net_electricity_consumption[:, t],
+        ])
+        observations[self.__other_observation_index] = other_observations.ravel()[self.__other_observation_source]
+        return observations
+
+    def synchronize(self):
+        r"""Set `buildings` and their devices to the current `time_step` of the district.
+
+        The storage devices' and electric devices' histories are set to views of the district histories and the histories that are lists
+        are appended with the values since the last synchronization so the cost is independent of `time_step`.
+        """
+
+        t = self.time_step
+
+        if self.__synchronized_time_step == t:
+            return
+        else:
+            pass
+
+        for i, building in enumerate(self.buildings):
+            for j, (storage, device) in enumerate([
+                (building.cooling_storage, building.cooling_device),
+                (building.heating_storage, building.heating_device),
+                (building.dhw_storage, building.dhw_device),
+            ]):
+                storage.set_history(t, self.__soc[j, i], self.__energy_balance[j, i])
+                device.set_history(t, self.__electricity_consumption[j, i])
+
+            building.electrical_storage.set_history(
+                t, self.__battery_soc[i], self.__battery_energy_balance[i], self.__efficiency_history[i], self.__capacity_history[i]
+            )
+            building.pv.set_history(t)
+            building.set_history(
+                t, self.__electricity_consumption_history[0, i], self.__electricity_consumption_history[1, i],
+                self.__electricity_consumption_history[2, i], self.__net_electricity_consumption[i], self.__net_electricity_consumption_cost[i],
+                self.__net_electricity_consumption_emission[i]
+            )
+
+        self.__synchronized_time_step = t
+
+    def next_time_step(self):
+        r"""Advance all buildings to next `time_step` and update their variables.
+        
+        A member district only advances its `time_step` as its buildings are advanced by the parent district.
+        """
+
+        super().next_time_step()
+
+        if self.parent is None:
+            self.__resize_histories(self.time_step + 1)
+            self.__electricity_consumption[:, :, self.time_step] = 0.0
+            self.update_variables()
+        else:
+            assert self.time_step <= self.parent.time_step, 'member district must be advanced after its parent district.'
+
+    def update_variables(self):
+        r"""Update the electricity consumption, cost and emission of all buildings at current `time_step`."""
+
+        t = self.time_step
+        demand = self.__demand[:, :, t] + self.__energy_balance[:, :, t]
+        consumption = demand/self.__output_factor[:, :, t]
+        consumption[1] = demand[1]/self.__heating_input_factor[:, t]
+        self.__electricity_consumption_history[:, :, t] = consumption
+
+        # net electricity consumption in the order of the Building.update_variables sum
+        net_electricity_consumption = consumption[0] + consumption[1] + consumption[2] + self.__battery_energy_balance[:, t]\
+            + self.__non_shiftable_load[:, t] + self.__solar_generation[:, t]
+        self.__net_electricity_consumption[:, t] = net_electricity_consumption
+        net_electricity_consumption = self.__net_electricity_consumption[:, t]
+        self.__net_electricity_consumption_cost[:, t] = net_electricity_consumption*self.__electricity_pricing[:, t]
+        emission = net_electricity_consumption*self.__carbon_intensity[:, t]
+        self.__net_electricity_consumption_emission[:, t] = np.where(emission > 0, emission, 0.0)
+
+    def get_variables(self) -> Mapping[str, np.ndarray]:
+        r"""Variables of all buildings at current `time_step` that their storage and demand time series are derived from.
+
+        Returns
+        -------
+        variables : Mapping[str, np.ndarray]
+            (storage tank, building) `demand`, `energy_balance` and `storage_electricity_consumption` of the cooling, heating and dhw storage
+            tanks, (storage tank, building) `soc` and `capacity` of the cooling, heating and dhw storage tanks, (storage tank, building)
+            `electricity_consumption` of the cooling, heating and dhw devices and, (building,) `electrical_storage_energy_balance`,
+            `electrical_storage_soc`, `electrical_storage_capacity`, `non_shiftable_load`, `solar_generation`, `net_electricity_consumption`,
+            `net_electricity_consumption_cost`, `net_electricity_consumption_emission`, `net_electricity_consumption_without_storage_and_pv`,
+            `electricity_pricing` and `carbon_intensity`.
+        """
+
+        t = self.time_step
+        energy_balance = self.__energy_balance[:, :, t]
+
+        # devices' consumption to meet the demands without storage in the order of the Building.update_variables sum
+        demand = self.__demand[:, :, t]
+        consumption = demand/self.__output_factor[:, :, t]
+        consumption[1] = demand[1]/self.__heating_input_factor[:, t]
+
+        return {
+            'demand': demand,
+            'energy_balance': energy_balance,
+            'storage_electricity_consumption': energy_balance/self.__output_factor[:, :, t],
+            'soc': self.__soc[:, :, t],
+            'capacity': self.__capacity,
+            'electricity_consumption': self.__electricity_consumption_history[:, :, t],
+            'electrical_storage_energy_balance': self.__battery_energy_balance[:, t],
+            'electrical_storage_soc': self.__battery_soc[:, t],
+            'electrical_storage_capacity': self.__capacity_history[:, 0],
+            'non_shiftable_load': self.__non_shiftable_load[:, t],
+            'solar_generation': self.__solar_generation[:, t],
+            'net_electricity_consumption': self.__net_electricity_consumption[:, t],
+            'net_electricity_consumption_cost': self.__net_electricity_consumption_cost[:, t],
+            'net_electricity_consumption_emission': self.__net_electricity_consumption_emission[:, t],
+            'net_electricity_consumption_without_storage_and_pv': consumption[0] + consumption[1] + consumption[2] + self.__non_shiftable_load[:, t],
+            'electricity_pricing': self.__electricity_pricing[:, t],
+            'carbon_intensity': self.__carbon_intensity[:, t],
+        }
+
+    def get_preallocated_histories(self) -> List[Tuple[np.ndarray, Tuple[slice, ...]]]:
+        r"""Return the histories and the index of their time steps up to `time_step`.
+
+        A member district's histories are views of its parent's histories so they are not listed.
+        """
+
+        histories = super().get_preallocated_histories()
+
+        if self.parent is None:
+            index = (Ellipsis, slice(0, self.time_step + 1))
+            histories += [(h, index) for h in self.__get_histories()]
+        else:
+            pass
+
+        return histories
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore `time_step` from a `get_state` snapshot.
+
+        The histories are not truncated as the values up to `time_step` are not changed by later time steps. The `buildings` are expected
+        to be restored to the same `time_step` so they are considered synchronized.
+        """
+
+        super().set_state(state)
+        self.__synchronized_time_step = self.time_step
+
+    def reset(self):
+        r"""Reset `District` to the state of `buildings` at `time_step` 0 and stack their parameters, episode time series and initial histories."""
+
+        super().reset()
+
+        if self.parent is not None:
+            self.__set_parent_views()
+            self.__set_actions()
+            self.__set_observations()
+            self.__synchronized_time_step = self.time_step
+            return
+        else:
+            pass
+
+        buildings = self.buildings
+        time_steps = len(buildings[0].energy_simulation.hour)
+
+        for b in buildings:
+            devices = [b.cooling_device, b.heating_device, b.dhw_device, b.cooling_storage, b.heating_storage, b.dhw_storage, b.electrical_storage, b.pv]
+            assert len(set(id(d) for d in devices)) == len(devices), f'{b.name} devices must be distinct objects.'
+            assert isinstance(b.cooling_device, HeatPump), f'{b.name} cooling_device must be a HeatPump.'
+            assert all(isinstance(d, (HeatPump, ElectricHeater)) for d in [b.heating_device, b.dhw_device]),\
+                f'{b.name} heating_device and dhw_device must be a HeatPump or ElectricHeater.'
+            assert all(isinstance(d, StorageTank) for d in devices[3:6]) and isinstance(b.electrical_storage, Battery) and isinstance(b.pv, PV),\
+                f'{b.name} storage devices must be StorageTank and Battery and, pv must be PV.'
+            assert b.time_step == 0, f'{b.name} must be reset.'
+            assert len(b.energy_simulation.hour) == time_steps, 'buildings must have the same number of time steps.'
+
+        # storage tanks and their devices
+        storage_tanks = [[b.cooling_storage for b in buildings], [b.heating_storage for b in buildings], [b.dhw_storage for b in buildings]]
+        devices = [[b.cooling_device for b in buildings], [b.heating_device for b in buildings], [b.dhw_device for b in buildings]]
+        self.__demand = np.array([
+            [b.energy_simulation.cooling_demand for b in buildings],
+            [b.energy_simulation.heating_demand for b in buildings],
+            [b.energy_simulation.dhw_demand for b in buildings],
+        ])
+        self.__output_factor = np.array([[self.__get_output_factor(d, j > 0, time_steps) for d in devices[j]] for j in range(3)], dtype=float)
+
+        # Building.update_variables uses the dhw_device input power for heating when the heating_device is not a heat pump
+        self.__heating_input_factor = np.array([
+            b.heating_device.heating_cop if isinstance(b.heating_device, HeatPump) else self.__get_output_factor(b.dhw_device, False, time_steps)
+            for b in buildings
+        ], dtype=float)
+        self.__nominal_power = np.array([[d.nominal_power for d in s] for s in devices], dtype=float)
+        self.__capacity = np.array([[d.capacity for d in s] for s in storage_tanks], dtype=float)
+        self.__efficiency = np.array([[d.efficiency for d in s] for s in storage_tanks], dtype=float)
+        self.__loss_coefficient = np.array([[d.loss_coefficient for d in s] for s in storage_tanks], dtype=float)
+        self.__initial_soc = np.array([[d.initial_soc for d in s] for s in storage_tanks], dtype=float)
+        self.__max_input_power = np.array([[np.inf if d.max_input_power is None else d.max_input_power for d in s] for s in storage_tanks], dtype=float)
+        self.__max_output_power = np.array([[np.inf if d.max_output_power is None else d.max_output_power for d in s] for s in storage_tanks], dtype=float)
+        self.__max_input_power[np.isnan(self.__max_input_power)] = np.inf
+        self.__max_output_power[np.isnan(self.__max_output_power)] = np.inf
+        self.__soc = self.__get_history(3, time_steps, [[d.soc[0] for d in s] for s in storage_tanks])
+        self.__energy_balance = self.__get_history(3, time_steps, [[d.energy_balance[0] for d in s] for s in storage_tanks])
+        self.__electricity_consumption = self.__get_history(3, time_steps, [[d.electricity_consumption[0] for d in s] for s in devices])
+
+        # electrical storage
+        batteries = [b.electrical_storage for b in buildings]
+        self.__battery_nominal_power = np.array([d.nominal_power for d in batteries], dtype=float)
+        self.__battery_loss_coefficient = np.array([d.loss_coefficient for d in batteries], dtype=float)
+        self.__battery_initial_soc = np.array([d.initial_soc for d in batteries], dtype=float)
+        self.__capacity_loss_coefficient = np.array([d.capacity_loss_coefficient for d in batteries], dtype=float)
+        self.__efficiency_scaling = [d.efficiency_scaling for d in batteries]
+        self.__capacity_power_curve = self.__get_curve([d.capacity_power_curve for d in batteries])
+        self.__power_efficiency_curve = self.__get_curve([d.power_efficiency_curve for d in batteries])
+        self.__battery_soc = self.__get_history(None, time_steps, [d.soc[0] for d in batteries])
+        self.__battery_energy_balance = self.__get_history(None, time_steps, [d.energy_balance[0] for d in batteries])
+
+        # efficiency and capacity histories are float64 as their initial values are not cast to dtype
+        self.__efficiency_history = np.zeros((len(buildings), time_steps), dtype=float)
+        self.__capacity_history = np.zeros((len(buildings), time_steps), dtype=float)
+        self.__efficiency_history[:, 0] = [d.efficiency_history[0] for d in batteries]
+        self.__capacity_history[:, 0] = [d.capacity_history[0] for d in batteries]
+
+        # building time series and variables
+        self.__non_shiftable_load = np.array([b.energy_simulation.non_shiftable_load for b in buildings])
+        self.__solar_generation = np.array([b.pv.get_generation(b.energy_simulation.solar_generation)*-1 for b in buildings])
+        self.__electricity_pricing = np.array([b.pricing.electricity_pricing for b in buildings])
+        self.__carbon_intensity = np.array([b.carbon_intensity.carbon_intensity for b in buildings])
+        self.__electricity_consumption_history = self.__get_history(3, time_steps, [
+            [b.cooling_electricity_consumption[0] for b in buildings],
+            [b.heating_electricity_consumption[0] for b in buildings],
+            [b.dhw_electricity_consumption[0] for b in buildings],
+        ])
+        self.__net_electricity_consumption = self.__get_history(None, time_steps, [b.net_electricity_consumption[0] for b in buildings])
+        self.__net_electricity_consumption_cost = self.__get_history(None, time_steps, [b.net_electricity_consumption_cost[0] for b in buildings])
+        self.__net_electricity_consumption_emission = self.__get_history(
+            None, time_steps, [b.net_electricity_consumption_emission[0] for b in buildings]
+        )
+
+        # episode time series and parameters are read-only so that clones share them
+        for v in [
+            self.__demand, self.__output_factor, self.__heating_input_factor, self.__non_shiftable_load, self.__solar_generation,
+            self.__electricity_pricing, self.__carbon_intensity
+        ]:
+            v.flags.writeable = False
+
+        # actions and observations
+        self.__set_actions()
+        self.__set_observations()
+        self.__synchronized_time_step = self.time_step
+
+    def __set_parent_views(self):
+        # parameters, time series and histories of the buildings as views of the parent's arrays
+        parent = self.parent
+        start = [id(b) for b in parent.buildings].index(id(self.buildings[0]))
+        assert [id(b) for b in parent.buildings[start:start + len(self.buildings)]] == [id(b) for b in self.buildings],\
+            'buildings must be consecutive buildings of the parent district.'
+        assert parent.time_step == 0, 'parent district must be reset.'
+        i = slice(start, start + len(self.buildings))
+
+        # storage tanks and their devices
+        self.__demand = parent.__demand[:, i]
+        self.__output_factor = parent.__output_factor[:, i]
+        self.__heating_input_factor = parent.__heating_input_factor[i]
+        self.__nominal_power = parent.__nominal_power[:, i]
+        self.__capacity = parent.__capacity[:, i]
+        self.__efficiency = parent.__efficiency[:, i]
+        self.__loss_coefficient = parent.__loss_coefficient[:, i]
+        self.__initial_soc = parent.__initial_soc[:, i]
+        self.__max_input_power = parent.__max_input_power[:, i]
+        self.__max_output_power = parent.__max_output_power[:, i]
+        self.__soc = parent.__soc[:, i]
+        self.__energy_balance = parent.__energy_balance[:, i]
+        self.__electricity_consumption = parent.__electricity_consumption[:, i]
+
+        # electrical storage
+        self.__battery_nominal_power = parent.__battery_nominal_power[i]
+        self.__battery_loss_coefficient = parent.__battery_loss_coefficient[i]
+        self.__battery_initial_soc = parent.__battery_initial_soc[i]
+        self.__capacity_loss_coefficient = parent.__capacity_loss_coefficient[i]
+        self.__efficiency_scaling = parent.__efficiency_scaling[i]
+        self.__capacity_power_curve = tuple(c[i] for c in parent.__capacity_power_curve)
+        self.__power_efficiency_curve = tuple(c[i] for c in parent.__power_efficiency_curve)
+        self.__battery_soc = parent.__battery_soc[i]
+        self.__battery_energy_balance = parent.__battery_energy_balance[i]
+        self.__efficiency_history = parent.__efficiency_history[i]
+        self.__capacity_history = parent.__capacity_history[i]
+
+        # building time series and variables
+        self.__non_shiftable_load = parent.__non_shiftable_load[i]
+        self.__solar_generation = parent.__solar_generation[i]
+        self.__electricity_pricing = parent.__electricity_pricing[i]
+        self.__carbon_intensity = parent.__carbon_intensity[i]
+        self.__electricity_consumption_history = parent.__electricity_consumption_history[:, i]
+        self.__net_electricity_consumption = parent.__net_electricity_consumption[i]
+        self.__net_electricity_consumption_cost = parent.__net_electricity_consumption_cost[i]
+        self.__net_electricity_consumption_emission = parent.__net_electricity_consumption_emission[i]
+
+    def __get_histories(self) -> List[np.ndarray]:
+        # (..., time step) histories that are updated as the district is advanced
+        return [
+            self.__soc, self.__energy_balance, self.__electricity_consumption, self.__battery_soc, self.__battery_energy_balance,
+            self.__efficiency_history, self.__capacity_history, self.__electricity_consumption_history, self.__net_electricity_consumption,
+            self.__net_electricity_consumption_cost, self.__net_electricity_consumption_emission
+        ]
+
+    def __resize_histories(self, length: int):
+        # a clone only holds the time steps up to its time_step so its histories are doubled up to the episode time steps when
+        # more time steps are simulated. The buildings hold views of the previous histories so are synchronized again.
+        time_steps = self.__demand.shape[-1]
+
+        if self.__soc.shape[-1] < min(length, time_steps):
+            length = max(length, min(2*self.__soc.shape[-1], time_steps))
+            histories = []
+
+            for history in self.__get_histories():
+                resized_history = np.zeros(history.shape[:-1] + (length,), dtype=history.dtype)
+                resized_history[..., :history.shape[-1]] = history
+                histories.append(resized_history)
+
+            self.__soc, self.__energy_balance, self.__electricity_consumption, self.__battery_soc, self.__battery_energy_balance,\
+                self.__efficiency_history, self.__capacity_history, self.__electricity_consumption_history, self.__net_electricity_consumption,\
+                    self.__net_electricity_consumption_cost, self.__net_electricity_consumption_emission = histories
+            self.__synchronized_time_step = None
+
+        else:
+            pass
+
+    def __get_history(self, storage_tanks: int, time_steps: int, initial_value: List[float]) -> np.ndarray:
+        # zero-filled (storage tank, building, time step) or (building, time step) history of dtype with initial value at time step 0
+        shape = (len(self.buildings), time_steps) if storage_tanks is None else (storage_tanks, len(self.buildings), time_steps)
+        history = np.zeros(shape, dtype=self.dtype)
+        history[..., 0] = initial_value
+        return history
+
+    @staticmethod
+    def __get_output_factor(device: Union[HeatPump, ElectricHeater], heating: bool, time_steps: int) -> np.ndarray:
+        # output power per input power time series i.e. heat pump COP or electric heater efficiency
+        if isinstance(device, HeatPump):
+            factor = device.heating_cop if heating else device.cooling_cop
+        else:
+            factor = np.full(time_steps, device.efficiency, dtype=float)
+
+        return factor
+
+    def __set_actions(self):
+        # index of each building's active actions in the flattened (action, building) actions
+        action_index = []
+
+        for i, b in enumerate(self.buildings):
+            for k, v in b.action_metadata.items():
+                if v:
+                    action_index.append(self.__ACTIONS.index(k)*len(self.buildings) + i)
+                else:
+                    pass
+
+        self.__action_index = np.array(action_index, dtype=int)
+
+    def __set_observations(self):
+        # index of each building's time series observations and other observations in the concatenated observations and, index of
+        # the other observations in the flattened (observation, building) other observations
+        observation_time_series, time_series_index, other_index, other_source = [], [], [], []
+        offset = 0
+
+        for i, b in enumerate(self.buildings):
+            names = b.get_observation_names()
+            time_series, index = b.get_observation_time_series()
+            observation_time_series.append(time_series)
+            time_series_index += (index + offset).tolist()
+
+            for j, k in enumerate(names):
+                if j not in index:
+                    other_index.append(j + offset)
+                    other_source.append(self.__OBSERVATIONS.index(k)*len(self.buildings) + i)
+                else:
+                    pass
+
+            offset += len(names)
+
+        self.__observation_time_series = observation_time_series
+        self.__time_series_observation_index = np.array(time_series_index, dtype=int)
+        self.__other_observation_index = np.array(other_index, dtype=int)
+        self.__other_observation_source = np.array(other_source, dtype=int)
+        self.__observations = np.zeros(offset, dtype=self.dtype)
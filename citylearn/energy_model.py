@@ -1,17 +1,20 @@
-from typing import Iterable, List, Union
+import bisect
+from typing import Iterable, Iterator, List, Tuple, Union
 import numpy as np
 from citylearn.base import Environment
 np.seterr(divide = 'ignore', invalid = 'ignore')
 ZERO_DIVISION_CAPACITY = 0.00001
 
 class Device(Environment):
-    def __init__(self, efficiency: float = None, **kwargs):
+    def __init__(self, efficiency: float = None, time_steps: int = None, **kwargs):
         r"""Initialize `Device`.
 
         Parameters
         ----------
         efficiency : float, default: 1.0
             Technical efficiency. Must be set to > 0.
+        time_steps : int, optional
+            Number of time steps that histories are preallocated for on `reset`. Histories grow when more time steps are simulated.
 
         Other Parameters
         ----------------
@@ -19,6 +22,7 @@ class Device(Environment):
             Other keyword arguments used to initialize super class.
         """
 
+        self.time_steps = time_steps
         super().__init__(**kwargs)
         self.efficiency = efficiency
 
@@ -28,6 +32,17 @@ class Device(Environment):
 
         return self.__efficiency
 
+    @property
+    def time_steps(self) -> int:
+        """Number of time steps that histories are preallocated for on `reset`."""
+
+        return self.__time_steps
+
+    @time_steps.setter
+    def time_steps(self, time_steps: int):
+        assert time_steps is None or time_steps >= 1, 'time_steps must be >= 1.'
+        self.__time_steps = time_steps
+
     @efficiency.setter
     def efficiency(self, efficiency: float):
         if efficiency is None:
@@ -36,6 +51,35 @@ class Device(Environment):
             assert efficiency > 0, 'efficiency must be > 0.'
             self.__efficiency = efficiency
 
+    def get_history(self) -> np.ndarray:
+        r"""Return zero-filled history array of `dtype` preallocated for `time_steps`."""
+
+        return np.zeros(1 if self.time_steps is None else self.time_steps, dtype=self.dtype)
+
+    @staticmethod
+    def resize_history(history: np.ndarray, length: int) -> np.ndarray:
+        r"""Return `history` if it can hold `length` values otherwise, a copy of `history` that is at least double the size.
+
+        Parameters
+        ----------
+        history : np.ndarray
+            Preallocated history array.
+        length : int
+            Number of values `history` must hold.
+
+        Returns
+        -------
+        history : np.ndarray
+            History array that can hold `length` values.
+        """
+
+        if length <= history.shape[0]:
+            return history
+        else:
+            resized_history = np.zeros(max(length, 2*history.shape[0]), dtype=history.dtype)
+            resized_history[:history.shape[0]] = history
+            return resized_history
+
 class ElectricDevice(Device):
     def __init__(self, nominal_power: float, **kwargs):
         r"""Initialize `Device`.
@@ -61,16 +105,19 @@ class ElectricDevice(Device):
         return self.__nominal_power
 
     @property
-    def electricity_consumption(self) -> List[float]:
-        r"""Electricity consumption time series."""
+    def electricity_consumption(self) -> np.ndarray:
+        r"""Electricity consumption time series.
 
-        return self.__electricity_consumption
+        The time series is a view of the preallocated history so it is not copied.
+        """
+
+        return self.__electricity_consumption[:self.__cursor]
 
     @property
     def available_nominal_power(self) -> float:
         r"""Difference between `nominal_power` and `electricity_consumption` at current `time_step`."""
 
-        return None if self.nominal_power is None else self.nominal_power - self.electricity_consumption[self.time_step]
+        return None if self.nominal_power is None else self.nominal_power - self.__electricity_consumption[self.time_step]
 
     @nominal_power.setter
     def nominal_power(self, nominal_power: float):
@@ -92,17 +139,59 @@ class ElectricDevice(Device):
         assert electricity_consumption >= 0, 'electricity_consumption must be >= 0.'
         self.__electricity_consumption[self.time_step] += electricity_consumption
 
+    def get_state(self) -> List[float]:
+        r"""Return `time_step` and, `electricity_consumption` length and value at current `time_step`."""
+
+        return super().get_state() + [self.__cursor, self.__electricity_consumption[self.__cursor - 1]]
+
+    def get_preallocated_histories(self) -> List[Tuple[np.ndarray, slice]]:
+        r"""Return `electricity_consumption` history and the index of its values up to `time_step`."""
+
+        return super().get_preallocated_histories() + [(self.__electricity_consumption, slice(0, self.__cursor))]
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore `time_step` and truncate `electricity_consumption` to its `get_state` length."""
+
+        super().set_state(state)
+        self.__set_cursor(int(next(state)))
+        self.__electricity_consumption[self.__cursor - 1] = next(state)
+
+    def set_history(self, time_step: int, electricity_consumption: np.ndarray = None):
+        r"""Set `time_step` and `electricity_consumption` history to synchronize the device with a simulation that updates it outside 
+        the device e.g. :py:class:`citylearn.district.District`.
+
+        Parameters
+        ----------
+        time_step : int
+            Current time step.
+        electricity_consumption : np.ndarray, optional
+            Preallocated history that holds at least `time_step` + 1 values. The array is not copied so that it can be a view of an array
+            that is updated in place. If not provided, the current history is kept.
+        """
+
+        Environment.set_state(self, iter([time_step]))
+        self.__electricity_consumption = self.__electricity_consumption if electricity_consumption is None else electricity_consumption
+        self.__set_cursor(time_step + 1)
+
     def next_time_step(self):
         r"""Advance to next `time_step` and set `electricity_consumption` at new `time_step` to 0.0."""
 
         super().next_time_step()
-        self.__electricity_consumption.append(0.0)
+        self.__set_cursor(self.__cursor + 1)
+        self.__electricity_consumption[self.__cursor - 1] = 0.0
+
+    def __set_cursor(self, cursor: int):
+        # history is preallocated for time_steps and grows if more time steps are simulated
+        self.__electricity_consumption = self.resize_history(self.__electricity_consumption, cursor)
+        self.__cursor = cursor
 
     def reset(self):
-        r"""Reset `ElectricDevice` to initial state and set `electricity_consumption` at `time_step` 0 to = 0.0."""
+        r"""Reset `ElectricDevice` to initial state, preallocate `electricity_consumption` for `time_steps` and set `electricity_consumption` 
+        at `time_step` 0 to = 0.0."""
 
         super().reset()
-        self.__electricity_consumption = [0.0]
+        self.__electricity_consumption = self.get_history()
+        self.__cursor = 1
 
 class HeatPump(ElectricDevice):
     def __init__(self, nominal_power: float, efficiency: float = None, target_heating_temperature: float = None, target_cooling_temperature: float = None, **kwargs):
@@ -125,10 +214,49 @@ class HeatPump(ElectricDevice):
             Other keyword arguments used to initialize super class.
         """
 
+        self.__cooling_cop = None
+        self.__heating_cop = None
+        self.outdoor_dry_bulb_temperature = None
         super().__init__(nominal_power = nominal_power, efficiency = efficiency, **kwargs)
         self.target_heating_temperature = target_heating_temperature
         self.target_cooling_temperature = target_cooling_temperature
 
+    @property
+    def outdoor_dry_bulb_temperature(self) -> np.ndarray:
+        r"""Outdoor dry bulb temperature time series in [C] that `cooling_cop` and `heating_cop` are precomputed for."""
+
+        return self.__outdoor_dry_bulb_temperature
+
+    @property
+    def cooling_cop(self) -> np.ndarray:
+        r"""Cooling COP time series of `outdoor_dry_bulb_temperature`.
+
+        The time series is computed on first access and recomputed after `outdoor_dry_bulb_temperature`, `efficiency` or 
+        `target_cooling_temperature` is set.
+        """
+
+        if self.__cooling_cop is None:
+            self.__cooling_cop = self.__get_cop_time_series(False)
+        else:
+            pass
+
+        return self.__cooling_cop
+
+    @property
+    def heating_cop(self) -> np.ndarray:
+        r"""Heating COP time series of `outdoor_dry_bulb_temperature`.
+
+        The time series is computed on first access and recomputed after `outdoor_dry_bulb_temperature`, `efficiency` or 
+        `target_heating_temperature` is set.
+        """
+
+        if self.__heating_cop is None:
+            self.__heating_cop = self.__get_cop_time_series(True)
+        else:
+            pass
+
+        return self.__heating_cop
+
     @property
     def target_heating_temperature(self) -> float:
         r"""Target heating supply dry bulb temperature in [C]."""
@@ -148,6 +276,8 @@ class HeatPump(ElectricDevice):
         else:
             self.__target_heating_temperature = target_heating_temperature
 
+        self.__heating_cop = None
+
     @target_cooling_temperature.setter
     def target_cooling_temperature(self, target_cooling_temperature: float):
         if target_cooling_temperature is None:
@@ -155,21 +285,38 @@ class HeatPump(ElectricDevice):
         else:
             self.__target_cooling_temperature = target_cooling_temperature
 
+        self.__cooling_cop = None
+
+    @outdoor_dry_bulb_temperature.setter
+    def outdoor_dry_bulb_temperature(self, outdoor_dry_bulb_temperature: Iterable[float]):
+        if outdoor_dry_bulb_temperature is None:
+            self.__outdoor_dry_bulb_temperature = None
+        else:
+            # read-only view so that the time series is shared and not copied when cloned
+            self.__outdoor_dry_bulb_temperature = np.asarray(outdoor_dry_bulb_temperature).view()
+            self.__outdoor_dry_bulb_temperature.flags.writeable = False
+
+        self.__cooling_cop = None
+        self.__heating_cop = None
+
     @ElectricDevice.efficiency.setter
     def efficiency(self, efficiency: float):
         efficiency = 0.2 if efficiency is None else efficiency
         ElectricDevice.efficiency.fset(self, efficiency)
+        self.__cooling_cop = None
+        self.__heating_cop = None
 
-    def get_cop(self, outdoor_dry_bulb_temperature: Union[float, Iterable[float]], heating: bool) -> Union[float, Iterable[float]]:
+    def get_cop(self, outdoor_dry_bulb_temperature: Union[float, Iterable[float]] = None, heating: bool = None) -> Union[float, Iterable[float]]:
         r"""Return coefficient of performance.
 
         Calculate the Carnot cycle COP for heating or cooling mode. COP is set to 20 if < 0 or > 20.
 
         Parameters
         ----------
-        outdoor_dry_bulb_temperature : Union[float, Iterable[float]]
-            Outdoor dry bulb temperature in [C].
-        heating : bool
+        outdoor_dry_bulb_temperature : Union[float, Iterable[float]], optional
+            Outdoor dry bulb temperature in [C]. If not provided, the precomputed `cooling_cop` or `heating_cop` at current `time_step` 
+            is returned.
+        heating : bool, default: False
             If `True` return the heating COP else return cooling COP.
 
         Returns
@@ -183,6 +330,13 @@ class HeatPump(ElectricDevice):
         cooling_cop = (`t_target_cooling` + 273.15)*`efficiency`/(outdoor_dry_bulb_temperature - `t_target_cooling`)
         """
 
+        heating = False if heating is None else heating
+
+        if outdoor_dry_bulb_temperature is None:
+            return self.heating_cop[self.time_step] if heating else self.cooling_cop[self.time_step]
+        else:
+            pass
+
         c_to_k = lambda x: x + 273.15
         outdoor_dry_bulb_temperature = np.array(outdoor_dry_bulb_temperature)
 
@@ -196,16 +350,22 @@ class HeatPump(ElectricDevice):
         cop[cop > 20] = 20
         return cop
 
-    def get_max_output_power(self, outdoor_dry_bulb_temperature: Union[float, Iterable[float]], heating: bool, max_electric_power: Union[float, Iterable[float]] = None) -> Union[float, Iterable[float]]:
+    def __get_cop_time_series(self, heating: bool) -> np.ndarray:
+        assert self.outdoor_dry_bulb_temperature is not None, 'outdoor_dry_bulb_temperature must be set to precompute COP.'
+        cop = self.get_cop(self.outdoor_dry_bulb_temperature, heating)
+        cop.flags.writeable = False
+        return cop
+
+    def get_max_output_power(self, outdoor_dry_bulb_temperature: Union[float, Iterable[float]] = None, heating: bool = None, max_electric_power: Union[float, Iterable[float]] = None) -> Union[float, Iterable[float]]:
         r"""Return maximum output power.
 
         Calculate maximum output power from heat pump given `cop`, `available_nominal_power` and `max_electric_power` limitations.
 
         Parameters
         ----------
-        outdoor_dry_bulb_temperature : Union[float, Iterable[float]]
-            Outdoor dry bulb temperature in [C].
-        heating : bool
+        outdoor_dry_bulb_temperature : Union[float, Iterable[float]], optional
+            Outdoor dry bulb temperature in [C]. If not provided, the precomputed COP at current `time_step` is used.
+        heating : bool, default: False
             If `True` use heating COP else use cooling COP.
         max_electric_power : Union[float, Iterable[float]], optional
             Maximum amount of electric power that the heat pump can consume from the power grid.
@@ -227,7 +387,7 @@ class HeatPump(ElectricDevice):
         else:
             return np.minimum(max_electric_power, self.available_nominal_power)*cop
 
-    def get_input_power(self, output_power: Union[float, Iterable[float]], outdoor_dry_bulb_temperature: Union[float, Iterable[float]], heating: bool) -> Union[float, Iterable[float]]:
+    def get_input_power(self, output_power: Union[float, Iterable[float]], outdoor_dry_bulb_temperature: Union[float, Iterable[float]] = None, heating: bool = None) -> Union[float, Iterable[float]]:
         r"""Return input power.
 
         Calculate power needed to meet `output_power` given `cop` limitations.
@@ -236,9 +396,9 @@ class HeatPump(ElectricDevice):
         ----------
         output_power : Union[float, Iterable[float]]
             Output power from heat pump
-        outdoor_dry_bulb_temperature : Union[float, Iterable[float]]
-            Outdoor dry bulb temperature in [C].
-        heating : bool
+        outdoor_dry_bulb_temperature : Union[float, Iterable[float]], optional
+            Outdoor dry bulb temperature in [C]. If not provided, the precomputed COP at current `time_step` is used.
+        heating : bool, default: False
             If `True` use heating COP else use cooling COP.
 
         Returns
@@ -486,16 +646,19 @@ class StorageDevice(Device):
         return self.__initial_soc
 
     @property
-    def soc(self) -> List[float]:
-        r"""State of charge time series in [kWh]."""
+    def soc(self) -> np.ndarray:
+        r"""State of charge time series in [kWh].
 
-        return self.__soc
+        The time series is a view of the preallocated history so it is not copied.
+        """
+
+        return self.__soc[:self.__cursor]
 
     @property
     def soc_init(self) -> float:
         r"""Latest state of charge after accounting for standby hourly lossses."""
 
-        return self.__soc[-1]*(1 - self.loss_coefficient)
+        return self.__soc[self.__cursor - 1]*(1 - self.loss_coefficient)
 
     @property
     def efficiency_scaling(self) -> float:
@@ -504,10 +667,13 @@ class StorageDevice(Device):
         return self.__efficiency_scaling
 
     @property
-    def energy_balance(self) -> List[float]:
-        r"""Charged/discharged energy time series in [kWh]."""
+    def energy_balance(self) -> np.ndarray:
+        r"""Charged/discharged energy time series in [kWh].
 
-        return self.__energy_balance
+        The time series is a view of the preallocated history so it is not copied.
+        """
+
+        return self.__energy_balance[:self.__cursor]
 
     @Device.efficiency.setter
     def efficiency(self, efficiency: float):
@@ -561,8 +727,9 @@ class StorageDevice(Device):
         
         # The initial State Of Charge (SOC) is the previous SOC minus the energy losses
         soc = min(self.soc_init + energy*self.efficiency, self.capacity) if energy >= 0 else max(0, self.soc_init + energy/self.efficiency)
-        self.__soc.append(soc)
-        self.__energy_balance.append(self.set_energy_balance())
+        self.__set_cursor(self.__cursor + 1)
+        self.__soc[self.__cursor - 1] = soc
+        self.__energy_balance[self.__cursor - 1] = self.set_energy_balance()
 
     def set_energy_balance(self) -> float:
         r"""Calculate energy balance
@@ -573,8 +740,8 @@ class StorageDevice(Device):
 
         # actual energy charged/discharged irrespective of what is determined in the step function after 
         # taking into account storage design limits e.g. maximum power input/output, capacity
-        previous_soc = self.initial_soc if self.time_step == 0 else self.soc[-2]
-        energy_balance = self.soc[-1] - previous_soc*(1.0 - self.loss_coefficient)
+        previous_soc = self.initial_soc if self.time_step == 0 else self.__soc[self.__cursor - 2]
+        energy_balance = self.__soc[self.__cursor - 1] - previous_soc*(1.0 - self.loss_coefficient)
         energy_balance = energy_balance/self.efficiency if energy_balance >= 0 else energy_balance*self.efficiency
         return energy_balance
 
@@ -598,12 +765,60 @@ class StorageDevice(Device):
         safety_factor = 1.0 if safety_factor is None else safety_factor
         self.capacity = np.nanmax(demand)*safety_factor
 
+    def get_state(self) -> List[float]:
+        r"""Return `time_step`, the length of `soc` and `energy_balance` and, their latest values."""
+
+        return super().get_state() + [self.__cursor, self.__soc[self.__cursor - 1], self.__energy_balance[self.__cursor - 1]]
+
+    def get_preallocated_histories(self) -> List[Tuple[np.ndarray, slice]]:
+        r"""Return `soc` and `energy_balance` histories and the index of their values up to `time_step`."""
+
+        return super().get_preallocated_histories() + [
+            (self.__soc, slice(0, self.__cursor)), (self.__energy_balance, slice(0, self.__cursor))
+        ]
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore `time_step` and truncate `soc` and `energy_balance` to their `get_state` lengths."""
+
+        super().set_state(state)
+        self.__set_cursor(int(next(state)))
+        self.__soc[self.__cursor - 1] = next(state)
+        self.__energy_balance[self.__cursor - 1] = next(state)
+
+    def set_history(self, time_step: int, soc: np.ndarray, energy_balance: np.ndarray):
+        r"""Set `time_step` and, `soc` and `energy_balance` histories to synchronize the device with a simulation that updates it outside 
+        the device e.g. :py:class:`citylearn.district.District`.
+
+        Parameters
+        ----------
+        time_step : int
+            Current time step.
+        soc : np.ndarray
+            Preallocated `soc` history that holds at least `time_step` + 1 values. The array is not copied so that it can be a view 
+            of an array that is updated in place.
+        energy_balance : np.ndarray
+            Preallocated `energy_balance` history that holds at least `time_step` + 1 values and is not copied.
+        """
+
+        Environment.set_state(self, iter([time_step]))
+        self.__soc = soc
+        self.__energy_balance = energy_balance
+        self.__set_cursor(time_step + 1)
+
+    def __set_cursor(self, cursor: int):
+        # histories are preallocated for time_steps and grow if more time steps are simulated
+        self.__soc = self.resize_history(self.__soc, cursor)
+        self.__energy_balance = self.resize_history(self.__energy_balance, cursor)
+        self.__cursor = cursor
+
     def reset(self):
-        r"""Reset `StorageDevice` to initial state."""
+        r"""Reset `StorageDevice` to initial state and preallocate `soc` and `energy_balance` for `time_steps`."""
 
         super().reset()
-        self.__soc = [self.initial_soc]
-        self.__energy_balance = [0.0]
+        self.__soc = self.get_history()
+        self.__energy_balance = self.get_history()
+        self.__soc[0] = self.initial_soc
+        self.__cursor = 1
 
 class StorageTank(StorageDevice):
     def __init__(self, capacity: float, max_output_power: float = None, max_input_power: float = None, **kwargs):
@@ -778,6 +993,7 @@ class Battery(ElectricDevice, StorageDevice):
             pass
 
         self.__power_efficiency_curve = np.array(power_efficiency_curve).T
+        self.__power_efficiency_interpolator = self.__get_interpolator(self.__power_efficiency_curve)
 
     @capacity_power_curve.setter
     def capacity_power_curve(self, capacity_power_curve: List[List[float]]):
@@ -787,6 +1003,7 @@ class Battery(ElectricDevice, StorageDevice):
             pass
 
         self.__capacity_power_curve = np.array(capacity_power_curve).T
+        self.__capacity_power_interpolator = self.__get_interpolator(self.__capacity_power_curve)
 
     def charge(self, energy: float):
         """Charges or discharges storage with respect to specified energy while considering `capacity` degradation and `soc_init` limitations, losses to the environment quantified by `efficiency`, `power_efficiency_curve` and `capacity_power_curve`.
@@ -803,69 +1020,104 @@ class Battery(ElectricDevice, StorageDevice):
         """
 
         energy = min(energy, self.get_max_input_power()) if energy >= 0 else max(-self.get_max_output_power(), energy)
-        self.efficiency = self.get_current_efficiency(energy)
+        self.efficiency = self.dtype.type(self.get_current_efficiency(energy))
         super().charge(energy)
-        self.capacity = self.capacity - self.degrade()
+        self.capacity = self.dtype.type(self.capacity - self.degrade())
 
-    def get_max_output_power(self) -> float:
+    def get_max_output_power(self, soc: Union[float, Iterable[float]] = None) -> Union[float, Iterable[float]]:
         r"""Get maximum output power while considering `capacity_power_curve` limitations if defined otherwise, returns `nominal_power`.
 
+        Parameters
+        ----------
+        soc : Union[float, Iterable[float]], optional
+            State of charge after standby losses in [kWh]. Defaults to `soc_init`.
+
         Returns
         -------
-        max_output_power : float
-            Maximum amount of power that the storage unit can output [kW].
+        max_output_power : Union[float, Iterable[float]]
+            Maximum amount of power that the storage unit can output [kW] as single value or array depending on `soc` type.
         """
 
-        return self.get_max_input_power()
+        return self.get_max_input_power(soc)
 
-    def get_max_input_power(self) -> float:
+    def get_max_input_power(self, soc: Union[float, Iterable[float]] = None) -> Union[float, Iterable[float]]:
         r"""Get maximum input power while considering `capacity_power_curve` limitations if defined otherwise, returns `nominal_power`.
 
+        Parameters
+        ----------
+        soc : Union[float, Iterable[float]], optional
+            State of charge after standby losses in [kWh]. Defaults to `soc_init`.
+
         Returns
         -------
-        max_input_power : float
-            Maximum amount of power that the storage unit can use to charge [kW].
+        max_input_power : Union[float, Iterable[float]]
+            Maximum amount of power that the storage unit can use to charge [kW] as single value or array depending on `soc` type.
         """
 
         #The initial State Of Charge (SOC) is the previous SOC minus the energy losses
         if self.capacity_power_curve is not None:
             capacity = self.capacity_history[-2] if len(self.capacity_history) > 1 else self.capacity
-            soc_normalized = self.soc_init/capacity
+            soc = self.soc_init if soc is None else soc
+            soc_normalized = np.array(soc, dtype=float)/capacity if isinstance(soc, (list, tuple, np.ndarray)) else soc/capacity
             # Calculating the maximum power rate at which the battery can be charged or discharged
-            idx = max(0, np.argmax(soc_normalized <= self.capacity_power_curve[0]) - 1)
-            max_output_power = self.nominal_power*(
-                self.capacity_power_curve[1][idx] 
-                + (self.capacity_power_curve[1][idx+1] - self.capacity_power_curve[1][idx])*(soc_normalized - self.capacity_power_curve[0][idx])
-                /(self.capacity_power_curve[0][idx+1] - self.capacity_power_curve[0][idx])
-            )
+            max_output_power = self.nominal_power*self.__interpolate(self.__capacity_power_interpolator, soc_normalized)
         else:
             max_output_power = self.nominal_power
         
         return max_output_power
 
-    def get_current_efficiency(self, energy: float) -> float:
+    def get_current_efficiency(self, energy: Union[float, Iterable[float]]) -> Union[float, Iterable[float]]:
         r"""Get technical efficiency while considering `power_efficiency_curve` limitations if defined otherwise, returns `efficiency`.
 
+        Parameters
+        ----------
+        energy : Union[float, Iterable[float]]
+            Energy to charge if (+) or discharge if (-) in [kWh].
+
         Returns
         -------
-        efficiency : float
-            Technical efficiency.
+        efficiency : Union[float, Iterable[float]]
+            Technical efficiency as single value or array depending on `energy` type.
         """
 
         if self.power_efficiency_curve is not None:
             # Calculating the maximum power rate at which the battery can be charged or discharged
-            energy_normalized = np.abs(energy)/self.nominal_power
-            idx = max(0, np.argmax(energy_normalized <= self.power_efficiency_curve[0]) - 1)
-            efficiency = self.power_efficiency_curve[1][idx]\
-                + (energy_normalized - self.power_efficiency_curve[0][idx]
-                )*(self.power_efficiency_curve[1][idx + 1] - self.power_efficiency_curve[1][idx]
-                )/(self.power_efficiency_curve[0][idx + 1] - self.power_efficiency_curve[0][idx])
+            energy_normalized = np.abs(np.array(energy, dtype=float))/self.nominal_power if isinstance(energy, (list, tuple, np.ndarray)) else abs(energy)/self.nominal_power
+            efficiency = self.__interpolate(self.__power_efficiency_interpolator, energy_normalized)
             efficiency = efficiency**self.efficiency_scaling
         else:
             efficiency = self.efficiency
 
         return efficiency
 
+    @staticmethod
+    def __get_interpolator(curve: np.ndarray) -> Tuple[List[float], List[float], List[float], List[float]]:
+        # curve x and y values and, segment x and y differences so that interpolation is a bisection and a segment lookup
+        x, y = curve[0].tolist(), curve[1].tolist()
+        assert all(x[i] < x[i + 1] for i in range(len(x) - 1)), 'curve x values must be in ascending order.'
+        dx = [x[i + 1] - x[i] for i in range(len(x) - 1)]
+        dy = [y[i + 1] - y[i] for i in range(len(y) - 1)]
+        return x, y, dx, dy
+
+    @staticmethod
+    def __interpolate(interpolator: Tuple[List[float], List[float], List[float], List[float]], value: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        # linear interpolation on the segment that ends at the first x >= value. The first segment is extrapolated 
+        # for values beyond the last x value
+        x, y, dx, dy = interpolator
+
+        if isinstance(value, np.ndarray):
+            x, y, dx, dy = np.array(x), np.array(y), np.array(dx), np.array(dy)
+            idx = np.searchsorted(x, value, side='left')
+            idx = np.where(idx == len(x), 0, np.maximum(0, idx - 1))
+            value = y[idx] + dy[idx]*(value - x[idx])/dx[idx]
+        else:
+            value = float(value)
+            idx = bisect.bisect_left(x, value)
+            idx = 0 if idx == len(x) else max(0, idx - 1)
+            value = y[idx] + dy[idx]*(value - x[idx])/dx[idx]
+
+        return value
+
     def degrade(self) -> float:
         r"""Get amount of capacity degradation.
 
@@ -883,6 +1135,47 @@ class Battery(ElectricDevice, StorageDevice):
         capacity_degrade = self.capacity_loss_coefficient*self.capacity_history[0]*np.abs(self.energy_balance[-1])/(2*self.capacity)
         return capacity_degrade
 
+    def get_state(self) -> List[float]:
+        r"""Return `ElectricDevice` and `StorageDevice` state and, `efficiency_history` and `capacity_history` lengths and latest values."""
+
+        return super().get_state() + [
+            len(self.__efficiency_history), self.__efficiency_history[-1], len(self.__capacity_history), self.__capacity_history[-1]
+        ]
+
+    def set_state(self, state: Iterator[float]):
+        r"""Restore `ElectricDevice` and `StorageDevice` state and, truncate `efficiency_history` and `capacity_history` to their `get_state` lengths."""
+
+        super().set_state(state)
+        del self.__efficiency_history[int(next(state)):]
+        self.__efficiency_history[-1] = next(state)
+        del self.__capacity_history[int(next(state)):]
+        self.__capacity_history[-1] = next(state)
+
+    def set_history(self, time_step: int, soc: np.ndarray, energy_balance: np.ndarray, efficiency_history: np.ndarray, capacity_history: np.ndarray):
+        r"""Set `time_step`, `soc` and `energy_balance` histories and, update `efficiency_history` and `capacity_history` to synchronize 
+        the battery with a simulation that updates it outside the battery e.g. :py:class:`citylearn.district.District`.
+
+        Parameters
+        ----------
+        time_step : int
+            Current time step.
+        soc : np.ndarray
+            Preallocated `soc` history that holds at least `time_step` + 1 values and is not copied.
+        energy_balance : np.ndarray
+            Preallocated `energy_balance` history that holds at least `time_step` + 1 values and is not copied.
+        efficiency_history : np.ndarray
+            `efficiency_history` values of which those after the current `efficiency_history` length up to `time_step` are appended.
+        capacity_history : np.ndarray
+            `capacity_history` values of which those after the current `capacity_history` length up to `time_step` are appended.
+        """
+
+        ElectricDevice.set_history(self, time_step)
+        StorageDevice.set_history(self, time_step, soc, energy_balance)
+
+        for history, values in [(self.__efficiency_history, efficiency_history), (self.__capacity_history, capacity_history)]:
+            del history[time_step + 1:]
+            history.extend(values[len(history):time_step + 1])
+
     def reset(self):
         r"""Reset `Battery` to initial state."""
 
@@ -1,6 +1,7 @@
 from typing import List
 import numpy as np
 from citylearn.citylearn import CityLearnEnv
+from citylearn.data import RewardState
 from citylearn.energy_model import ZERO_DIVISION_CAPACITY
 
 class RewardFunction:
@@ -28,11 +29,16 @@ class RewardFunction:
     def env(self, env: CityLearnEnv):
         self.__env = env
 
-    def calculate(self) -> List[float]:
+    def calculate(self, state: RewardState = None) -> List[float]:
         r"""Calculates default reward.
 
         The default reward is the electricity consumption from the grid at the current time step returned as a negative value.
 
+        Parameters
+        ----------
+        state: citylearn.data.RewardState, optional
+            State to calculate the reward from. Defaults to `env.reward_state`.
+
         Returns
         -------
         reward: List[float]
@@ -42,12 +48,17 @@ class RewardFunction:
         -----
         Reward value is calculated as :math:`[\textrm{min}(-e_0, 0), \dots, \textrm{min}(-e_n, 0)]` 
         where :math:`e` is `electricity_consumption` and :math:`n` is the number of agents.
+
+        The rewards are calculated as vectorized expressions of the building arrays of `state` so sub classes should read the 
+        state rather than `env.buildings` to keep the cost independent of the number of building objects.
         """
 
-        if self.env.central_agent:
-            reward = [min(self.env.net_electricity_consumption[self.env.time_step]*-1, 0)]
+        state = self.env.reward_state if state is None else state
+
+        if state.central_agent:
+            reward = [min(state.district_net_electricity_consumption*-1, 0)]
         else:
-            reward = [min(b.net_electricity_consumption[b.time_step]*-1, 0) for b in self.env.buildings]
+            reward = np.minimum(state.net_electricity_consumption*-1, 0).tolist()
 
         return reward
 
@@ -55,9 +66,14 @@ class MARL(RewardFunction):
     def __init__(self, env: CityLearnEnv):
         super().__init__(env)
 
-    def calculate(self) -> List[float]:
+    def calculate(self, state: RewardState = None) -> List[float]:
         r"""Calculates MARL reward.
 
+        Parameters
+        ----------
+        state: citylearn.data.RewardState, optional
+            State to calculate the reward from. Defaults to `env.reward_state`.
+
         Returns
         -------
         reward: List[float]
@@ -69,20 +85,26 @@ class MARL(RewardFunction):
         where :math:`e` is the building `electricity_consumption` and :math:`E` is the district `electricity_consumption`.
         """
 
-        district_electricity_consumption = self.env.net_electricity_consumption[self.env.time_step]
-        building_electricity_consumption = np.array([b.net_electricity_consumption[b.time_step]*-1 for b in self.env.buildings])
-        reward = np.sign(building_electricity_consumption)*0.01*building_electricity_consumption**2*np.nanmax(0, district_electricity_consumption)
+        state = self.env.reward_state if state is None else state
+        building_electricity_consumption = state.net_electricity_consumption*-1
+        reward = np.sign(building_electricity_consumption)*0.01*building_electricity_consumption**2\
+            *max(0, state.district_net_electricity_consumption)
         return reward.tolist()
 
 class IndependentSACReward(RewardFunction):
     def __init__(self, env: CityLearnEnv):
         super().__init__(env)
 
-    def calculate(self) -> List[float]:
+    def calculate(self, state: RewardState = None) -> List[float]:
         r"""Returned reward assumes that the building-agents act independently of each other, without sharing information through the reward.
 
         Recommended for use with the `SAC` controllers.
 
+        Parameters
+        ----------
+        state: citylearn.data.RewardState, optional
+            State to calculate the reward from. Defaults to `env.reward_state`.
+
         Returns
         -------
         reward: List[float]
@@ -94,13 +116,14 @@ class IndependentSACReward(RewardFunction):
         where :math:`e` is `electricity_consumption` and :math:`n` is the number of agents.
         """
 
-        return [min(b.net_electricity_consumption[b.time_step]*-1**3, 0) for b in self.env.buildings]
+        state = self.env.reward_state if state is None else state
+        return np.minimum(state.net_electricity_consumption*-1**3, 0).tolist()
     
 class SolarPenaltyReward(RewardFunction):
     def __init__(self, env: CityLearnEnv):
         super().__init__(env)
 
-    def calculate(self) -> List[float]:
+    def calculate(self, state: RewardState = None) -> List[float]:
         """The reward is designed to minimize electricity consumption and maximize
         solar generation to charge energy storage systems.
 
@@ -114,35 +137,32 @@ class SolarPenaltyReward(RewardFunction):
         energy storage systems are charged to capacity and there is net import from the 
         grid the penalty is maximized.
 
+        Parameters
+        ----------
+        state: citylearn.data.RewardState, optional
+            State to calculate the reward from. Defaults to `env.reward_state`.
+
         Returns
         -------
         reward: List[float]
             Reward for transition to current timestep.
         """
         
-        reward_list = []
-
-        for b in self.env.buildings:
-            e = b.net_electricity_consumption[-1]
-            cc = b.cooling_storage.capacity
-            hc = b.heating_storage.capacity
-            dc = b.dhw_storage.capacity
-            ec = b.electrical_storage.capacity_history[0]
-            cs = b.cooling_storage.soc[-1]/cc
-            hs = b.heating_storage.soc[-1]/hc
-            ds = b.dhw_storage.soc[-1]/dc
-            es = b.electrical_storage.soc[-1]/ec
-            reward = 0.0
-            reward += -(1.0 + np.sign(e)*cs)*abs(e) if cc > ZERO_DIVISION_CAPACITY else 0.0
-            reward += -(1.0 + np.sign(e)*hs)*abs(e) if hc > ZERO_DIVISION_CAPACITY else 0.0
-            reward += -(1.0 + np.sign(e)*ds)*abs(e) if dc > ZERO_DIVISION_CAPACITY else 0.0
-            reward += -(1.0 + np.sign(e)*es)*abs(e) if ec > ZERO_DIVISION_CAPACITY else 0.0
-            reward_list.append(reward)
-
-
-        if self.env.central_agent:
-            reward = [sum(reward_list)]
+        state = self.env.reward_state if state is None else state
+        e = state.net_electricity_consumption
+        capacity = np.array([
+            state.cooling_storage_capacity, state.heating_storage_capacity, state.dhw_storage_capacity, state.electrical_storage_capacity
+        ])
+        soc = np.array([state.cooling_storage_soc, state.heating_storage_soc, state.dhw_storage_soc, state.electrical_storage_soc])/capacity
+
+        # (storage, building) penalties that are added in storage order as in a sum over the storage devices of each building
+        reward = np.where(capacity > ZERO_DIVISION_CAPACITY, -(1.0 + np.sign(e)*soc)*np.abs(e), 0.0)
+        reward = reward[0] + reward[1] + reward[2] + reward[3]
+
+        if state.central_agent:
+            # cumulative sum adds the building rewards in the same order as sum
+            reward = [np.cumsum(reward)[-1]]
         else:
-            reward = reward_list
+            reward = reward.tolist()
         
         return reward
\ No newline at end of file
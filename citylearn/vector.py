@@ -0,0 +1,579 @@
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+import os
+from pathlib import Path
+import traceback
+from typing import Any, List, Mapping, Tuple, Union
+from gym import spaces
+import numpy as np
+from citylearn.citylearn import CityLearnEnv
+from citylearn.district import District
+
+class VectorCityLearnEnv:
+    def __init__(self, schema: Union[str, Path, Mapping[str, Any]], num_envs: int = None, env_kwargs: List[Mapping[str, Any]] = None, **kwargs):
+        r"""Initialize `VectorCityLearnEnv`.
+
+        A batch of `CityLearnEnv` environments of the same schema that are stepped in lockstep with (environment, ...) observation,
+        reward and action arrays. Each environment can have its own `random_seed`, episode window or device sizing but all environments
+        must have the same agents, observations and actions.
+
+        When the environments are `vectorized`, the buildings of all environments are advanced by one :py:class:`citylearn.district.District`
+        after :py:meth:`reset` and each environment's `district` is a member of it so that the actions, building updates and observations
+        of all environments are vectorized together. The environments must then have the same number of episode time steps and should
+        only be stepped through the `VectorCityLearnEnv`.
+
+        Parameters
+        ----------
+        schema: Union[str, Path, Mapping[str, Any]]
+            Name of CityLearn data set, filepath to JSON representation or :code:`dict` object of a CityLearn schema.
+        num_envs: int, optional
+            Number of environments. Defaults to the length of `env_kwargs` if provided otherwise, 1.
+        env_kwargs: List[Mapping[str, Any]], optional
+            Keyword arguments of each environment that override `kwargs` e.g. `random_seed`, `simulation_start_time_step`, `episode_time_steps`
+            or a `schema` with different device sizing.
+
+        Other Parameters
+        ----------------
+        **kwargs : dict
+            Keyword arguments of all environments used to initialize :py:class:`citylearn.citylearn.CityLearnEnv`. If `random_seed` is provided,
+            the i-th environment's default `random_seed` is `random_seed` + i.
+        """
+
+        self.envs = [CityLearnEnv(**e) for e in self.get_env_kwargs(schema, num_envs=num_envs, env_kwargs=env_kwargs, **kwargs)]
+        self.__district = None
+
+    @property
+    def envs(self) -> List[CityLearnEnv]:
+        """Environments in the batch."""
+
+        return self.__envs
+
+    @property
+    def num_envs(self) -> int:
+        """Number of environments."""
+
+        return len(self.envs)
+
+    @property
+    def central_agent(self) -> bool:
+        """Expect 1 central agent to control all buildings of each environment."""
+
+        return self.envs[0].central_agent
+
+    @property
+    def observation_space(self) -> List[spaces.Box]:
+        """Controller(s) observation spaces of each environment."""
+
+        return self.envs[0].observation_space
+
+    @property
+    def action_space(self) -> List[spaces.Box]:
+        """Controller(s) action spaces of each environment."""
+
+        return self.envs[0].action_space
+
+    @property
+    def observation_names(self) -> List[List[str]]:
+        """Names of returned observations of each environment."""
+
+        return self.envs[0].observation_names
+
+    @property
+    def time_step(self) -> int:
+        """Current environments time step."""
+
+        return self.envs[0].time_step
+
+    @property
+    def observations(self) -> List[np.ndarray]:
+        """Observations at current time step.
+
+        Notes
+        -----
+        A list of (environment, observation) arrays is returned with as many arrays as agents where the i-th array holds the
+        i-th agent's :py:attr:`citylearn.citylearn.CityLearnEnv.observations` of each environment.
+        """
+
+        if self.__district is not None:
+            observations = self.__district.get_observations().reshape(self.num_envs, -1)
+
+            if self.central_agent:
+                observations = [observations[:, self.__observation_mask]]
+            else:
+                observations = np.split(observations.copy(), self.__observation_split, axis=1)
+
+        else:
+            observations = [env.observations for env in self.envs]
+            observations = [np.array([o[i] for o in observations]) for i in range(len(observations[0]))]
+
+        return observations
+
+    @property
+    def done(self) -> np.ndarray:
+        """Whether each environment has reached completion."""
+
+        return np.array([env.done for env in self.envs], dtype=bool)
+
+    @envs.setter
+    def envs(self, envs: List[CityLearnEnv]):
+        for env in envs[1:]:
+            assert env.central_agent == envs[0].central_agent, 'envs must have the same central_agent.'
+            assert env.observation_names == envs[0].observation_names, 'envs must have the same observations.'
+            assert [s.shape for s in env.action_space] == [s.shape for s in envs[0].action_space], 'envs must have the same actions.'
+
+        self.__envs = envs
+
+    def step(self, actions: List[np.ndarray]) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, List[dict]]:
+        """Apply actions to the environments and advance them to next time step.
+
+        Parameters
+        ----------
+        actions: List[np.ndarray]
+            (environment, action) arrays as many as agents where the i-th array holds the i-th agent's actions in each environment
+            as defined in :py:meth:`citylearn.citylearn.CityLearnEnv.step`.
+
+        Returns
+        -------
+        observations: List[np.ndarray]
+            :attr:`observations` current value.
+        reward: np.ndarray
+            (environment, agent) rewards.
+        done: np.ndarray
+            :attr:`done` current value.
+        info: List[dict]
+            Each environment's :py:meth:`citylearn.citylearn.CityLearnEnv.get_info`.
+        """
+
+        actions = [np.asarray(a, dtype=float).reshape(self.num_envs, -1) for a in actions]
+
+        if self.__district is not None:
+            self.__district.apply_actions(np.concatenate(actions, axis=1))
+            self.__district.next_time_step()
+            rewards = []
+
+            for env in self.envs:
+                env.next_time_step()
+                reward = env.reward_function.calculate()
+                env.rewards.append(reward)
+                rewards.append(reward)
+
+            observations = self.observations
+
+        else:
+            results = [env.step([a[i] for a in actions]) for i, env in enumerate(self.envs)]
+            rewards = [r[1] for r in results]
+            observations = [np.array([r[0][i] for r in results]) for i in range(len(actions))]
+
+        return observations, np.array(rewards, dtype=float), self.done, [env.get_info() for env in self.envs]
+
+    def reset(self, start_time_step: Union[int, List[int]] = None, episode_time_steps: Union[int, List[int]] = None) -> List[np.ndarray]:
+        r"""Reset the environments to initial state.
+
+        Parameters
+        ----------
+        start_time_step: Union[int, List[int]], optional
+            Time step in data files to start the episode at in all environments or, in each environment.
+            See :py:meth:`citylearn.citylearn.CityLearnEnv.reset` for the default.
+        episode_time_steps: Union[int, List[int]], optional
+            Number of time steps in the episode of all environments or, of each environment.
+
+        Returns
+        -------
+        observations: List[np.ndarray]
+            :attr:`observations`.
+        """
+
+        start_time_step = [start_time_step]*self.num_envs if start_time_step is None or isinstance(start_time_step, int) else start_time_step
+        episode_time_steps = [episode_time_steps]*self.num_envs if episode_time_steps is None or isinstance(episode_time_steps, int)\
+            else episode_time_steps
+        self.__district = None
+
+        for env, s, t in zip(self.envs, start_time_step, episode_time_steps):
+            env.reset(start_time_step=s, episode_time_steps=t)
+
+        if all(env.district is not None for env in self.envs):
+            self.__set_district()
+        else:
+            pass
+
+        return self.observations
+
+    @staticmethod
+    def get_env_kwargs(
+        schema: Union[str, Path, Mapping[str, Any]], num_envs: int = None, env_kwargs: List[Mapping[str, Any]] = None, **kwargs
+    ) -> List[Mapping[str, Any]]:
+        r"""Return the keyword arguments used to initialize each environment.
+
+        See :py:class:`VectorCityLearnEnv` for the parameters.
+
+        Returns
+        -------
+        env_kwargs: List[Mapping[str, Any]]
+            :py:class:`citylearn.citylearn.CityLearnEnv` keyword arguments of each environment including `schema`.
+        """
+
+        num_envs = (1 if env_kwargs is None else len(env_kwargs)) if num_envs is None else num_envs
+        env_kwargs = [{} for _ in range(num_envs)] if env_kwargs is None else env_kwargs
+        assert num_envs >= 1, 'num_envs must be >= 1.'
+        assert len(env_kwargs) == num_envs, 'env_kwargs must have num_envs elements.'
+        kwargs_list = []
+
+        for i, e in enumerate(env_kwargs):
+            e = {'schema': schema, **kwargs, **e}
+
+            if 'random_seed' in kwargs and 'random_seed' not in env_kwargs[i]:
+                e['random_seed'] = kwargs['random_seed'] + i
+            else:
+                pass
+
+            kwargs_list.append(e)
+
+        return kwargs_list
+
+    def __set_district(self):
+        # district of the buildings of all environments and a member district for each environment
+        districts = [env.district for env in self.envs]
+        assert len(set(env.time_steps for env in self.envs)) == 1, 'vectorized envs must have the same number of episode time steps.'
+        observation_sizes = [len(b.active_observations) for b in districts[0].buildings]
+
+        for d in districts[1:]:
+            assert [len(b.active_observations) for b in d.buildings] == observation_sizes, 'envs must have the same building observations.'
+
+        district = District([b for d in districts for b in d.buildings], dtype=self.envs[0].dtype)
+
+        for env, d in zip(self.envs, districts):
+            env.district = District(d.buildings, parent=district, dtype=district.dtype)
+
+        # central agent observations exclude the shared observations of all but the first building as in CityLearnEnv.observations
+        shared_observations = self.envs[0].shared_observations
+        self.__observation_mask = np.array([
+            i == 0 or k not in shared_observations for i, b in enumerate(districts[0].buildings) for k in b.active_observations
+        ], dtype=bool)
+        self.__observation_split = np.cumsum(observation_sizes)[:-1]
+        self.__district = district
+
+class SubprocessVectorCityLearnEnv:
+    def __init__(
+        self, schema: Union[str, Path, Mapping[str, Any]], num_envs: int = None, env_kwargs: List[Mapping[str, Any]] = None, num_workers: int = None,
+        context: str = None, **kwargs
+    ):
+        r"""Initialize `SubprocessVectorCityLearnEnv`.
+
+        A batch of `CityLearnEnv` environments that are stepped in lockstep in worker processes. Each worker owns a
+        :py:class:`VectorCityLearnEnv` of consecutive environments and writes their observations, rewards and done flags into
+        `multiprocessing.shared_memory` arrays so that only the actions and each environment's info are sent through the worker's pipe
+        at each time step. The observations, rewards and done flags have the same layout as those of :py:class:`VectorCityLearnEnv`.
+
+        Call :py:meth:`close` to stop the workers and release the shared memory.
+
+        Parameters
+        ----------
+        schema: Union[str, Path, Mapping[str, Any]]
+            Name of CityLearn data set, filepath to JSON representation or :code:`dict` object of a CityLearn schema.
+        num_envs: int, optional
+            Number of environments. Defaults to the length of `env_kwargs` if provided otherwise, 1.
+        env_kwargs: List[Mapping[str, Any]], optional
+            Keyword arguments of each environment that override `kwargs`. See :py:class:`VectorCityLearnEnv`.
+        num_workers: int, optional
+            Number of worker processes. Defaults to the smaller of `num_envs` and the number of CPUs.
+        context: str, optional
+            `multiprocessing` start method of the workers e.g. 'fork', 'spawn' or 'forkserver'. Defaults to the platform's default.
+
+        Other Parameters
+        ----------------
+        **kwargs : dict
+            Keyword arguments of all environments used to initialize :py:class:`citylearn.citylearn.CityLearnEnv`.
+        """
+
+        env_kwargs = VectorCityLearnEnv.get_env_kwargs(schema, num_envs=num_envs, env_kwargs=env_kwargs, **kwargs)
+        num_workers = min(len(env_kwargs), os.cpu_count() or 1) if num_workers is None else num_workers
+        assert 1 <= num_workers <= len(env_kwargs), 'num_workers must be between 1 and num_envs.'
+        context = multiprocessing.get_context(context)
+        self.__env_slices = [slice(int(i[0]), int(i[-1]) + 1) for i in np.array_split(np.arange(len(env_kwargs)), num_workers)]
+        self.__pipes = []
+        self.__processes = []
+        self.__buffers = []
+        self.__num_envs = len(env_kwargs)
+        self.__observations, self.__rewards, self.__done = None, None, None
+        self.__closed = False
+
+        if os.name == 'posix':
+            # forked workers must share the resource tracker of this process otherwise, their trackers unlink the shared memory at exit
+            resource_tracker.ensure_running()
+        else:
+            pass
+
+        for i in self.__env_slices:
+            pipe, worker_pipe = context.Pipe()
+            process = context.Process(target=self.run_worker, args=(worker_pipe, env_kwargs[i]), daemon=True)
+            process.start()
+            worker_pipe.close()
+            self.__pipes.append(pipe)
+            self.__processes.append(process)
+
+        try:
+            metadata = self.__receive()
+            assert all(m[2] == metadata[0][2] for m in metadata), 'envs must have the same observations.'
+            self.__observation_space, self.__action_space, self.__observation_names, self.__central_agent, dtype = metadata[0]
+            self.__set_buffers(len(env_kwargs), dtype)
+
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def num_envs(self) -> int:
+        """Number of environments."""
+
+        return self.__num_envs
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker processes."""
+
+        return len(self.__processes)
+
+    @property
+    def central_agent(self) -> bool:
+        """Expect 1 central agent to control all buildings of each environment."""
+
+        return self.__central_agent
+
+    @property
+    def observation_space(self) -> List[spaces.Box]:
+        """Controller(s) observation spaces of each environment."""
+
+        return self.__observation_space
+
+    @property
+    def action_space(self) -> List[spaces.Box]:
+        """Controller(s) action spaces of each environment."""
+
+        return self.__action_space
+
+    @property
+    def observation_names(self) -> List[List[str]]:
+        """Names of returned observations of each environment."""
+
+        return self.__observation_names
+
+    @property
+    def observations(self) -> List[np.ndarray]:
+        """Observations at current time step. See :py:attr:`VectorCityLearnEnv.observations`."""
+
+        self.__check_open()
+        return [o.copy() for o in self.__observations]
+
+    @property
+    def done(self) -> np.ndarray:
+        """Whether each environment has reached completion."""
+
+        self.__check_open()
+        return self.__done.copy()
+
+    def step(self, actions: List[np.ndarray]) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray, List[dict]]:
+        """Apply actions to the environments and advance them to next time step.
+
+        See :py:meth:`VectorCityLearnEnv.step` for the parameters and returned values.
+        """
+
+        self.__check_open()
+        actions = [np.asarray(a, dtype=float).reshape(self.num_envs, -1) for a in actions]
+
+        for pipe, i in zip(self.__pipes, self.__env_slices):
+            pipe.send(('step', [a[i] for a in actions]))
+
+        info = [v for r in self.__receive() for v in r]
+
+        return self.observations, self.__rewards.copy(), self.done, info
+
+    def reset(self, start_time_step: Union[int, List[int]] = None, episode_time_steps: Union[int, List[int]] = None) -> List[np.ndarray]:
+        r"""Reset the environments to initial state.
+
+        See :py:meth:`VectorCityLearnEnv.reset` for the parameters and returned values.
+        """
+
+        self.__check_open()
+        start_time_step = [start_time_step]*self.num_envs if start_time_step is None or isinstance(start_time_step, int) else start_time_step
+        episode_time_steps = [episode_time_steps]*self.num_envs if episode_time_steps is None or isinstance(episode_time_steps, int)\
+            else episode_time_steps
+
+        for pipe, i in zip(self.__pipes, self.__env_slices):
+            pipe.send(('reset', (start_time_step[i], episode_time_steps[i])))
+
+        self.__receive()
+
+        return self.observations
+
+    def call(self, name: str, *args, **kwargs) -> List[Any]:
+        r"""Return the value of an attribute of each environment or, call a method of each environment and return its result.
+
+        Parameters
+        ----------
+        name: str
+            :py:class:`citylearn.citylearn.CityLearnEnv` attribute or method name e.g. 'evaluate'.
+        *args: tuple
+            Positional arguments of the method.
+        **kwargs: dict
+            Keyword arguments of the method.
+
+        Returns
+        -------
+        values: List[Any]
+            Value or result of each environment.
+        """
+
+        self.__check_open()
+
+        for pipe in self.__pipes:
+            pipe.send(('call', (name, args, kwargs)))
+
+        return [v for r in self.__receive() for v in r]
+
+    def close(self):
+        r"""Stop the workers and release the shared memory.
+
+        The environments can not be used once closed and, closing a closed `SubprocessVectorCityLearnEnv` has no effect.
+        """
+
+        if self.__closed:
+            return
+        else:
+            self.__closed = True
+
+        for pipe, process in zip(self.__pipes, self.__processes):
+            try:
+                if process.is_alive():
+                    pipe.send(('close', None))
+                else:
+                    pass
+            except (BrokenPipeError, EOFError):
+                pass
+
+        for pipe, process in zip(self.__pipes, self.__processes):
+            process.join()
+            pipe.close()
+
+        # the arrays are views of the shared memory so must be released before it is unmapped
+        self.__observations, self.__rewards, self.__done = None, None, None
+
+        for buffer in self.__buffers:
+            buffer.close()
+            buffer.unlink()
+
+    def __check_open(self):
+        if self.__closed:
+            raise ValueError('SubprocessVectorCityLearnEnv is closed.')
+        else:
+            pass
+
+    def __receive(self) -> List[Any]:
+        # result of each worker and, the first worker error raised after all workers have responded
+        results = [pipe.recv() for pipe in self.__pipes]
+        errors = [r for s, r in results if not s]
+
+        if len(errors) > 0:
+            raise RuntimeError(f'CityLearnEnv worker error:\n{errors[0]}')
+        else:
+            pass
+
+        return [r for _, r in results]
+
+    def __set_buffers(self, num_envs: int, dtype: np.dtype):
+        # shared observation, reward and done arrays of all environments that each worker writes its environments' rows into
+        shapes = [((num_envs, s.shape[0]), dtype) for s in self.observation_space]
+        shapes += [((num_envs, len(self.observation_space)), np.dtype(float)), ((num_envs,), np.dtype(bool))]
+        arrays = []
+
+        for shape, d in shapes:
+            buffer = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))*d.itemsize))
+            self.__buffers.append(buffer)
+            arrays.append(np.ndarray(shape, dtype=d, buffer=buffer.buf))
+
+        self.__observations, self.__rewards, self.__done = arrays[:-2], arrays[-2], arrays[-1]
+
+        for pipe, i in zip(self.__pipes, self.__env_slices):
+            pipe.send(('buffers', ([(b.name, s, d) for b, (s, d) in zip(self.__buffers, shapes)], i)))
+
+        self.__receive()
+
+    @staticmethod
+    def run_worker(pipe: Connection, env_kwargs: List[Mapping[str, Any]]):
+        r"""Run a worker that steps a :py:class:`VectorCityLearnEnv` of `env_kwargs` environments on commands received through `pipe`.
+
+        The worker first sends the spaces, observation names, `central_agent` and `dtype` of its environments and expects the shared
+        memory arrays. Each command's result is sent as a (success, value) tuple where value is the traceback if the command failed.
+
+        Parameters
+        ----------
+        pipe: Connection
+            Worker end of the pipe to the `SubprocessVectorCityLearnEnv`.
+        env_kwargs: List[Mapping[str, Any]]
+            :py:class:`citylearn.citylearn.CityLearnEnv` keyword arguments of each environment including `schema`.
+        """
+
+        buffers, arrays = [], []
+        observations, rewards, done = None, None, None
+
+        try:
+            env = VectorCityLearnEnv(None, env_kwargs=env_kwargs)
+            pipe.send((True, (env.observation_space, env.action_space, env.observation_names, env.central_agent, env.envs[0].dtype)))
+        except Exception:
+            pipe.send((False, traceback.format_exc()))
+            pipe.close()
+            return
+
+        while True:
+            try:
+                command, data = pipe.recv()
+            except EOFError:
+                break
+
+            try:
+                if command == 'step':
+                    o, r, d, value = env.step(data)
+                    rewards[:], done[:] = r, d
+
+                    for a, b in zip(observations, o):
+                        a[:] = b
+
+                elif command == 'reset':
+                    o = env.reset(start_time_step=data[0], episode_time_steps=data[1])
+                    done[:] = env.done
+
+                    for a, b in zip(observations, o):
+                        a[:] = b
+
+                    value = None
+
+                elif command == 'call':
+                    name, args, kwargs = data
+                    value = [getattr(e, name) for e in env.envs]
+                    value = [v(*args, **kwargs) if callable(v) else v for v in value]
+
+                elif command == 'buffers':
+                    specs, i = data
+                    buffers = [shared_memory.SharedMemory(name=n) for n, _, _ in specs]
+                    arrays = [np.ndarray(s, dtype=d, buffer=b.buf)[i] for b, (_, s, d) in zip(buffers, specs)]
+                    observations, rewards, done = arrays[:-2], arrays[-2], arrays[-1]
+                    value = None
+
+                elif command == 'close':
+                    break
+
+                else:
+                    raise ValueError(f'Unknown command: {command}')
+
+                pipe.send((True, value))
+
+            except Exception:
+                pipe.send((False, traceback.format_exc()))
+
+        # the arrays must be released before the shared memory is closed
+        arrays, observations, rewards, done = None, None, None, None
+
+        for buffer in buffers:
+            buffer.close()
+
+        pipe.close()
@@ -10,34 +10,32 @@ class NormalizedObservationWrapper(ObservationWrapper):
     
     @property
     def observation_space(self) -> List[spaces.Box]:
-        low_limit = []
-        high_limit = []
-
-        if self.env.central_agent:
-            for i, b in enumerate(self.env.buildings):
-                s = b.estimate_observation_space(normalize=True)
-                l, _ = b.normalized_observation_space_limits
-
-                for k, lv, hv in zip(l, s.low, s.high):
-                    if i == 0 or k.rstrip('_sin').rstrip('_cos') not in self.env.shared_observations:
-                        low_limit.append(lv)
-                        high_limit.append(hv)
+        # normalized observations are bounded between [0, 1] so the spaces are built from the building normalized limits 
+        # instead of estimating them from the time series
+        observation_space = []
 
-                    else:
-                        pass
-            
-            observation_space = [spaces.Box(low=np.array(low_limit), high=np.array(high_limit), dtype=np.float32)]
+        for i, b in enumerate(self.env.buildings):
+            l, _ = b.normalized_observation_space_limits
+            size = len([
+                k for k in l if not self.env.central_agent or i == 0 or k.rstrip('_sin').rstrip('_cos') not in self.env.shared_observations
+            ])
+            observation_space.append(spaces.Box(low=np.zeros(size, dtype='float32'), high=np.ones(size, dtype='float32')))
 
+        if self.env.central_agent:
+            size = sum([s.shape[0] for s in observation_space])
+            observation_space = [spaces.Box(low=np.zeros(size), high=np.ones(size), dtype=np.float32)]
+        
         else:
-            observation_space = [b.estimate_observation_space(normalize=True) for b in self.env.buildings]
+            pass
         
         return observation_space
 
     def observation(self, observations: List[List[float]]) -> List[List[float]]:
         return [[
-            v for i, b in enumerate(self.env.buildings) for k, v in b.observations(normalize=True).items() 
+            v for i, b in enumerate(self.env.buildings) 
+            for k, v in zip(b.get_observation_names(normalize=True), b.get_observations(normalize=True)) 
             if i == 0 or k.rstrip('_sin').rstrip('_cos') not in self.env.shared_observations
-        ]] if self.env.central_agent else [list(b.observations(normalize=True).values()) for b in self.env.buildings]
+        ]] if self.env.central_agent else [list(b.get_observations(normalize=True)) for b in self.env.buildings]
     
 class DiscreteObservationWrapper(ObservationWrapper):
     def __init__(self, env: CityLearnEnv, bin_sizes: List[Mapping[str, int]] = None, default_bin_size: int = None):
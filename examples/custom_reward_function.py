@@ -11,23 +11,26 @@
 
 from typing import List
 from citylearn.citylearn import CityLearnEnv
+from citylearn.data import RewardState
 from citylearn.reward_function import RewardFunction
 
 class CustomReward(RewardFunction):
     def __init__(self, env: CityLearnEnv):
         super().__init__(env)
         
-    def calculate(self) -> List[float]:
+    def calculate(self, state: RewardState = None) -> List[float]:
         """Calculates custom user-defined multi-agent reward.
         
         Reward is the :py:atter:`net_electricity_consumption_emission` for entire district if central agent setup 
         otherwise it is the :py:atter:`net_electricity_consumption_emission` each building.
         """
 
-        if self.env.central_agent:
-            reward = [self.env.net_electricity_consumption_emission[-1]]
+        state = self.env.reward_state if state is None else state
+
+        if state.central_agent:
+            reward = [state.district_net_electricity_consumption_emission]
 
         else:
-            reward = [b.net_electricity_consumption_emission[-1] for b in self.env.buildings]
+            reward = state.net_electricity_consumption_emission.tolist()
 
         return reward
\ No newline at end of file
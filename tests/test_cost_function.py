@@ -0,0 +1,59 @@
+import sys
+sys.path.insert(0, '..')
+import numpy as np
+from citylearn.citylearn import CityLearnEnv
+from citylearn.cost_function import CostFunction
+
+schema = 'citylearn_challenge_2022_phase_1'
+SIMULATION_END_TIME_STEP = 1000
+EVALUATION_INTERVAL = 97
+
+def get_expected_cost_functions(env: CityLearnEnv) -> dict:
+    # cost functions of the complete time series normalized w.r.t. the no control scenario as in evaluate
+    expected = {}
+
+    for b in env.buildings:
+        for cost_function, variable in [
+            ('electricity_consumption', 'net_electricity_consumption'),
+            ('zero_net_energy', 'net_electricity_consumption'),
+            ('carbon_emissions', 'net_electricity_consumption_emission'),
+            ('cost', 'net_electricity_consumption_cost'),
+        ]:
+            control = getattr(CostFunction, cost_function)(getattr(b, variable), final_only=True)
+            no_control = getattr(CostFunction, cost_function)(getattr(b, variable.replace('consumption', 'consumption_without_storage')), final_only=True)
+            expected[(b.name, cost_function)] = control/no_control
+
+    for cost_function, name in [('ramping', 'ramping'), ('load_factor', '1 - load_factor'), ('average_daily_peak', 'average_daily_peak'), ('peak_demand', 'peak_demand')]:
+        control = getattr(CostFunction, cost_function)(env.net_electricity_consumption, final_only=True)
+        no_control = getattr(CostFunction, cost_function)(env.net_electricity_consumption_without_storage, final_only=True)
+        expected[('District', name)] = control/no_control
+
+    for cost_function in ['electricity_consumption', 'zero_net_energy', 'carbon_emissions', 'cost']:
+        expected[('District', cost_function)] = np.mean([expected[(b.name, cost_function)] for b in env.buildings])
+
+    return expected
+
+def test_evaluate_equals_cost_functions():
+    env = CityLearnEnv(schema, simulation_end_time_step=SIMULATION_END_TIME_STEP)
+    env.reset()
+    random_state = np.random.default_rng(0)
+
+    while not env.done:
+        env.step([random_state.uniform(s.low, s.high) for s in env.action_space])
+
+        if env.time_step%EVALUATION_INTERVAL == 0 or env.done:
+            expected = get_expected_cost_functions(env)
+            evaluation = env.evaluate()
+            assert len(evaluation) == len(expected)
+
+            for _, row in evaluation.iterrows():
+                assert np.isclose(row['value'], expected[(row['name'], row['cost_function'])], rtol=1e-9, atol=0.0, equal_nan=True)
+        
+        else:
+            pass
+
+def main():
+    test_evaluate_equals_cost_functions()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import sys
+sys.path.insert(0, '..')
+import numpy as np
+import pytest
+from citylearn.citylearn import CityLearnEnv
+
+schema = 'citylearn_challenge_2022_phase_1'
+SIMULATION_END_TIME_STEP = 50
+BRANCH_TIME_STEP = 20
+RTOL = 1e-10
+ATOL = 1e-10
+
+def get_env(vectorized: bool, central_agent: bool) -> CityLearnEnv:
+    env = CityLearnEnv(schema, simulation_end_time_step=SIMULATION_END_TIME_STEP, vectorized=vectorized, central_agent=central_agent)
+    env.reset()
+
+    return env
+
+def get_actions(env: CityLearnEnv, random_state: np.random.Generator) -> list:
+    # same flat actions for central and decentralized agents
+    low = np.concatenate([s.low for s in env.action_space])
+    high = np.concatenate([s.high for s in env.action_space])
+    actions = random_state.uniform(low, high)
+
+    return [actions] if env.central_agent else np.split(actions, np.cumsum([s.shape[0] for s in env.action_space])[:-1])
+
+def simulate(env: CityLearnEnv, seed: int, time_steps: int = None) -> list:
+    random_state = np.random.default_rng(seed)
+    results = []
+
+    while not env.done and (time_steps is None or len(results) < time_steps):
+        observations, reward, _, _ = env.step(get_actions(env, random_state))
+        results.append((np.concatenate(observations), np.array(reward)))
+
+    return results
+
+def assert_results_equal(results: list, expected_results: list):
+    assert len(results) == len(expected_results)
+
+    for (observations, reward), (expected_observations, expected_reward) in zip(results, expected_results):
+        assert np.allclose(observations, expected_observations, rtol=RTOL, atol=ATOL)
+        assert np.allclose(reward.sum(), expected_reward.sum(), rtol=RTOL, atol=ATOL)
+
+def assert_evaluation_equal(env: CityLearnEnv, expected_env: CityLearnEnv):
+    evaluation = env.evaluate()
+    expected_evaluation = expected_env.evaluate()
+    assert evaluation[['cost_function', 'name']].equals(expected_evaluation[['cost_function', 'name']])
+    assert np.allclose(evaluation['value'], expected_evaluation['value'], rtol=RTOL, atol=ATOL, equal_nan=True)
+
+def test_vectorized():
+    decentralized_env = get_env(False, False)
+    simulate(decentralized_env, 0)
+
+    for central_agent in [False, True]:
+        expected_env = get_env(False, central_agent)
+        expected_results = simulate(expected_env, 0)
+        env = get_env(True, central_agent)
+        assert_results_equal(simulate(env, 0), expected_results)
+        assert_evaluation_equal(env, expected_env)
+
+        # central agent observations are deduplicated so only the district performance is compared across agents
+        assert_evaluation_equal(env, decentralized_env)
+
+def test_branch():
+    for vectorized in [False, True]:
+        env = get_env(vectorized, False)
+        simulate(env, 0, BRANCH_TIME_STEP)
+        state = env.get_state()
+
+        # restoring the snapshot and replaying the actions reproduces the branch
+        expected_results = simulate(env, 1)
+        expected_evaluation = env.evaluate()
+        env.set_state(state)
+        assert_results_equal(simulate(env, 1), expected_results)
+        assert np.allclose(env.evaluate()['value'], expected_evaluation['value'], rtol=RTOL, atol=ATOL, equal_nan=True)
+
+        # a snapshot of a sibling branch is rejected
+        sibling_state = env.get_state()
+        env.set_state(state)
+        simulate(env, 2)
+
+        with pytest.raises(ValueError):
+            env.set_state(sibling_state)
+
+def test_clone():
+    for vectorized in [False, True]:
+        env = get_env(vectorized, False)
+        simulate(env, 0, BRANCH_TIME_STEP)
+
+        # the clone and its source are stepped independently with the same actions
+        clone = env.clone()
+        expected_results = simulate(env, 1)
+        assert_results_equal(simulate(clone, 1), expected_results)
+        assert_evaluation_equal(clone, env)
+
+def main():
+    test_vectorized()
+    test_branch()
+    test_clone()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import sys
+sys.path.insert(0, '..')
+import numpy as np
+from citylearn.citylearn import CityLearnEnv
+
+schema = 'citylearn_challenge_2022_phase_1'
+SIMULATION_END_TIME_STEP = 50
+
+def simulate(env: CityLearnEnv) -> list:
+    random_state = np.random.default_rng(0)
+    results = []
+
+    while not env.done:
+        observations, reward, _, _ = env.step([random_state.uniform(s.low, s.high) for s in env.action_space])
+        results.append((np.array(observations), np.array(reward)))
+
+    return results
+
+def test_step_without_reset():
+    expected_env = CityLearnEnv(schema, simulation_end_time_step=SIMULATION_END_TIME_STEP)
+    expected_results = simulate(expected_env)
+
+    # the lazily loaded environment is reset on the first step
+    env = CityLearnEnv(schema, simulation_end_time_step=SIMULATION_END_TIME_STEP, lazy_load=True)
+    results = simulate(env)
+
+    assert len(results) == len(expected_results)
+
+    for (observations, reward), (expected_observations, expected_reward) in zip(results, expected_results):
+        assert np.array_equal(observations, expected_observations)
+        assert np.array_equal(reward, expected_reward)
+
+    assert env.evaluate().equals(expected_env.evaluate())
+
+def main():
+    test_step_without_reset()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+import copy
+import os
+import sys
+import tempfile
+sys.path.insert(0, '..')
+from citylearn.citylearn import CityLearnEnv
+from citylearn.utilities import read_json
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'citylearn', 'data', 'citylearn_challenge_2022_phase_1')
+
+def test_schema_dict_reuse():
+    schema = read_json(os.path.join(DATA_DIRECTORY, 'schema.json'))
+    schema['root_directory'] = DATA_DIRECTORY
+    expected_schema = copy.deepcopy(schema)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(3):
+            CityLearnEnv(schema, data_cache_directory=directory, use_schema_cache=True)
+
+        # the same schema dict maps to the same compiled schema
+        assert len([f for f in os.listdir(directory) if f.startswith('schema_')]) == 1
+
+    assert schema == expected_schema
+
+def main():
+    test_schema_dict_reuse()
+
+if __name__ == '__main__':
+    main()
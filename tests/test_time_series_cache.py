@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import tempfile
+sys.path.insert(0, '..')
+import numpy as np
+from citylearn.citylearn import CityLearnEnv
+from citylearn.data import TimeSeriesCache
+
+DATA_FILEPATH = os.path.join(os.path.dirname(__file__), '..', 'citylearn', 'data', 'citylearn_challenge_2022_phase_1', 'Building_1.csv')
+WORKERS = 16
+schema = 'citylearn_challenge_2022_phase_all'
+
+def test_concurrent_first_read():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TimeSeriesCache(directory)
+
+        with ThreadPoolExecutor(WORKERS) as executor:
+            results = list(executor.map(lambda _: cache.read(DATA_FILEPATH, mmap_mode='r'), range(WORKERS*2)))
+
+        columns, values = results[0]
+
+        for c, v in results[1:]:
+            assert c == columns
+            assert np.array_equal(v, values, equal_nan=True)
+
+        # temporary files are renamed into place or removed
+        assert sorted(os.path.splitext(f)[1] for f in os.listdir(directory)) == ['.json', '.npy']
+
+def test_concurrent_load_workers():
+    expected_env = CityLearnEnv(schema)
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = CityLearnEnv(schema, data_cache_directory=directory, load_workers=WORKERS, memory_map=True)
+
+        for expected_building, building in zip(expected_env.buildings, env.buildings):
+            assert building.name == expected_building.name
+            
+            for data, expected_data in [
+                (building.energy_simulation, expected_building.energy_simulation),
+                (building.weather, expected_building.weather),
+            ]:
+                for k, v in vars(expected_data).items():
+                    assert np.array_equal(vars(data)[k], v, equal_nan=True)
+
+        # each data file is cached once and no temporary files are left behind
+        extensions = [os.path.splitext(f)[1] for f in os.listdir(directory)]
+        assert set(extensions) == {'.json', '.npy'}
+        assert extensions.count('.json') == extensions.count('.npy')
+
+def main():
+    test_concurrent_first_read()
+    test_concurrent_load_workers()
+
+if __name__ == '__main__':
+    main()
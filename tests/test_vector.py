@@ -0,0 +1,57 @@
+import os
+import sys
+sys.path.insert(0, '..')
+import numpy as np
+from citylearn.vector import SubprocessVectorCityLearnEnv
+
+schema = 'citylearn_challenge_2022_phase_1'
+NUM_ENVS = 2
+NUM_WORKERS = 1
+SHARED_MEMORY_DIRECTORY = '/dev/shm'
+
+def get_shared_memory() -> set:
+    return set(os.listdir(SHARED_MEMORY_DIRECTORY)) if os.path.isdir(SHARED_MEMORY_DIRECTORY) else set()
+
+def test_subprocess_lifecycle():
+    shared_memory = get_shared_memory()
+    env = SubprocessVectorCityLearnEnv(schema, num_envs=NUM_ENVS, num_workers=NUM_WORKERS, simulation_end_time_step=10)
+    random_state = np.random.default_rng(0)
+
+    try:
+        observations = env.reset()
+        assert all(o.shape[0] == NUM_ENVS for o in observations)
+        assert not env.done.any()
+
+        while not env.done.all():
+            actions = [random_state.uniform(s.low, s.high, size=(NUM_ENVS, s.shape[0])) for s in env.action_space]
+            observations, rewards, done, info = env.step(actions)
+            assert rewards.shape == (NUM_ENVS, len(env.action_space))
+            assert len(info) == NUM_ENVS
+
+        evaluations = env.call('evaluate')
+        assert len(evaluations) == NUM_ENVS
+        assert all(len(e) > 0 for e in evaluations)
+
+    finally:
+        env.close()
+
+    # the shared memory views are released so access raises an error instead of reading unmapped memory
+    for f in [
+        lambda: env.observations, lambda: env.done, lambda: env.reset(), lambda: env.call('evaluate'),
+        lambda: env.step([np.zeros((NUM_ENVS, s.shape[0])) for s in env.action_space]),
+    ]:
+        try:
+            f()
+        except ValueError:
+            pass
+        else:
+            assert False, 'closed environment must raise ValueError.'
+
+    env.close()
+    assert get_shared_memory() == shared_memory
+
+def main():
+    test_subprocess_lifecycle()
+
+if __name__ == '__main__':
+    main()